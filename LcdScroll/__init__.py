@@ -12,6 +12,10 @@ Screen display library for Adafruit CharLCD
 """
 
 
-from .lcdscroll import LcdScroll_CharLCDPlate, LcdScroll_RGBCharLCD, LcdScrollEx, LCDSCROLL_DOWN, LCDSCROLL_UP
+from .lcdscroll import LcdScroll_CharLCDPlate, LcdScroll_RGBCharLCD, LcdScrollEx, LCDSCROLL_DOWN, LCDSCROLL_UP, \
+    LCDSCROLL_LEFT
+from .backend import register_backend, use_backend
+from .renderer import LcdRenderer
+from .manager import LcdDisplayManager
 
-__all__ = ['LcdScrollEx', 'LcdScroll_CharLCDPlate', 'LcdScroll_RGBCharLCD', 'LCDSCROLL_DOWN', 'LCDSCROLL_UP', ]
+__all__ = ['LcdScrollEx', 'LcdRenderer', 'register_backend', 'use_backend', 'LcdDisplayManager', 'LcdScroll_CharLCDPlate', 'LcdScroll_RGBCharLCD', 'LCDSCROLL_DOWN', 'LCDSCROLL_UP', 'LCDSCROLL_LEFT', ]
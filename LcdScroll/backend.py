@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Display backend registry for LcdScroll.
+
+The display classes are built on a backend module providing the Adafruit_CharLCD classes, the real
+Adafruit_CharLCD with its GPIO, I2C and PWM stack or the Waxfruit_CharLCD emulator.  Importing a
+backend is slow and on a machine without the hardware libraries it fails, so nothing is imported
+until the first display is created.  The backend is then, in order of preference:
+
+* the one chosen with :func:`use_backend`
+* the one named by the ``LCDSCROLL_BACKEND`` environment variable
+* ``emulator`` on Windows, ``adafruit`` everywhere else
+
+    :program: LcdScroll
+    :file: backend
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Registry and lazy import of the Adafruit_CharLCD compatible backends.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import importlib
+import os
+
+ENVIRONMENT_VARIABLE = 'LCDSCROLL_BACKEND'
+"""str: Environment variable naming the backend to use."""
+
+BACKENDS = {'adafruit': 'Adafruit_CharLCD', 'emulator': 'Waxfruit_CharLCD'}
+"""dict: Module of every backend, keyed by name, :func:`register_backend` adds more."""
+
+_chosen = None
+_modules = {}
+
+
+def register_backend(name: str, module: str):
+    r"""
+    Make a module with the Adafruit_CharLCD classes available as a backend.
+
+    Args:
+        name (:obj:`str`): Name to choose it by
+        module (:obj:`str`): Dotted module name, imported when the backend is first used
+
+    """
+    BACKENDS[name] = module
+    _modules.pop(name, None)
+
+
+def use_backend(name: str = None):
+    r"""
+    Choose the backend displays created from now on are built on.
+
+    Args:
+        name (:obj:`str`, optional): A registered backend, None to go back to the default
+
+    Raises:
+        ValueError: When no backend of that name is registered
+
+    Examples::
+
+        import LcdScroll
+        LcdScroll.use_backend('emulator')  # run headless on Linux too
+
+    """
+    global _chosen  # pylint: disable=W0603
+    if name is not None and name not in BACKENDS:
+        raise ValueError('unknown backend %r, registered are %s' % (name, ', '.join(sorted(BACKENDS))))
+    _chosen = name
+
+
+def backend_name() -> str:
+    r"""
+    Name of the backend new displays are built on.
+
+    Returns:
+        :obj:`str`: The chosen backend, else the one in LCDSCROLL_BACKEND, else the platform default
+
+    """
+    if _chosen is not None:
+        return _chosen
+    name = os.environ.get(ENVIRONMENT_VARIABLE)
+    if name:
+        return name
+    return 'emulator' if os.name == 'nt' else 'adafruit'
+
+
+def load_backend(name: str = None):
+    r"""
+    Import a backend module, once.
+
+    Args:
+        name (:obj:`str`, optional): Backend to load, :func:`backend_name` when None
+
+    Returns:
+        The backend module
+
+    Raises:
+        ValueError: When no backend of that name is registered
+
+    """
+    if name is None:
+        name = backend_name()
+    module = _modules.get(name)
+    if module is None:
+        if name not in BACKENDS:
+            raise ValueError('unknown backend %r, registered are %s' % (name, ', '.join(sorted(BACKENDS))))
+        module = _modules[name] = importlib.import_module(BACKENDS[name])
+    return module
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Bus level extensions for the LcdScroll display classes.
+
+LcdScrollBus sits in front of the Adafruit display class in each wrapper's bases, so the methods
+defined here replace the driver's own versions while still being able to call them with super().
+
+    :program: LcdScroll
+    :file: bus
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Overrides of the Adafruit_CharLCD bus methods used by the LcdScroll wrappers.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import time
+from .timing import HybridSleeper
+
+GPIO_OUT = 0
+"""int: Adafruit_GPIO pin mode for outputs."""
+GPIO_IN = 1
+"""int: Adafruit_GPIO pin mode for inputs."""
+
+
+class LcdScrollBus:
+    r"""
+    Mixin taking over the bus timing of an Adafruit_CharLCD display.
+
+    Delays go through a :class:`LcdScroll.timing.HybridSleeper` instead of the driver's busy wait.
+
+    With :attr:`busy_flag` set, each write waits for the controller's busy flag to clear instead of
+    sleeping the driver's fixed millisecond.  Most instructions finish in about 37 microseconds.
+    The flag is read with the backend's ``read_busy_flag()`` when it has one, otherwise over GPIO,
+    which needs the display's R/W line wired to :attr:`rw_pin`.  If the flag can not be read or does not
+    clear within :attr:`busy_timeout_us` the write falls back to the fixed delay.
+
+    Reading the flag over GPIO turns the four data pins to inputs and back on every poll, one pin at a
+    time.  The character LCD plate reads it in batched transactions instead, see
+    :meth:`LcdScroll.plate.PlateBatchBus.read_busy_flag`.
+
+    """
+    _sleeper = None
+    _skip_delay = False
+    #: Poll the busy flag instead of waiting a fixed time before each write
+    busy_flag = False
+    #: Longest time to poll before falling back to the fixed delay
+    busy_timeout_us = 10000
+    #: GPIO pin connected to the display's R/W line, None when it is tied low
+    rw_pin = None
+    #: Number of writes that fell back to the fixed delay, the flag timed out or could not be read
+    busy_timeouts = 0
+
+    @property
+    def sleeper(self) -> HybridSleeper:
+        r"""
+        Property: The sleeper used for this display's bus delays, created on first use.
+
+        :getter: Get LcdScrollBus.sleeper property
+
+        """
+        if self._sleeper is None:
+            self._sleeper = HybridSleeper()
+        return self._sleeper
+
+    def batched_delays(self):
+        r"""
+        Context manager letting bus transactions count towards the delays between them.
+
+        Returns:
+            Context manager from :meth:`LcdScroll.timing.HybridSleeper.batch`
+
+        """
+        return self.sleeper.batch()
+
+    async def _bus_ready_async(self, microseconds: float = 1000):
+        r"""
+        Wait with asyncio until the driver's delay before the next write has passed.
+
+        Only works while batching, which is how the asynchronous methods call it: the write that
+        follows then finds its delay already over and does not block.  In busy flag mode the flag
+        is polled between yields to the event loop, a flag that can not be read waits the delay.
+
+        Args:
+            microseconds (:obj:`float`, optional): The driver's delay before each write (default 1000)
+
+        """
+        # asyncio is only imported by programs that use it, it is already loaded when this runs
+        import asyncio  # pylint: disable=C0415
+        if self.busy_flag:
+            deadline = time.perf_counter_ns() + self.busy_timeout_us * 1000
+            busy = self._read_busy_flag()
+            while busy and time.perf_counter_ns() < deadline:
+                await asyncio.sleep(0)
+                busy = self._read_busy_flag()
+            if busy is not None:
+                return
+        remaining = self.sleeper.deadline_ns(microseconds) - time.perf_counter_ns()
+        await asyncio.sleep(max(remaining, 0) / 1000000000.0)
+
+    def _delay_microseconds(self, microseconds):
+        r"""
+        Replacement for the driver's busy wait.
+
+        Args:
+            microseconds: Length of the delay
+
+        """
+        if self._skip_delay:
+            self._skip_delay = False
+            return
+        if getattr(self, 'realtime', True) is False:
+            # an emulated backend running faster than real time only accounts for its delays
+            super()._delay_microseconds(microseconds)
+            return
+        self.sleeper.delay_us(microseconds)
+
+    def write8(self, value, char_mode=False):
+        r"""
+        Write 8-bit value in character or data mode, waiting on the busy flag when enabled.
+
+        Args:
+            value: Value from 0-255
+            char_mode: True for character data, False for commands
+
+        """
+        if self.busy_flag and self._wait_until_ready():
+            # the controller is ready, skip the fixed delay the driver starts write8 with
+            self._skip_delay = True
+        try:
+            super().write8(value, char_mode)
+        finally:
+            self._skip_delay = False
+
+    def _wait_until_ready(self) -> bool:
+        r"""
+        Poll the busy flag until it clears, counting in :attr:`busy_timeouts` when it does not.
+
+        Returns:
+            :obj:`bool`: True when the controller is ready, False when polling timed out or the flag
+            can not be read.
+
+        """
+        deadline = time.perf_counter_ns() + self.busy_timeout_us * 1000
+        while True:
+            busy = self._read_busy_flag()
+            if busy is None:
+                self.busy_timeouts += 1
+                return False
+            if not busy:
+                return True
+            if time.perf_counter_ns() > deadline:
+                self.busy_timeouts += 1
+                return False
+
+    def _read_busy_flag(self):
+        r"""
+        Read the controller's busy flag.
+
+        Returns:
+            :obj:`bool`: The busy flag, or None when there is no way to read it.
+
+        """
+        reader = getattr(self, 'read_busy_flag', None)
+        if reader is not None:
+            return reader()
+        if self.rw_pin is None or not hasattr(self._gpio, 'input'):
+            return None
+        return self._gpio_read_busy_flag()
+
+    def _gpio_read_busy_flag(self) -> bool:
+        r"""
+        Read the busy flag over GPIO in 4-bit mode.
+
+        The flag is bit 7 of the first nibble read with RS low and R/W high, the second nibble holds the
+        low half of the address counter and is clocked out and ignored.
+
+        Returns:
+            :obj:`bool`: The busy flag
+
+        """
+        gpio = self._gpio
+        data_pins = (self._d4, self._d5, self._d6, self._d7)
+        for pin in data_pins:
+            gpio.setup(pin, GPIO_IN)
+        gpio.output(self._rs, False)
+        gpio.output(self.rw_pin, True)
+        gpio.output(self._en, True)
+        busy = bool(gpio.input(self._d7))
+        gpio.output(self._en, False)
+        gpio.output(self._en, True)
+        gpio.output(self._en, False)
+        gpio.output(self.rw_pin, False)
+        for pin in data_pins:
+            gpio.setup(pin, GPIO_OUT)
+        return busy
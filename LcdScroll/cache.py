@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk cache of compiled messages.
+
+Screens that are shown after every start, a splash, an idle or an error screen, only need to be
+compiled once.  Programs are kept in one file per display configuration, named after the geometry and
+a digest of :meth:`LcdScroll.lcdscroll.LcdScroller.program_key`, and looked up by a digest of the
+message.  A changed message, geometry, character ROM, special character or glyph therefore never
+finds a stale program.
+
+Programs handed out read straight from the mapping, so a file is never changed or replaced in place,
+which Windows refuses for a mapped file anyway.  Every update is written as the next generation of the
+file and older generations are deleted once nothing maps them any more.
+
+The file is memory-mapped, so looking a program up reads nothing but its header and replaying it
+reads the operations straight from the page cache::
+
+    header   magic 'LCDP', format version, length of the key, the key
+    record   message digest, code length, frames, address counter, rows length, rows, code
+    record   ...
+
+    :program: LcdScroll
+    :file: cache
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Memory-mapped file cache of compiled message programs.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import glob
+import hashlib
+import mmap
+import os
+import struct
+from .program import MessageProgram
+
+MAGIC = b'LCDP'
+"""bytes: First bytes of a cache file."""
+FORMAT_VERSION = 1
+"""int: Version of the cache file format, files of another version are ignored."""
+SUFFIX = '.lcdp'
+"""str: File name extension of cache files."""
+
+_HEADER = struct.Struct('<4sBH')
+_RECORD = struct.Struct('<20sIIhH')
+
+
+def message_digest(text: str) -> bytes:
+    r"""
+    Digest a message is filed under.
+
+    Args:
+        text: The message
+
+    Returns:
+        :obj:`bytes`: 20 byte SHA-1 digest of the UTF-8 message
+
+    """
+    return hashlib.sha1(text.encode('utf-8')).digest()
+
+
+class ProgramCache:
+    r"""
+    Directory of memory-mapped program files.
+
+    Args:
+        directory (:obj:`str`): Where the files are kept, created when needed
+
+    Examples::
+
+        cache = ProgramCache('/var/cache/lcdscroll')
+        display.send_program(display.compile_message(SPLASH, cache=cache))
+
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        #: Programs found in the cache
+        self.hits = 0
+        #: Programs looked for and not found
+        self.misses = 0
+        # key -> (path, mapping, {digest: record offset}) of the files opened so far
+        self._files = {}
+
+    def path(self, key: tuple) -> str:
+        r"""
+        File holding the programs of a display configuration.
+
+        Args:
+            key (:obj:`tuple`): :meth:`LcdScroll.lcdscroll.LcdScroller.program_key`
+
+        Returns:
+            :obj:`str`: Path of the newest generation, of the first one when there is no file yet
+
+        """
+        generations = self._generations(key)
+        if generations:
+            return generations[-1][1]
+        return self._name(key, 0)
+
+    def _name(self, key: tuple, generation: int) -> str:
+        r"""
+        Private function naming one generation of the file of a display configuration.
+
+        Args:
+            key (:obj:`tuple`): :meth:`LcdScroll.lcdscroll.LcdScroller.program_key`
+            generation (:obj:`int`): Generation of the file
+
+        Returns:
+            :obj:`str`: Path of the file
+
+        """
+        return '%s.%d%s' % (self._prefix(key), generation, SUFFIX)
+
+    def _prefix(self, key: tuple) -> str:
+        r"""
+        Private function returning the path every generation of a configuration's file starts with.
+
+        Args:
+            key (:obj:`tuple`): :meth:`LcdScroll.lcdscroll.LcdScroller.program_key`
+
+        Returns:
+            :obj:`str`: Directory, geometry and digest of the key
+
+        """
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, '%dx%d-%s' % (key[0], key[1], digest))
+
+    def _generations(self, key: tuple) -> list:
+        r"""
+        Private function listing the files of a display configuration.
+
+        Args:
+            key (:obj:`tuple`): :meth:`LcdScroll.lcdscroll.LcdScroller.program_key`
+
+        Returns:
+            :obj:`list`: (generation, path) of every file, oldest first
+
+        """
+        prefix = self._prefix(key)
+        generations = []
+        for path in glob.glob(glob.escape(prefix) + '.*' + SUFFIX):
+            generation = path[len(prefix) + 1:-len(SUFFIX)]
+            if generation.isdigit():
+                generations.append((int(generation), path))
+        return sorted(generations)
+
+    def get(self, key: tuple, text: str):
+        r"""
+        Look a program up.
+
+        The code of the program is a read only view into the mapped file, nothing is copied.
+
+        Args:
+            key (:obj:`tuple`): :meth:`LcdScroll.lcdscroll.LcdScroller.program_key` of the display
+            text: The message
+
+        Returns:
+            :obj:`LcdScroll.program.MessageProgram`: The program, None when it is not cached
+
+        """
+        _path, mapping, records = self._open(key)
+        offset = records.get(message_digest(text))
+        if offset is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        _digest, length, frames, index, size = _RECORD.unpack_from(mapping, offset)
+        offset += _RECORD.size
+        rows = None
+        if size:
+            columns = key[0]
+            rows = tuple(mapping[start:start + columns] for start in range(offset, offset + size, columns))
+        offset += size
+        return MessageProgram(key, memoryview(mapping)[offset:offset + length], frames, rows,
+                              None if index < 0 else index)
+
+    def put(self, text: str, program: MessageProgram):
+        r"""
+        Add a program, replacing any cached for the same message.
+
+        The programs are written to a temporary file, renamed to the next generation of the file, so
+        readers never see half a file.  The older generations are then unmapped and deleted, except those
+        still mapped for programs handed out, which go with a later :meth:`put` or :meth:`clear`.
+
+        Args:
+            text: The message the program shows
+            program (:obj:`LcdScroll.program.MessageProgram`): The program
+
+        """
+        key = program.key
+        digest = message_digest(text)
+        _path, mapping, records = self._open(key)
+        generations = self._generations(key)
+        latest = self._name(key, generations[-1][0] + 1 if generations else 0)
+        # tempfile is slow to import and only needed when the cache changes
+        import tempfile  # pylint: disable=C0415
+        os.makedirs(self.directory, exist_ok=True)
+        encoded_key = repr(key).encode('utf-8')
+        handle, temporary = tempfile.mkstemp(suffix=SUFFIX, dir=self.directory)
+        try:
+            with os.fdopen(handle, 'wb') as output:
+                output.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded_key)))
+                output.write(encoded_key)
+                for other, offset in records.items():
+                    if other != digest:
+                        output.write(mapping[offset:self._end(mapping, offset)])
+                rows = b''.join(program.rows or ())
+                index = -1 if program.index is None else program.index
+                output.write(_RECORD.pack(digest, len(program.code), program.frames, index, len(rows)))
+                output.write(rows)
+                output.write(program.code)
+            os.replace(temporary, latest)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self._release(key)
+        for _generation, old in generations:
+            self._unlink(old)
+
+    def clear(self):
+        r"""
+        Delete every cache file in the directory.
+
+        Files still mapped for programs handed out can not be deleted on Windows, they are left to a later
+        :meth:`clear`.
+
+        """
+        for key in list(self._files):
+            self._release(key)
+        for path in glob.glob(os.path.join(glob.escape(self.directory), '*' + SUFFIX)):
+            self._unlink(path)
+
+    def _release(self, key: tuple):
+        r"""
+        Private function forgetting the opened file of a configuration and unmapping it when possible.
+
+        A mapping that programs handed out still read from stays open, it is unmapped when they are gone.
+
+        Args:
+            key (:obj:`tuple`): :meth:`LcdScroll.lcdscroll.LcdScroller.program_key`
+
+        """
+        opened = self._files.pop(key, None)
+        if opened is not None and isinstance(opened[1], mmap.mmap):
+            try:
+                opened[1].close()
+            except BufferError:
+                pass
+
+    @staticmethod
+    def _unlink(path: str):
+        r"""
+        Private function deleting a file, leaving it when it is still mapped or already gone.
+
+        Args:
+            path (:obj:`str`): The file
+
+        """
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _open(self, key: tuple) -> tuple:
+        r"""
+        Private function mapping the file of a display configuration and indexing its records.
+
+        A missing, damaged or foreign file counts as empty.
+
+        Args:
+            key (:obj:`tuple`): :meth:`LcdScroll.lcdscroll.LcdScroller.program_key` of the display
+
+        Returns:
+            :obj:`tuple`: (path, mapping, {message digest: record offset}), the mapping is b'' for no file
+
+        """
+        opened = self._files.get(key)
+        if opened is not None:
+            return opened
+        path = self.path(key)
+        mapping, records = b'', {}
+        try:
+            with open(path, 'rb') as source:
+                mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mapping = b''
+        try:
+            magic, version, length = _HEADER.unpack_from(mapping, 0)
+            offset = _HEADER.size + length
+            if magic != MAGIC or version != FORMAT_VERSION or \
+                    mapping[_HEADER.size:offset] != repr(key).encode('utf-8'):
+                raise ValueError('foreign cache file')
+            while offset < len(mapping):
+                end = self._end(mapping, offset)
+                if end > len(mapping):
+                    raise ValueError('truncated cache file')
+                records[_RECORD.unpack_from(mapping, offset)[0]] = offset
+                offset = end
+        except (struct.error, ValueError):
+            records = {}
+        opened = self._files[key] = (path, mapping, records)
+        return opened
+
+    @staticmethod
+    def _end(mapping, offset: int) -> int:
+        r"""
+        Private function returning where a record ends.
+
+        Args:
+            mapping: The mapped file
+            offset (:obj:`int`): Where the record starts
+
+        Returns:
+            :obj:`int`: Offset just after the record
+
+        """
+        _digest, length, _frames, _index, size = _RECORD.unpack_from(mapping, offset)
+        return offset + _RECORD.size + size + length
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Character encoding for LcdScroller.
+
+Text is turned into HD44780 character codes with a single :meth:`str.translate` call followed by a
+latin-1 encode, both run in C.  The translation table combines the display's special characters
+with a map of the character ROM fitted to the controller, it is compiled again only when one of
+them changes.  Characters are added to the table the first time they are seen, so the table stays
+as small as the text that is actually displayed.
+
+    :program: LcdScroll
+    :file: encoding
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Compiled translation of text to HD44780 character codes.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+
+REPLACEMENT = '?'
+"""str: Character code sent for characters the ROM does not have."""
+
+ROM_A00 = {chr(code): code for code in range(0x20, 0x7e) if code != 0x5c}
+"""dict: Character codes of the Japanese standard ROM (A00), keyed by character.
+
+ASCII except backslash and tilde, whose codes show a yen sign and arrows, the half width katakana
+and the Greek and math symbols of the upper half.
+"""
+ROM_A00.update({chr(0xff61 + offset): 0xa1 + offset for offset in range(0x3f)})
+ROM_A00.update({'¥': 0x5c, '→': 0x7e, '←': 0x7f, '°': 0xdf,
+                'α': 0xe0, 'ä': 0xe1, 'β': 0xe2, 'ε': 0xe3, 'μ': 0xe4, 'µ': 0xe4,
+                'σ': 0xe5, 'ρ': 0xe6, '√': 0xe8, '¢': 0xec, '£': 0xed, 'ñ': 0xee,
+                'ö': 0xef, 'θ': 0xf2, '∞': 0xf3, 'Ω': 0xf4, 'ü': 0xf5, 'Σ': 0xf6,
+                'π': 0xf7, '千': 0xfa, '万': 0xfb, '円': 0xfc, '÷': 0xfd, '█': 0xff})
+
+ROM_A02 = {chr(code): code for code in list(range(0x20, 0x7f)) + list(range(0xa0, 0x100))}
+"""dict: Character codes of the European ROM (A02), keyed by character.
+
+ASCII, and from 0xA0 up the ISO 8859-1 letters and symbols the ROM places at the same codes.
+"""
+ROM_A02['⌂'] = 0x7f
+
+ROMS = {'A00': ROM_A00, 'A02': ROM_A02}
+"""dict: Character ROM maps by the name printed in the HD44780 datasheet."""
+
+
+class _TranslationTable(dict):
+    r"""
+    Private :meth:`str.translate` table filling itself in from a ROM map.
+
+    Control codes below 0x20, the custom characters and whatever special characters map to,
+    always pass through unchanged.
+
+    """
+
+    def __init__(self, rom):
+        super().__init__()
+        self.rom = rom
+
+    def __missing__(self, key):
+        if key < 0x20:
+            value = chr(key)
+        elif self.rom is None:
+            value = chr(key) if key < 0x100 else REPLACEMENT
+        else:
+            code = self.rom.get(chr(key))
+            value = REPLACEMENT if code is None else chr(code)
+        self[key] = value
+        return value
+
+
+class CharacterEncoder:
+    r"""
+    Turns text into the character codes sent to the display.
+
+    Args:
+        special (:obj:`dict`, optional): Special characters, a value of None leaves the character alone
+        rom (:obj:`str`, optional): 'A00' or 'A02' to map characters to that character ROM, None sends
+            the latin-1 code of every character (default)
+
+    Examples::
+
+        >>> CharacterEncoder(rom='A00').encode('20°C')
+        b'20\xdfC'
+
+    """
+
+    def __init__(self, special: dict = None, rom: str = None):
+        self._special = special or {}
+        self._rom = rom
+        #: Number of times the table was compiled
+        self.compiles = 0
+        self._table = None
+        self._compile()
+
+    @property
+    def special(self) -> dict:
+        r"""
+        Property: Special characters translated before the ROM map
+
+        :getter: Get CharacterEncoder.special property
+        :setter (dict): Set CharacterEncoder.special property, recompiling the table
+
+        """
+        return self._special
+
+    @special.setter
+    def special(self, special: dict):
+        self._special = special or {}
+        self._compile()
+
+    @property
+    def rom(self) -> str:
+        r"""
+        Property: Name of the character ROM, None for latin-1
+
+        :getter: Get CharacterEncoder.rom property
+        :setter (str): Set CharacterEncoder.rom property, recompiling the table
+
+        """
+        return self._rom
+
+    @rom.setter
+    def rom(self, rom: str):
+        if rom is not None and rom not in ROMS:
+            raise ValueError('unknown character ROM %r' % (rom,))
+        self._rom = rom
+        self._compile()
+
+    @property
+    def table(self) -> dict:
+        r"""
+        Property: The compiled :meth:`str.translate` table
+
+        :getter: Get CharacterEncoder.table property
+
+        """
+        return self._table
+
+    def encode(self, text: str) -> bytes:
+        r"""
+        Encode text.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            :obj:`bytes`: The character codes
+
+        """
+        return text.translate(self._table).encode('latin-1')
+
+    def _compile(self):
+        r"""
+        Private function building the translation table.
+
+        The values of special characters are character codes already and are not mapped again.
+
+        """
+        if self._rom is not None and self._rom not in ROMS:
+            raise ValueError('unknown character ROM %r' % (self._rom,))
+        table = _TranslationTable(ROMS.get(self._rom))
+        for char, value in self._special.items():
+            if value is not None:
+                table[ord(char)] = ''.join(code if ord(code) < 0x100 else REPLACEMENT for code in value)
+        self._table = table
+        self.compiles += 1
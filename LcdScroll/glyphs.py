@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Custom glyphs for LcdScroller.
+
+The HD44780 has character generator RAM for 8 custom characters, codes 0 to 7.  GlyphAllocator lets
+any number of glyphs be registered and loads them into those 8 slots as messages need them, reusing
+the least recently used slot whose glyph is neither wanted nor on screen.  A glyph already in a slot is
+never uploaded again.
+
+    :program: LcdScroll
+    :file: glyphs
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Least recently used allocation of the HD44780's 8 CGRAM characters.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from collections import OrderedDict
+
+GLYPH_SLOTS = 8
+"""int: Custom characters the controller can hold at once."""
+GLYPH_ROWS = 8
+"""int: Pattern bytes per 5x8 character."""
+
+
+class GlyphAllocator:
+    r"""
+    Maps registered glyphs on to the controller's CGRAM slots.
+
+    Args:
+        upload: Callable taking ``(slot, pattern)`` that writes a pattern into a slot
+        slots (:obj:`int`, optional): Number of slots (default GLYPH_SLOTS)
+
+    Examples::
+
+        glyphs = GlyphAllocator(lcd.create_char)
+        glyphs.register('♥', [0x00, 0x0a, 0x1f, 0x1f, 0x0e, 0x04, 0x00, 0x00])
+        glyphs.allocate({'♥'})
+        'I ♥ LCDs'.translate(glyphs.table)
+
+    """
+
+    def __init__(self, upload, slots: int = GLYPH_SLOTS):
+        self.upload = upload
+        self.slots = slots
+        #: Glyphs written to the controller
+        self.uploads = 0
+        #: Glyphs pushed out of their slot to make room for another
+        self.evictions = 0
+        #: Glyphs left out because every slot they could take was on screen
+        self.refused = 0
+        self._patterns = {}
+        # resident glyphs and their slots, least recently used first
+        self._resident = OrderedDict()
+        self._table = {}
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def __contains__(self, char):
+        return char in self._patterns
+
+    @property
+    def table(self) -> dict:
+        r"""
+        Property: :meth:`str.translate` table replacing resident glyphs with their slot's character code
+
+        :getter: Get GlyphAllocator.table property
+
+        """
+        return self._table
+
+    def register(self, char: str, pattern):
+        r"""
+        Add a glyph or change the pattern of one.
+
+        A resident glyph whose pattern changes is uploaded again straight away.
+
+        Args:
+            char (:obj:`str`): Character the glyph stands for in messages
+            pattern: GLYPH_ROWS bytes, one per row, 5 bits wide
+
+        """
+        pattern = tuple(pattern)
+        if self._patterns.get(char) == pattern:
+            return
+        self._patterns[char] = pattern
+        slot = self._resident.get(char)
+        if slot is not None:
+            self._upload(slot, pattern)
+
+    def unregister(self, char: str):
+        r"""
+        Remove a glyph, freeing its slot.
+
+        Args:
+            char (:obj:`str`): Character of the glyph
+
+        """
+        self._patterns.pop(char, None)
+        if self._resident.pop(char, None) is not None:
+            del self._table[ord(char)]
+
+    def slot(self, char: str):
+        r"""
+        Slot holding a glyph.
+
+        Args:
+            char (:obj:`str`): Character of the glyph
+
+        Returns:
+            :obj:`int`: The slot, None when the glyph is not resident
+
+        """
+        return self._resident.get(char)
+
+    def patterns(self) -> dict:
+        r"""
+        Glyphs registered.
+
+        Returns:
+            :obj:`dict`: Pattern of every registered glyph, keyed by character
+
+        """
+        return dict(self._patterns)
+
+    def resident(self) -> dict:
+        r"""
+        Glyphs currently loaded.
+
+        Returns:
+            :obj:`dict`: Slot of every resident glyph, keyed by character
+
+        """
+        return dict(self._resident)
+
+    def needed(self, texts) -> set:
+        r"""
+        Registered glyphs used by some text.
+
+        Args:
+            texts: Iterable of strings
+
+        Returns:
+            :obj:`set`: Characters of the glyphs they use
+
+        """
+        return self._patterns.keys() & set(''.join(texts))
+
+    def allocate(self, chars, visible=()) -> bool:
+        r"""
+        Make sure glyphs are resident, uploading the missing ones.
+
+        A missing glyph takes a free slot if there is one, otherwise the least recently used slot whose
+        glyph is not among chars.  Slots in visible are never reused, their character codes are on screen
+        and would change shape.  A glyph left without a slot stays out of :attr:`table`, so it is encoded
+        like any other character the display does not have, and is counted in :attr:`refused`.
+
+        Args:
+            chars: Characters of the glyphs needed together, all of them must be registered
+            visible: Slots currently shown on the display
+
+        Returns:
+            :obj:`bool`: False if more glyphs are needed than there are slots, nothing is changed then
+
+        """
+        chars = set(chars)
+        if len(chars) > self.slots:
+            return False
+        resident = self._resident
+        missing = []
+        for char in sorted(chars):
+            if char in resident:
+                resident.move_to_end(char)
+            else:
+                missing.append(char)
+        if not missing:
+            return True
+        used = set(resident.values())
+        free = [slot for slot in range(self.slots) if slot not in used]
+        for char in missing:
+            if free:
+                slot = free.pop(0)
+            else:
+                victim = self._victim(chars, visible)
+                if victim is None:
+                    self.refused += 1
+                    continue
+                slot = resident.pop(victim)
+                del self._table[ord(victim)]
+                self.evictions += 1
+            resident[char] = slot
+            self._table[ord(char)] = chr(slot)
+            self._upload(slot, self._patterns[char])
+        return True
+
+    def forget(self):
+        r"""
+        Forget which glyphs are resident, after the controller has been reset.
+
+        """
+        self._resident.clear()
+        self._table.clear()
+
+    def _victim(self, keep: set, visible):
+        r"""
+        Private function choosing the resident glyph to evict.
+
+        Args:
+            keep (:obj:`set`): Glyphs that must stay
+            visible: Slots shown on the display
+
+        Returns:
+            :obj:`str`: Character of the least recently used glyph neither in keep nor on screen, None when
+            there is none
+
+        """
+        for char, slot in self._resident.items():
+            if char not in keep and slot not in visible:
+                return char
+        return None
+
+    def _upload(self, slot: int, pattern: tuple):
+        r"""
+        Private function writing a pattern into a slot.
+
+        """
+        self.uploads += 1
+        self.upload(slot, list(pattern))
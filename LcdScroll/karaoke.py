@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Timing for the bouncing ball cursor.
+
+A sing along gives the times words or syllables start in the audio, the ball has to land on every
+character of the message.  Cues are matched against the message in order and the characters of each
+cue are spread evenly over the time up to the next cue, so the ball moves smoothly through a word
+and reaches the start of every cue exactly on time.
+
+    :program: LcdScroll
+    :file: karaoke
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Per character landing times of the bouncing ball from word or syllable timestamps.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import re
+
+CHARACTER_TIME = 0.1
+"""float: Seconds the ball spends on each character of the last cue when no end time is given."""
+
+_WORD = re.compile(r'[^ \t\n]+')
+
+
+def character_times(text: str, cues, end: float = None) -> list:
+    r"""
+    Work out when the ball lands on each character of a message.
+
+    A cue is either ``(seconds, text)``, where text is the next word or syllable of the message, or
+    just seconds, which stands for the whole next word.  Syllables of one word are simply cued one
+    after the other.  Spaces, tabs and newlines are never landed on and are ignored in cue texts.
+
+    Args:
+        text: The message
+        cues: Iterable of cues in message order, times in seconds from the start of the song
+        end (:obj:`float`, optional): When the last cue is over, by default it lasts CHARACTER_TIME
+            per character
+
+    Returns:
+        :obj:`list`: One time per character of the message, spaces, tabs and newlines left out
+
+    Raises:
+        ValueError: When the cues do not match the message or go back in time
+
+    Examples::
+
+        >>> character_times('la di', [0.0, 1.0], end=1.5)
+        [0.0, 0.5, 1.0, 1.25]
+        >>> character_times('Twinkle', [(0.0, 'Twin'), (2.0, 'kle')], end=3.5)
+        [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]
+
+    """
+    words = _WORD.findall(text)
+    letters = ''.join(words)
+    starts = {}
+    position = 0
+    for word in words:
+        starts[position] = word
+        position += len(word)
+    anchors = []
+    position = 0
+    for cue in cues:
+        if isinstance(cue, (int, float)):
+            seconds, piece = cue, starts.get(position)
+            if piece is None:
+                raise ValueError('word cue at %.3fs falls in the middle of a word' % seconds)
+        else:
+            seconds, piece = cue
+            piece = ''.join(_WORD.findall(piece))
+        if not piece or not letters.startswith(piece, position):
+            raise ValueError('cue %r at %.3fs does not match the message' % (piece, seconds))
+        if anchors and seconds < anchors[-1][1]:
+            raise ValueError('cue %r at %.3fs is earlier than the one before it' % (piece, seconds))
+        anchors.append((position, seconds))
+        position += len(piece)
+    if position != len(letters):
+        raise ValueError('cues cover %d of the %d characters of the message' % (position, len(letters)))
+    if not anchors:
+        return []
+    if end is None:
+        end = anchors[-1][1] + CHARACTER_TIME * (len(letters) - anchors[-1][0])
+    elif end < anchors[-1][1]:
+        raise ValueError('end at %.3fs is earlier than the last cue' % end)
+    anchors.append((len(letters), end))
+    times = []
+    for (start, seconds), (stop, following) in zip(anchors, anchors[1:]):
+        step = (following - seconds) / (stop - start)
+        times.extend(seconds + step * index for index in range(stop - start))
+    return times
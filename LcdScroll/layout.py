@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Word wrapping for LcdScroller.
+
+The message is tokenized in a single pass with one regular expression, each token is a slice of the
+original text so the total work stays linear in the length of the message.  The result is a flat list
+of placements, one per word, that the scroll logic walks through in order.
+
+    :program: LcdScroll
+    :file: layout
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Linear time tokenizer, line wrapping and layout cache for LcdScroller.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import re
+from collections import OrderedDict, namedtuple
+
+TAB_SIZE = 4
+"""int: Tab stops are placed every TAB_SIZE columns."""
+
+_TOKEN = re.compile(r'[^ \t\n]+| +|\t|\n')
+
+
+class LayoutEngine:
+    r"""
+    Wraps text to the width of the display.
+
+    The engine remembers the line and column it stopped at, so text laid out in several calls
+    continues where the previous call left off.
+
+    Placements are ``(line, column, text)`` tuples.  Lines are numbered from the start of the message,
+    a jump of more than one line between placements means empty lines in between.
+    Spaces and tabs only move the column, they are never placed, so spaces at the end of a line simply
+    push the next word on to the following line.  Words longer than a line are broken
+    over as many lines as they need.
+
+    Args:
+        columns (:obj:`int`): Number of columns on display
+        tab_size (:obj:`int`, optional): Distance between tab stops (default TAB_SIZE)
+
+    """
+
+    def __init__(self, columns: int, tab_size: int = TAB_SIZE):
+        self.columns = columns
+        self.tab_size = tab_size
+        #: Line the next placement goes on
+        self.line = 0
+        #: Column the next placement goes on
+        self.column = 0
+
+    def reset(self):
+        r"""
+        Start again at the top left.
+
+        """
+        self.line = 0
+        self.column = 0
+
+    def layout(self, text: str) -> list:
+        r"""
+        Lay out text starting from the current position.
+
+        Args:
+            text: Text to lay out
+
+        Returns:
+            :obj:`list`: ``(line, column, text)`` placements in display order
+
+        """
+        columns = self.columns
+        tab_size = self.tab_size
+        line, column = self.line, self.column
+        placements = []
+        append = placements.append
+        for match in _TOKEN.finditer(text):
+            token = match.group()
+            first = token[0]
+            if first == '\n':
+                line += 1
+                column = 0
+            elif first == ' ':
+                column += len(token)
+            elif first == '\t':
+                column = (column // tab_size + 1) * tab_size
+            else:
+                length = len(token)
+                if column and column + length > columns:
+                    line += 1
+                    column = 0
+                if length > columns:
+                    for start in range(0, length - columns, columns):
+                        append((line, 0, token[start:start + columns]))
+                        line += 1
+                    token = token[(length - 1) // columns * columns:]
+                    length = len(token)
+                append((line, column, token))
+                column += length
+        self.line, self.column = line, column
+        return placements
+
+
+def layout_text(text: str, columns: int, tab_size: int = TAB_SIZE) -> list:
+    r"""
+    Lay out a complete message.
+
+    Args:
+        text: Text to lay out
+        columns (:obj:`int`): Number of columns on display
+        tab_size (:obj:`int`, optional): Distance between tab stops (default TAB_SIZE)
+
+    Returns:
+        :obj:`list`: ``(line, column, text)`` placements in display order
+
+    Examples::
+
+        >>> layout_text('Hello big world', 10)
+        [(0, 0, 'Hello'), (0, 6, 'big'), (1, 0, 'world')]
+
+    """
+    return LayoutEngine(columns, tab_size).layout(text)
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+"""Statistics reported by :meth:`LayoutCache.info`, named like :func:`functools.lru_cache`'s."""
+
+
+class LayoutCache:
+    r"""
+    Bounded least recently used cache of message layouts.
+
+    Keys are whatever identifies a layout, LcdScroller uses
+    ``(text, columns, lines, direction, special characters version)``.
+
+    Args:
+        maxsize (:obj:`int`, optional): Number of layouts kept, 0 disables the cache (default 128)
+
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        r"""
+        Property: Number of layouts kept
+
+        :getter: Get LayoutCache.maxsize property
+        :setter (int): Set LayoutCache.maxsize property, dropping the oldest layouts if needed
+
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        self._maxsize = maxsize
+        while len(self._entries) > maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key, build):
+        r"""
+        Look a layout up, building and storing it on a miss.
+
+        Args:
+            key: Hashable key of the layout
+            build: Callable returning the layout when it is not cached
+
+        Returns:
+            :obj:`tuple`: The cached layout, shared between callers so it is made immutable
+
+        """
+        entries = self._entries
+        try:
+            value = entries[key]
+        except KeyError:
+            self.misses += 1
+            value = tuple(build())
+            if self._maxsize:
+                entries[key] = value
+                if len(entries) > self._maxsize:
+                    entries.popitem(last=False)
+            return value
+        self.hits += 1
+        entries.move_to_end(key)
+        return value
+
+    def purge(self, keep):
+        r"""
+        Drop the layouts that no longer apply.
+
+        Args:
+            keep: Callable taking a key and returning True for layouts to keep
+
+        """
+        for key in [key for key in self._entries if not keep(key)]:
+            del self._entries[key]
+
+    def clear(self):
+        r"""
+        Drop every layout and reset the counters.
+
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        r"""
+        Cache statistics.
+
+        Returns:
+            :obj:`CacheInfo`: hits, misses, maxsize and currsize
+
+        """
+        return CacheInfo(self.hits, self.misses, self._maxsize, len(self._entries))
@@ -45,11 +45,24 @@ Depending on the font used to display these tables, the lines may not be equal.
 .. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
 
 """
-import os
-if os.name == 'nt':
-    import Waxfruit_CharLCD as Adafruit_CharLCD
-else:
-    import Adafruit_CharLCD  # pylint: disable=F0401
+import codecs
+import time
+from contextlib import nullcontext
+from .backend import backend_name, load_backend
+from .bus import LcdScrollBus
+from .encoding import CharacterEncoder, ROMS
+from .glyphs import GLYPH_ROWS, GlyphAllocator
+from .karaoke import character_times
+from .layout import LayoutCache, LayoutEngine, layout_text
+from .pins import GpioTableBus
+from .plate import PlateBatchBus
+from .cache import ProgramCache
+from .program import MessageProgram, ProgramRecorder, ProgramWriter
+from .scheduler import FrameScheduler
+from .screen import ScreenRing
+from .shadow import ShadowDDRAM
+from .stats import DisplayStats, instrument, uninstrument
+from .transport import LCD_SETDDRAMADDR, Transport, TransportCharLCD
 
 
 LCDSCROLL_DOWN = 0
@@ -59,6 +72,11 @@ LCDSCROLL_UP = 1
 
 These constants are just mnemonics for the integers but are much nicer.   
 """
+LCDSCROLL_LEFT = 2
+"""int: Module level constant for horizontal marquee scrolling with the display shift."""
+
+DDRAM_LINE_LENGTH = 40
+"""int: Characters of display memory behind each line of a one or two line display."""
 
 
 
@@ -81,7 +99,7 @@ class LcdScroller:
         cols: (int, optional): Number of columns on display
         lines: (int, optional): Number of line on display
         cursor: (bool, optional): True or False, enable bouncing ball style cursor
-        direction (:obj:`int`): Direction of Scroll - LCDSCROLL_UP, LCDSCROLL_DOWN  (default DOWN)
+        direction (:obj:`int`): Direction of Scroll - LCDSCROLL_UP, LCDSCROLL_DOWN, LCDSCROLL_LEFT  (default DOWN)
 
     """
 
@@ -91,18 +109,31 @@ class LcdScroller:
         self._message_text = ''
         #: Internal dictionary of special characters
         self._special_characters = {' ': None}
+        #: Bumped whenever special_characters is replaced, part of the layout cache key
+        self._special_characters_version = 0
+        #: Compiled translation of text to character codes
+        self._encoder = CharacterEncoder(self._special_characters)
+        #: Recently used message layouts
+        self._layout_cache = LayoutCache()
         if not isinstance(self.special_characters, dict):
             raise LcdScrollEx('special_characters need to be a dictionary object')
-        self._screen_buffer = []
-        for line in range(0, lines - 1):
-            self._screen_buffer.append('')
+        #: Encoded rows of the message with a scrollback history
+        self._screen = ScreenRing(cols, lines)
+        #: Rows the display is looking back into the scrollback history, 0 shows the live rows
+        self._view_offset = 0
+        #: Shadow of the display memory used to only send changed cells
+        self._shadow = ShadowDDRAM(cols, lines)
+        #: Bus counters, only updated while stats_enabled is True
+        self._stats = DisplayStats()
+        self._stats_enabled = False
+        #: Custom glyphs loaded into CGRAM as messages need them
+        self._glyphs = GlyphAllocator(self._upload_glyph)
         self._line_buffer = ''
         self._word_buffer = ''
-        self._remaining_line_buffer, _ = self.display_size
         #: Internal "bouncing ball" cursor switch
         self._cursor_enabled = cursor
-        #: current position of cursor
-        self._cursor_position = [0, 0]
+        #: (column, line) of the bouncing ball, None while it is not shown
+        self._cursor_position = None
         self.direction = direction
         self._word = ''
 
@@ -150,6 +181,35 @@ class LcdScroller:
     @special_characters.setter
     def special_characters(self, special_characters: dict):
         self._special_characters = special_characters
+        self._special_characters_version += 1
+        self._encoder.special = special_characters
+        version = self._special_characters_version
+        self._layout_cache.purge(lambda key: key[4] == version)
+
+    @property
+    def character_rom(self) -> str:
+        r"""
+        Property: Character ROM of the controller, 'A00' (Japanese), 'A02' (European) or None
+
+        With a ROM set, characters are sent as the code that shows them on that ROM and characters it does
+        not have are sent as '?'.  None sends the latin-1 code of each character (default).
+
+        :getter: Get LcdScroll.character_rom property
+        :setter (str): Set LcdScroll.character_rom property
+
+        Example::
+
+            display.character_rom = 'A00'
+            display.message_text = '21\u00b0C'  # the degree sign is 0xDF on A00
+
+        """
+        return self._encoder.rom
+
+    @character_rom.setter
+    def character_rom(self, rom: str = None):
+        if rom is not None and rom not in ROMS:
+            raise LcdScrollEx('Error character_rom must be one of %s or None' % ', '.join(sorted(ROMS)))
+        self._encoder.rom = rom
 
     @property
     def display_size(self):
@@ -178,6 +238,9 @@ class LcdScroller:
         if columns <= 0:
             raise LcdScrollEx('Error display_size must be positive integers greater than zero')
         self._display_size[0] = columns
+        self._screen.resize(columns, self.lines)
+        self._shadow.resize(columns, self.lines)
+        self._layout_cache.purge(lambda key: key[1] == columns)
 
     @property
     def lines(self) -> int:
@@ -194,9 +257,199 @@ class LcdScroller:
     def lines(self, lines: int = 1):
         if lines <= 0:
             raise LcdScrollEx('Error display_size must be positive integers greater than zero')
-        for line in range(0, lines - 1):
-            self._screen_buffer.append('')
+        self._screen.resize(self.columns, lines)
         self._display_size[1] = lines
+        self._shadow.resize(self.columns, lines)
+        self._layout_cache.purge(lambda key: key[2] == lines)
+
+    @property
+    def scrollback(self) -> int:
+        r"""
+        Property: Lines kept after they scroll off the display, see :meth:`page_back`
+
+        :getter: Get LcdScroll.scrollback property
+        :setter (int): Set LcdScroll.scrollback property, this drops the current history
+
+        """
+        return self._screen.scrollback
+
+    @scrollback.setter
+    def scrollback(self, lines: int = 0):
+        if lines < 0:
+            raise LcdScrollEx('Error scrollback must not be negative')
+        self._screen.resize(self.columns, self.lines, lines)
+        self._view_offset = 0
+
+    @property
+    def view_offset(self) -> int:
+        r"""
+        Property: Lines the display is looking back into the scrollback history, 0 when showing the live lines
+
+        :getter: Get LcdScroll.view_offset property
+
+        """
+        return self._view_offset
+
+    def page_back(self, count: int = None):
+        r"""
+        Show earlier lines of the message from the scrollback history.
+
+        Only the cells that change are redrawn, the message is not sent again.
+
+        Args:
+            count (:obj:`int`, optional): Lines to go back, a screenful when None
+
+        """
+        if count is None:
+            count = self.lines
+        self._view(self._view_offset + count)
+
+    def page_forward(self, count: int = None):
+        r"""
+        Move back towards the live lines after :meth:`page_back`.
+
+        Args:
+            count (:obj:`int`, optional): Lines to go forward, a screenful when None
+
+        """
+        if count is None:
+            count = self.lines
+        self._view(self._view_offset - count)
+
+    def _view(self, offset: int):
+        r"""
+        Private function showing the screen buffer looking back offset lines.
+
+        Args:
+            offset (:obj:`int`): Lines to look back, limited to the history available
+
+        """
+        offset = max(0, min(offset, self._screen.history))
+        if offset != self._view_offset:
+            self._view_offset = offset
+            with self.batched_delays():
+                self._render()
+
+    @property
+    def layout_cache_size(self) -> int:
+        r"""
+        Property: Number of message layouts kept for reuse by send_message()
+
+        :getter: Get LcdScroll.layout_cache_size property
+        :setter (int): Set LcdScroll.layout_cache_size property, 0 disables the cache
+
+        """
+        return self._layout_cache.maxsize
+
+    @layout_cache_size.setter
+    def layout_cache_size(self, size: int = 128):
+        if size < 0:
+            raise LcdScrollEx('Error layout_cache_size must not be negative')
+        self._layout_cache.maxsize = size
+
+    def layout_cache_info(self):
+        r"""
+        Hit and miss counters of the layout cache.
+
+        Returns:
+            :obj:`LcdScroll.layout.CacheInfo`: hits, misses, maxsize and currsize
+
+        """
+        return self._layout_cache.info()
+
+    @property
+    def stats_enabled(self) -> bool:
+        r"""
+        Property: Count bus operations and time send_message(), see :meth:`stats`
+
+        Off by default, a display that is not counting calls the driver directly and runs at full speed.
+
+        :getter: Get LcdScroll.stats_enabled property
+        :setter (bool): Set LcdScroll.stats_enabled property
+
+        """
+        return self._stats_enabled
+
+    @stats_enabled.setter
+    def stats_enabled(self, enabled: bool = True):
+        enabled = bool(enabled)
+        if enabled == self._stats_enabled:
+            return
+        if enabled:
+            instrument(self, self._stats)
+        else:
+            uninstrument(self)
+        self._stats_enabled = enabled
+
+    def stats(self) -> dict:
+        r"""
+        Snapshot of the bus counters.
+
+        Counts commands, data bytes, cursor moves, clears, glyph uploads, message() calls, the time spent
+        in bus delays and a latency histogram of send_message(), everything since the last
+        :meth:`reset_stats` while :attr:`stats_enabled` was on.
+
+        Returns:
+            :obj:`dict`: See :meth:`LcdScroll.stats.DisplayStats.snapshot`
+
+        Example::
+
+            display.stats_enabled = True
+            display.send_message()
+            print(display.stats()['commands'])
+
+        """
+        return self._stats.snapshot()
+
+    def reset_stats(self):
+        r"""
+        Zero the bus counters.
+
+        """
+        self._stats.reset()
+
+    def register_glyph(self, char: str, pattern):
+        r"""
+        Register a custom glyph shown wherever char appears in a message.
+
+        Any number of glyphs can be registered, they are loaded into the controller's 8 custom
+        character slots when a frame needs them.  At most 8 different glyphs can be on screen at once.
+
+        Args:
+            char: Character standing for the glyph
+            pattern: 8 bytes, one per row of the 5x8 character
+
+        Example::
+
+            display.register_glyph('\u2665', [0x00, 0x0a, 0x1f, 0x1f, 0x0e, 0x04, 0x00, 0x00])
+            display.message_text = 'I \u2665 LCDs'
+
+        """
+        if len(char) != 1:
+            raise LcdScrollEx('Error a glyph stands for exactly one character')
+        if len(pattern) != GLYPH_ROWS:
+            raise LcdScrollEx('Error a glyph pattern needs %d rows' % GLYPH_ROWS)
+        self._glyphs.register(char, pattern)
+
+    def unregister_glyph(self, char: str):
+        r"""
+        Remove a custom glyph registered with :meth:`register_glyph`.
+
+        Args:
+            char: Character standing for the glyph
+
+        """
+        self._glyphs.unregister(char)
+
+    def resident_glyphs(self) -> dict:
+        r"""
+        Custom glyphs currently loaded into the controller.
+
+        Returns:
+            :obj:`dict`: Slot of each loaded glyph, keyed by character
+
+        """
+        return self._glyphs.resident()
 
     @property
     def display_cursor(self):
@@ -227,35 +480,37 @@ class LcdScroller:
 
     def trigger_cursor(self, position: tuple=(None, None)):
         """
-        Trigger the cursor movement or set to custom location.
+        Move the bouncing ball cursor on one character or to a custom location.
+
+        Moving on past the last column wraps round to the start of the line.  Only the hardware cursor
+        moves, which costs a single command.
 
         Args:
-            position, optional: (column, line)
+            position, optional: (column, line), moves on one character when both are None
 
         """
-        local_position = list(position)
-        if (local_position[0] is None) and (local_position[1] is None):
-            local_position[0] = self._cursor_position[0]
-            local_position[1] = self._cursor_position[1]
+        column, line = position
+        if (column is None) and (line is None):
+            if self._cursor_position is None:
+                column, line = 0, 0
+            else:
+                column, line = self._cursor_position
+                column = (column + 1) % self.columns
+        elif (column is None) or (line is None):
+            raise LcdScrollEx('Error cursor position needs both a column and a line')
 
-        if ((local_position[0] < 0) | (local_position[0] >= self._display_size[0]) | (local_position[1] < 0) |
-                (local_position[1] >= self._display_size[1])):
+        if not ((0 <= column < self.columns) and (0 <= line < self.lines)):
             raise LcdScrollEx('Error cursor position is not within the display area')
 
-        if position[0] == 0:
-            self._cursor_position = local_position
-        else:
-            self._cursor_position[0] += 1
-
-        if self._cursor_position[0] == self.display_size[0]:
-            self._cursor_position[0] = 0
-        self.set_cursor(self._cursor_position[0], self._cursor_position[1])
+        self._cursor_position = (column, line)
+        self._move_cursor()
 
     def send_character(self, char: str, position: tuple=(None, None)):
         r"""Sends one character to the display.
 
         Primarily used by bouncing ball option.
         To be overridden by derived classes to add functionality.
+        The shadow copy of the display is kept up to date.
 
         Args:
             char:
@@ -264,12 +519,63 @@ class LcdScroller:
         """
         if len(char) > 1:
             raise LcdScrollEx('More than one character sent to send_character()')
+        self._allocate_glyphs((char,))
+        code = self._encode(char)
         local_position = list(position)
-        if (local_position[0] is None) and (local_position[1] is None):
-            self.message(char)
-        else:
+        if ((local_position[0] is not None) or (local_position[1] is not None)) and \
+                self._shadow.cursor != tuple(local_position):
             self.set_cursor(local_position[0], local_position[1])
-            self.message(char)
+            self._shadow.move(local_position[0], local_position[1])
+        self.send_bytes(code)
+        self._shadow.write(code)
+
+    async def send_character_async(self, char: str, position: tuple=(None, None)):
+        r"""
+        Sends one character to the display without blocking the event loop.
+
+        Waits for the bus to be ready with asyncio before handing the character to
+        :meth:`send_character`, so the write itself no longer has to delay.
+        To be overridden by derived classes to add functionality.
+
+        Args:
+            char: Character to send
+            position (:obj:`tuple`, optional): (column, line) to send it to
+
+        """
+        await self._bus_ready_async()
+        self.send_character(char, position)
+
+    def send_bytes(self, data: bytes):
+        r"""
+        Sends character codes to the display as they are.
+
+        Used for text that has already been encoded, it skips the newline handling and the
+        per character conversions of ``message()``.
+        To be overridden by derived classes to add functionality.
+
+        Args:
+            data (:obj:`bytes`): Character codes to send
+
+        """
+        write8 = self.write8
+        for code in data:
+            write8(code, True)
+
+    async def _send_bytes_async(self, data: bytes):
+        r"""
+        Private coroutine sending character codes one at a time, waiting for the bus with asyncio.
+
+        The shadow copy is updated after every byte, so a cancelled task leaves it matching the display.
+
+        Args:
+            data (:obj:`bytes`): Character codes to send
+
+        """
+        for index in range(len(data)):
+            await self._bus_ready_async()
+            code = data[index:index + 1]
+            self.send_bytes(code)
+            self._shadow.write(code)
 
     def send_word(self, word: str):
         """
@@ -282,135 +588,743 @@ class LcdScroller:
         """
         self.message(word)
 
-    def _scroll(self):
+    async def send_word_async(self, word: str):
         r"""
-        Private function to initiate scroll action
+        Sends one word to the display without blocking the event loop.
+
+        The word goes out one :meth:`send_character_async` at a time, so a cancelled task
+        stops between characters and the shadow copy matches what was written.
+        To be overridden by derived classes to add functionality.
+
+        Args:
+            word: Word to send
+
+        """
+        for char in word:
+            await self.send_character_async(char)
+
+    async def _bus_ready_async(self):
+        r"""
+        Private coroutine waiting until the next bus write can go out.
+
+        Only yields to the event loop here, the display classes wait out their bus delay
+        with :class:`LcdScroll.bus.LcdScrollBus`.
+
+        """
+        # asyncio is only imported by programs that use it, it is already loaded when this runs
+        import asyncio  # pylint: disable=C0415
+        await asyncio.sleep(0)
+
+    def batched_delays(self):
+        r"""
+        Context manager letting bus transactions count towards the delays between them.
+
+        Does nothing here, the display classes get the real one from :class:`LcdScroll.bus.LcdScrollBus`.
+
+        """
+        return nullcontext()
+
+    def invalidate_shadow(self):
+        r"""
+        Forget the shadow copy of the display.
+
+        Call this after writing to the display directly with ``message()`` or ``set_cursor()``,
+        the next render will then clear the display and redraw it completely.
+
+        """
+        self._shadow.invalidate()
+
+    def _entry_row(self) -> int:
+        r"""
+        Private function returning the row new lines are written on.
 
         Returns:
+            :obj:`int`: Top row when scrolling down, bottom row when scrolling up.
 
         """
-        screen_buffer = []
+        if self.direction == LCDSCROLL_DOWN:
+            return 0
+        return self.lines - 1
 
-        def scroll_down():
-            nonlocal screen_buffer
-            for line in range(0, self.lines - 2):
-                screen_buffer[line] = self._screen_buffer[line + 1]
+    def _encode(self, text: str) -> bytes:
+        r"""
+        Private function converting text to the character codes sent to the display.
 
-        def scroll_up():
-            nonlocal screen_buffer
-            for line in range(1, self.lines - 1):
-                screen_buffer[line - 1] = self._screen_buffer[line]
+        Args:
+            text: Text to convert
 
-        if self.lines > 0:
-            if LCDSCROLL_DOWN:
-                scroll_down()
-            else:
-                scroll_up()
-            for row in range(0, self.lines - 1):
-                self.set_cursor(0, row)
-                self.message(self._screen_buffer[row])
-            self._screen_buffer = screen_buffer
+        Returns:
+            :obj:`bytes`: One character code per character of text
+
+        """
+        if self._glyphs.table:
+            text = text.translate(self._glyphs.table)
+        return self._encoder.encode(text)
 
-    def _send_message_with_cursor(self):
+    def _frame(self) -> list:
         r"""
-        Private function controlling logic for sending the message WITH
-        the bouncing ball option set.
+        Private function building the desired frame from the screen buffer.
 
         Returns:
+            :obj:`list`: One :obj:`bytes` per line, padded or cut to the number of columns
+
+        """
+        return self._screen.window(self._view_offset)
+
+    def _allocate_glyphs(self, texts):
+        r"""
+        Private function loading the custom glyphs some text needs.
+
+        Args:
+            texts: Strings about to be encoded
 
         """
-        while True:
+        glyphs = self._glyphs
+        if not glyphs:
+            return
+        needed = glyphs.needed(texts)
+        if not needed:
+            return
+        visible = ()
+        if self._shadow.valid:
+            # glyphs on the display now and the ones already placed for the next frame
+            rows = self._shadow.rows + self._screen.window()
+            visible = {code for row in rows for code in row if code < glyphs.slots}
+        if not glyphs.allocate(needed, visible):
+            raise LcdScrollEx('Error more than %d custom glyphs needed at once' % glyphs.slots)
+
+    def _upload_glyph(self, slot: int, pattern: list):
+        r"""
+        Private function writing a glyph into a custom character slot.
 
-            # iterate number of letters?
-            # cursor 0 - col-1
-            # calc word length
-            self.send_word(self._word)  # display word
-            # set cursor pos to current - word length
-            # make cursor visible?
-            # iterate letters of word
-            # play char
-            # move cursor
-            # if iteration var = word length: break | or try: except:?
+        Args:
+            slot (:obj:`int`): Slot 0-7
+            pattern (:obj:`list`): Rows of the glyph
 
-    def _send_message_without_cursor(self, string):
+        """
+        address = self._shadow.address
+        self.create_char(slot, pattern)
+        if address is not None:
+            # create_char leaves the address counter in CGRAM, point it back at display memory, by address
+            # as it may be in a part that no line shows
+            self.write8(LCD_SETDDRAMADDR | address)
+
+    def _move_cursor(self):
+        r"""
+        Private function putting the hardware cursor on the bouncing ball, if it is not there already.
+
+        """
+        ball = self._cursor_position
+        if ball is not None and self._shadow.cursor != ball:
+            self.set_cursor(ball[0], ball[1])
+            self._shadow.move(ball[0], ball[1])
+
+    def _render(self):
+        r"""
+        Private function bringing the display in line with the screen buffer.
+
+        Only the cells that differ from the shadow copy are written, grouped into runs so each
+        run costs one cursor move at most.  When the shadow is not valid the display is cleared first.
+        Afterwards the cursor is put back on the bouncing ball.
+
+        """
+        shadow = self._shadow
+        frame = self._frame()
+        if not shadow.valid:
+            self.clear()
+            shadow.blank()
+        for column, row, data in shadow.diff(frame):
+            if shadow.cursor != (column, row):
+                self.set_cursor(column, row)
+                shadow.move(column, row)
+            self.send_bytes(data)
+            shadow.write(data)
+        self._move_cursor()
+
+    async def _render_async(self):
+        r"""
+        Private coroutine bringing the display in line with the screen buffer.
+
+        The same as :meth:`_render` but every bus write waits for the bus with asyncio.
+
+        """
+        shadow = self._shadow
+        frame = self._frame()
+        if not shadow.valid:
+            await self._bus_ready_async()
+            self.clear()
+            shadow.blank()
+        for column, row, data in shadow.diff(frame):
+            if shadow.cursor != (column, row):
+                await self._bus_ready_async()
+                self.set_cursor(column, row)
+                shadow.move(column, row)
+            await self._send_bytes_async(data)
+        ball = self._cursor_position
+        if ball is not None and shadow.cursor != ball:
+            await self._bus_ready_async()
+            self._move_cursor()
+
+    def _scroll_buffer(self):
+        r"""
+        Private function moving every line of the screen buffer one row in the scroll direction.
+
+        The entry row is left blank and the bouncing ball moves with its text.
+
+        """
+        up = self.direction != LCDSCROLL_DOWN
+        self._screen.scroll(up)
+        ball = self._cursor_position
+        if ball is not None:
+            line = ball[1] - 1 if up else ball[1] + 1
+            self._cursor_position = (ball[0], line) if 0 <= line < self.lines else None
+
+    def _scroll(self):
+        r"""
+        Private function to initiate scroll action
+
+        Scrolls the screen buffer then renders the cells that changed.
+
+        """
+        self._scroll_buffer()
+        self._render()
+
+    def send_marquee(self, text: str, row: int = 0, steps: int = None, step_delay: float = 0):
+        r"""
+        Scroll text horizontally across one row using the controller's display shift.
+
+        Up to 40 characters are loaded into the line's display memory once, after that every step is
+        a single display shift command.  Text longer than the line buffer is fed in one character at a
+        time into the part of the buffer that has just scrolled off screen.
+
+        The display shift moves every line, so the marquee owns the whole display while it runs.
+        Only one and two line displays are supported, on four line displays each memory line is
+        spread over two rows.
+
+        Args:
+            text: Text to scroll
+            row (:obj:`int`, optional): Row to scroll on (default 0)
+            steps (:obj:`int`, optional): Number of shifts, defaults to one full pass of the text
+            step_delay (:obj:`float`, optional): Seconds to wait between shifts (default 0)
+
+        """
+        with self.batched_delays():
+            for _ in self._iter_marquee(text, row, steps):
+                if step_delay:
+                    time.sleep(step_delay)
+
+    def _iter_marquee(self, text: str, row: int = 0, steps: int = None):
+        r"""
+        Private generator driving the marquee one step at a time.
+
+        Args:
+            text: Text to scroll
+            row (:obj:`int`, optional): Row to scroll on
+            steps (:obj:`int`, optional): Number of shifts, defaults to one full pass of the text
+
+        Yields:
+            None after the initial load and after every shift.
+
+        """
+        if self.lines > 2:
+            raise LcdScrollEx('Error marquee needs a display with one or two lines')
+        if not 0 <= row < self.lines:
+            raise LcdScrollEx('Error marquee row is not within the display area')
+        self._allocate_glyphs((text,))
+        # a trailing gap lets the end of the text leave the screen before it comes round again
+        source = (self._encode(text) + b' ' * self.columns).ljust(DDRAM_LINE_LENGTH)
+        if steps is None:
+            steps = len(source)
+        # clear also resets any display shift left over from an earlier marquee
+        self.clear()
+        self._shadow.invalidate()
+        self.set_cursor(0, row)
+        self.send_bytes(source[:DDRAM_LINE_LENGTH])
+        yield
+        for step in range(1, steps + 1):
+            self.move_left()
+            if len(source) > DDRAM_LINE_LENGTH:
+                # the cell that just left the screen is refilled with the text due next to it
+                position = (step - 1) % DDRAM_LINE_LENGTH
+                self.set_cursor(position, row)
+                index = (step - 1 + DDRAM_LINE_LENGTH) % len(source)
+                self.send_bytes(source[index:index + 1])
+            yield
+
+    def _iter_ball(self, column: int, word: str, times=None):
+        r"""
+        Private generator moving the bouncing ball along a word already on the entry row.
+
+        The word is not written again, each step only changes where the cursor goes.
+
+        Args:
+            column (:obj:`int`): Column the word starts at
+            word: The word
+            times (optional): Iterator of landing times, one is taken per character
+
+        Yields:
+            The time the ball is due on the next character, None without times.
+
+        """
+        line = self._entry_row()
+        for index in range(len(word)):
+            due = None if times is None else next(times)
+            self._cursor_position = (column + index, line)
+            yield due
+
+    def _send_message_without_cursor(self, string, column: int=None):
         r"""
         Private function controlling logic for sending the message WITHOUT
         the bouncing ball option set.
 
         Args:
-            string:
+            string: Text to place on the entry row
+            column (:obj:`int`, optional): Column to place it at, appended to the row when None
+
+        """
+        self._place(string, column)
+        self._render()
+
+    def _place(self, string, column: int=None):
+        r"""
+        Private function putting text on the entry row of the screen buffer.
+
+        Args:
+            string: Text to place on the entry row
+            column (:obj:`int`, optional): Column to place it at, appended to the row when None
+
+        """
+        self._allocate_glyphs((string,))
+        self._screen.put(self._entry_row(), column, self._encode(string))
+
+    def _layout(self, text: str) -> list:
+        r"""
+        Private function wrapping text to the display width.
+
+        Args:
+            text: Text to wrap
 
         Returns:
+            :obj:`list`: ``(line, column, word)`` placements, see :class:`LcdScroll.layout.LayoutEngine`
 
         """
-        string_buffer = list(string)
-        while len(string_buffer) > 0:
-            # while there are letters
-            # display letter
-            self.send_character(string_buffer.pop(0))
+        key = (text, self.columns, self.lines, self.direction, self._special_characters_version)
+        return self._layout_cache.get(key, lambda: layout_text(text, self.columns))
 
-    def _set_init_cursor_pos(self):
+    def _iter_message(self, times=None):
         r"""
-        Simple functions to place the cursor in the starting position based on the
-        bouncing ball option.
+        Private generator stepping through the message.
+
+        Each step scrolls the screen buffer, places a word on it or moves the bouncing ball, the
+        caller renders the screen buffer after each step.
+
+        Args:
+            times (optional): Iterator of bouncing ball landing times, see :meth:`_iter_placements`
+
+        Yields:
+            None after every change to the screen buffer, the due time of bouncing ball steps.
+
+        """
+        self._screen.reset()
+        self._view_offset = 0
+        self._cursor_position = None
+        placements = self._layout(self.message_text)
+        if not placements:
+            # a message without words still replaces what the display shows, with a blank screen
+            yield
+            return
+        yield from self._iter_placements(placements, times=times)
+
+    def _iter_placements(self, placements, line: int = 0, times=None):
+        r"""
+        Private generator scrolling and placing words on the screen buffer.
+
+        With display_cursor set or with times the bouncing ball then steps through every word once
+        it is on screen.
+
+        Args:
+            placements: ``(line, column, word)`` placements from the layout
+            line (:obj:`int`, optional): Layout line the entry row is showing
+            times (optional): Iterator of landing times, one per character of the words placed
+
+        Yields:
+            None after every change to the screen buffer, the due time of bouncing ball steps.
 
         Returns:
+            :obj:`int`: The layout line the entry row shows afterwards
+
+        """
+        ball = self.display_cursor or times is not None
+        for number, column, word in placements:  # feed one at a time to display
+            # move text along for every line the layout moved on
+            while line < number:
+                self._scroll_buffer()
+                line += 1
+                yield
+
+            self._place(word, column)
+            yield
+            if ball:
+                yield from self._iter_ball(column, word, times)
+        return line
+
+    def _iter_stream(self, chunks):
+        r"""
+        Private generator stepping through text as it arrives.
+
+        Text up to the last space, tab or newline of what has arrived is laid out straight away, the
+        word after it is carried over to the next chunk because it may not be complete yet.  A carried
+        over word is never allowed to grow to a full line, the whole lines of it are laid out, which is
+        where the layout would break it anyway.
+
+        Args:
+            chunks: Iterable of :obj:`str` or :obj:`bytes` chunks, bytes are decoded as UTF-8
+
+        Yields:
+            None after every change to the screen buffer.
+
+        """
+        if self.direction == LCDSCROLL_LEFT:
+            raise LcdScrollEx('Error streaming needs LCDSCROLL_UP or LCDSCROLL_DOWN')
+        self._screen.reset()
+        self._view_offset = 0
+        self._cursor_position = None
+        columns = self.columns
+        engine = LayoutEngine(columns)
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        line = 0
+        carry = ''
+        for chunk in chunks:
+            if isinstance(chunk, (bytes, bytearray)):
+                chunk = decoder.decode(chunk)
+            text = carry + chunk.replace('\r', '')
+            cut = max(text.rfind(' '), text.rfind('\t'), text.rfind('\n')) + 1
+            cut += (len(text) - cut) // columns * columns
+            carry = text[cut:]
+            if cut:
+                line = yield from self._iter_placements(engine.layout(text[:cut]), line)
+        carry += decoder.decode(b'', True)
+        if carry:
+            yield from self._iter_placements(engine.layout(carry), line)
+
+    def send_stream(self, chunks):
+        r"""
+        Scroll text on to the display as it arrives.
+
+        Chunks can be anything iterable, a generator, a file object or a pipe, and text is shown as soon
+        as its words are complete.  Memory use depends on the display and the size of the chunks, not on
+        how much text goes through.  Only LCDSCROLL_UP and LCDSCROLL_DOWN are supported.
+
+        Args:
+            chunks: Iterable of :obj:`str` or :obj:`bytes` chunks, bytes are decoded as UTF-8
+
+        Examples::
+
+            with open('/var/log/syslog') as log:
+                display.send_stream(log)
+
+            process = subprocess.Popen(['ping', 'localhost'], stdout=subprocess.PIPE)
+            display.send_stream(iter(lambda: process.stdout.read1(64), b''))
 
         """
-        if len(str(self._line_buffer)) is 0:  # Move cursor to Bottom line
-            if LCDSCROLL_DOWN:
-                self.set_cursor(0, 0)
-            else:  # LCDSCROLL_UP
-                self.set_cursor(0, self.lines - 1)
+        with self.batched_delays():
+            self.show_cursor(self.display_cursor)
+            for _ in self._iter_stream(chunks):
+                self._render()
 
     def send_message(self):
         """
         Method to initiate sending
 
+        The display is not cleared between messages, the first render replaces whatever the
+        previous message left on screen cell by cell.
+
             .. todo:: Not end of string in message?
 
         """
+        with self.batched_delays():
+            for _ in self._iter_send():
+                pass
+
+    def send_message_paced(self, fps: float = 10.0, scheduler: FrameScheduler = None) -> FrameScheduler:
+        r"""
+        Send the message as an animation running at a steady frame rate.
+
+        Every scroll or placement of a word, or every marquee shift, is one frame.  Frames that can not
+        be drawn in time are skipped so the message keeps its pace when the bus is slow.
+
+        Args:
+            fps (:obj:`float`, optional): Frames per second (default 10)
+            scheduler (:obj:`LcdScroll.scheduler.FrameScheduler`, optional): Scheduler to use, its counters
+                carry on from earlier runs, a new one running at fps when None
+
+        Returns:
+            :obj:`LcdScroll.scheduler.FrameScheduler`: The scheduler, with frame, dropped frame and jitter counts
+
+        Example::
+
+            display.message_text = 'Readable at the same speed on any bus'
+            print(display.send_message_paced(fps=4).stats())
+
+        """
+        if scheduler is None:
+            if fps <= 0:
+                raise LcdScrollEx('Error fps must be positive')
+            scheduler = FrameScheduler(fps)
+        with self.batched_delays():
+            if self.direction == LCDSCROLL_LEFT:
+                scheduler.run(self._iter_marquee(self.message_text))
+            else:
+                self.show_cursor(self.display_cursor)
+                estimate = self._render_cost if isinstance(getattr(self, 'transport', None), Transport) else None
+                scheduler.run(self._iter_message(), self._render, estimate)
+        return scheduler
+
+    def _render_cost(self) -> float:
+        r"""
+        Private function estimating how long the next render keeps the transport busy.
+
+        The frame is diffed against the shadow copy and the writes that would take are priced with the
+        transport's :class:`LcdScroll.transport.TransportCost`.
+
+        Returns:
+            :obj:`float`: Estimated seconds
+
+        """
+        shadow = self._shadow
+        if not shadow.valid:
+            return self.transport.estimate_us(1, self.columns * self.lines, self.lines) / 1000000.0
+        runs = shadow.diff(self._frame())
+        data = sum(len(run[2]) for run in runs)
+        return self.transport.estimate_us(len(runs), data, len(runs)) / 1000000.0
+
+    def send_message_synced(self, cues, end: float = None, start: float = None, clock=time.monotonic,
+                            sleep=time.sleep):
+        r"""
+        Send the message with the bouncing ball following timestamps, like a sing along to a song.
+
+        Every word is written once, as soon as the ball has finished the word before it, after that the
+        ball moves through it one cursor command per character.  The ball waits for the exact time each
+        character is due rather than for the next frame.
+
+        Args:
+            cues: Word or syllable timestamps, see :func:`LcdScroll.karaoke.character_times`
+            end (:obj:`float`, optional): When the last cue is over
+            start (:obj:`float`, optional): Clock reading the timestamps count from, now when None, pass
+                the time the audio started to stay in sync with it
+            clock (optional): Monotonic clock returning seconds (default time.monotonic)
+            sleep (optional): Function sleeping for a number of seconds (default time.sleep)
+
+        Example::
+
+            display.message_text = 'Twinkle twinkle little star'
+            display.send_message_synced([(0.0, 'Twin'), (0.5, 'kle'), (1.0, 'twin'), (1.5, 'kle'),
+                                         (2.0, 'lit'), (2.5, 'tle'), (3.0, 'star')], end=4.0)
+
+        """
+        if self.direction == LCDSCROLL_LEFT:
+            raise LcdScrollEx('Error the bouncing ball needs LCDSCROLL_UP or LCDSCROLL_DOWN')
+        try:
+            times = character_times(self.message_text, cues, end)
+        except ValueError as error:
+            raise LcdScrollEx('Error %s' % error)
+        with self.batched_delays():
+            self.show_cursor(True)
+            if start is None:
+                start = clock()
+            for due in self._iter_message(iter(times)):
+                if due is not None:
+                    delay = start + due - clock()
+                    if delay > 0:
+                        sleep(delay)
+                self._render()
+
+    def program_key(self) -> tuple:
+        r"""
+        Everything about this display a compiled program depends on.
+
+        Programs compiled on one display replay on any other with an equal key.
+
+        Returns:
+            :obj:`tuple`: Geometry, scroll direction, cursor mode, character ROM, special characters and
+            custom glyphs
+
+        """
+        return (self.columns, self.lines, self.direction, bool(self.display_cursor), self.character_rom,
+                tuple(sorted(self._special_characters.items())), tuple(sorted(self._glyphs.patterns().items())))
+
+    def compile_message(self, text: str = None, cache: ProgramCache = None) -> MessageProgram:
+        r"""
+        Compile a message into a program of bus operations.
+
+        The message is sent once to a recording display set up like this one and every command, data
+        byte and delay is kept, one frame per step of :meth:`send_message`.  The program starts with a
+        clear, so it can be replayed whatever the display is showing.
+
+        Args:
+            text (:obj:`str`, optional): Message to compile, message_text when None
+            cache (:obj:`LcdScroll.cache.ProgramCache`, optional): On-disk cache to look the program up
+                in first and to add it to when it had to be compiled
+
+        Returns:
+            :obj:`LcdScroll.program.MessageProgram`: The program, for :meth:`send_program`
+
+        Example::
+
+            welcome = display.compile_message('Welcome to the lab')
+            while True:
+                display.send_program(welcome)
+                display.send_program(weather)
+
+        """
+        if text is None:
+            text = self.message_text
+        key = self.program_key()
+        if cache is not None:
+            program = cache.get(key, text)
+            if program is not None:
+                return program
+        recorder = _ProgramRecorderDisplay(self)
+        recorder.message_text = text
+        recorder.writer = writer = ProgramWriter()
+        for _ in recorder._iter_send():  # pylint: disable=W0212
+            writer.frame()
+        shadow = recorder._shadow  # pylint: disable=W0212
+        program = writer.program(key, shadow.rows if shadow.valid else None, shadow.index)
+        if cache is not None:
+            cache.put(text, program)
+        return program
+
+    def send_program(self, program: MessageProgram, frame_delay: float = 0, frames: int = None):
+        r"""
+        Replay a compiled message.
+
+        Replaying only the first frames gets something on the glass as early as possible, a cached
+        program is replayed straight from its memory-mapped file.
+
+        Args:
+            program (:obj:`LcdScroll.program.MessageProgram`): Program from :meth:`compile_message`
+            frame_delay (:obj:`float`, optional): Seconds to wait after every frame (default 0)
+            frames (:obj:`int`, optional): Stop after this many frames, None for the whole program
+
+        Example::
+
+            display = LcdScroll_CharLCDPlate()
+            display.send_program(display.compile_message(SPLASH, cache=ProgramCache(CACHE_DIR)), frames=1)
+
+        """
+        if program.key != self.program_key():
+            raise LcdScrollEx('Error program was compiled for a different display configuration')
+        with self.batched_delays():
+            complete = program.replay(self, frame_delay, frames=frames)
+        self._glyphs.forget()
+        self._screen.reset()
+        self._view_offset = 0
+        self._cursor_position = None
+        if not complete:
+            # what a partly replayed program leaves behind is not recorded
+            self._shadow.invalidate()
+            return
+        self._shadow.load(program.rows, program.index)
+        for line, row in enumerate(program.rows or ()):
+            self._screen.put(line, 0, row)
+
+    def _iter_send(self):
+        r"""
+        Private generator doing the work of :meth:`send_message` one step at a time.
+
+        Yields:
+            None after every render or marquee shift.
+
+        """
+        if self.direction == LCDSCROLL_LEFT:
+            yield from self._iter_marquee(self.message_text)
+            return
+
         # set initial state
-        columns, rows = self.display_size
-        self.clear()
-        self.show_cursor(False)
-        self._line_buffer = 0
-        self._cursor_position = 0
-        for line in range(0, self.lines - 1):
-            self._screen_buffer[line] = ''
-
-        # break into words
-        local_message_temp = self.message_text
-        local_message = []
-        while len(local_message_temp) > 0:
-            word_buffer = local_message_temp.partition(" ")
-            local_message.append(word_buffer[0])
-            local_message[-1] += word_buffer[1]
-            local_message_temp = word_buffer[2]
-
-
-        while True:
-            try:
-                self._set_init_cursor_pos()
-                for word in local_message:  # feed one at a time to display
-                    # calculate if there is room on the line if not move text up
-                    if len(word) > self._remaining_line_buffer:
-                        self.clear()
-                        self._scroll()
-                        self._remaining_line_buffer = columns
-
-                    if self.display_cursor:
-                        self._send_message_with_cursor()
-                        self._remaining_line_buffer -= len(word)
-                    else:
-                        self._send_message_without_cursor(word)
-                        self._remaining_line_buffer -= len(word)
+        self.show_cursor(self.display_cursor)
+        for _ in self._iter_message():
+            self._render()
+            yield
+
+    async def send_message_async(self):
+        r"""
+        Asynchronous version of :meth:`send_message`.
+
+        Bus delays are awaited instead of slept or spun, so the event loop keeps running
+        while the message is sent.  Cancelling the task stops it between two bus writes
+        with the shadow copy of the display matching what was written.
+
+        Example::
+
+            display.message_text = 'Hello from asyncio'
+            await display.send_message_async()
+
+        """
+        with self.batched_delays():
+            if self.direction == LCDSCROLL_LEFT:
+                for _ in self._iter_marquee(self.message_text):
+                    await self._bus_ready_async()
                 return
-            except IndexError:
-                break
 
+            self.show_cursor(self.display_cursor)
+            for _ in self._iter_message():
+                await self._render_async()
 
-class LcdScroll_CharLCD(Adafruit_CharLCD.Adafruit_CharLCD, LcdScroller):
+
+_DISPLAY_CLASSES = {}
+
+
+class _BackendDisplay:
+    r"""
+    Private base of the display classes, which are only built on their backend when first created.
+
+    Creating an instance of a subclass creates an instance of a class deriving from the subclass, then
+    ``backend_mixins``, then ``backend_class`` of the backend module and then :class:`LcdScroller`.
+    That class is made once per backend, the backend is imported when it is first needed.
+
+    """
+    #: Name of the class of the backend module the display wraps
+    backend_class = None
+    #: Backend to build on, the one of :func:`LcdScroll.backend.backend_name` when None
+    backend = None
+    #: Classes put in front of the backend class
+    backend_mixins = (LcdScrollBus,)
+    #: Class attributes taken from constants of the backend module, attribute: constant
+    backend_constants = {}
+    _built = False
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._built:
+            cls = _display_class(cls)
+        return super().__new__(cls)
+
+
+def _display_class(cls) -> type:
+    r"""
+    Private function building a display class on its backend.
+
+    Args:
+        cls: Subclass of :class:`_BackendDisplay`
+
+    Returns:
+        :obj:`type`: The class instances are actually made of
+
+    """
+    name = cls.backend or backend_name()
+    built = _DISPLAY_CLASSES.get((cls, name))
+    if built is None:
+        module = load_backend(name)
+        namespace = {'_built': True, '__module__': cls.__module__, '__qualname__': cls.__qualname__,
+                     '__doc__': cls.__doc__}
+        for attribute, constant in cls.backend_constants.items():
+            namespace[attribute] = getattr(module, constant)
+        bases = (cls,) + cls.backend_mixins + (getattr(module, cls.backend_class), LcdScroller)
+        built = _DISPLAY_CLASSES[(cls, name)] = type(cls.__name__, bases, namespace)
+    return built
+
+
+class LcdScroll_CharLCD(_BackendDisplay):
     r"""
     Wrapper Class for Adafruit_CharLCD to add Scrolling:
 
@@ -458,12 +1372,15 @@ class LcdScroll_CharLCD(Adafruit_CharLCD.Adafruit_CharLCD, LcdScroller):
         cursor: Turn on the bouncing ball style cursor  (default False)
 
     """
+    backend_class = 'Adafruit_CharLCD'
+    backend_mixins = (LcdScrollBus, GpioTableBus)
+
     def __init__(self, cols: int, lines: int, cursor: bool=False, direction: int=LCDSCROLL_DOWN, *args, **kwargs):
         LcdScroller.__init__(self, cols=cols, lines=lines, direction=direction, cursor=cursor)
-        super().__init__(self, *args, **kwargs)
+        super().__init__(*args, cols=cols, lines=lines, **kwargs)
 
 
-class LcdScroll_CharLCDPlate(Adafruit_CharLCD.Adafruit_CharLCDPlate, LcdScroller):
+class LcdScroll_CharLCDPlate(_BackendDisplay):
     r"""
     Wrapper Class for Adafruit_CharLCDPlate to add Scrolling:
 
@@ -474,6 +1391,8 @@ class LcdScroll_CharLCDPlate(Adafruit_CharLCD.Adafruit_CharLCDPlate, LcdScroller
     I2C address or bus number, but the defaults should suffice for most needs.
     Can also optionally specify the number of columns and lines on the Lcd
     (default is 16x2).
+    Writes to the plate's MCP23017 are streamed as block writes of precomputed
+    register values, see :class:`LcdScroll.plate.PlateBatchBus`.
 
     Args:
         address (:obj:`hex`, optional): I2C address
@@ -484,12 +1403,16 @@ class LcdScroll_CharLCDPlate(Adafruit_CharLCD.Adafruit_CharLCDPlate, LcdScroller
         cursor: Turn on the bouncing ball style cursor  (default False)
 
     """
+    backend_class = 'Adafruit_CharLCDPlate'
+    backend_mixins = (LcdScrollBus, PlateBatchBus, GpioTableBus)
+    backend_constants = {'rw_pin': 'LCD_PLATE_RW'}
+
     def __init__(self, cols: int =16, lines: int=2, cursor: bool=False, direction: int=LCDSCROLL_DOWN, *args, **kwargs):
         LcdScroller.__init__(self, cols=cols, lines=lines, direction=direction, cursor=cursor)
-        super().__init__(*args, **kwargs)
+        super().__init__(*args, cols=cols, lines=lines, **kwargs)
 
 
-class LcdScroll_RGBCharLCD(Adafruit_CharLCD.Adafruit_RGBCharLCD, LcdScroller):
+class LcdScroll_RGBCharLCD(_BackendDisplay):
     r"""
     Wrapper Class for Adafruit_RBGCharLCD to add Scrolling:
 
@@ -536,9 +1459,65 @@ class LcdScroll_RGBCharLCD(Adafruit_CharLCD.Adafruit_RGBCharLCD, LcdScroller):
         cursor: Turn on the bouncing ball style cursor  (default False)
 
     """
+    backend_class = 'Adafruit_RGBCharLCD'
+    backend_mixins = (LcdScrollBus, GpioTableBus)
+
     def __init__(self, cols: int, lines: int, cursor: bool=False, direction: int=LCDSCROLL_DOWN, *args, **kwargs):
         LcdScroller.__init__(self, cols=cols, lines=lines, direction=direction, cursor=cursor)
-        super().__init__(*args, **kwargs)
+        super().__init__(*args, cols=cols, lines=lines, **kwargs)
+
+
+class LcdScroll_TransportLCD(LcdScrollBus, TransportCharLCD, LcdScroller):
+    r"""
+    Scrolling display driven through a :class:`LcdScroll.transport.Transport`:
+
+    The controller is driven directly over the transport instead of through an Adafruit class, so it can
+    sit on 8-bit parallel GPIO or a PCF8574 I2C backpack as well as on 4-bit GPIO.  The transport's cost
+    model lets :meth:`LcdScroller.send_message_paced` skip frames that could not be drawn in time.
+
+    Args:
+        transport (:obj:`LcdScroll.transport.Transport`): Bus to the controller
+        cols (:obj:`int`): Number of columns on display (default 16)
+        lines (:obj:`int`): Number of Lines on display (default 2)
+        cursor: Turn on the bouncing ball style cursor  (default False)
+        direction (:obj:`int`): Direction of Scroll - LCDSCROLL_UP, LCDSCROLL_DOWN  (default LCDSCROLL_DOWN)
+        realtime (:obj:`bool`, optional): Wait out bus delays, False for fake buses (default True)
+
+    Examples::
+
+        from LcdScroll.transport import PCF8574Transport
+        display = LcdScroll_TransportLCD(PCF8574Transport(i2c, 0x27), cols=20, lines=4)
+
+    """
+
+    def __init__(self, transport: Transport, cols: int = 16, lines: int = 2, cursor: bool = False,
+                 direction: int = LCDSCROLL_DOWN, realtime: bool = True):
+        LcdScroller.__init__(self, cols=cols, lines=lines, direction=direction, cursor=cursor)
+        TransportCharLCD.__init__(self, transport, cols=cols, lines=lines, realtime=realtime)
+
+
+class _ProgramRecorderDisplay(_BackendDisplay):
+    r"""
+    Private display recording the bus operations of :meth:`LcdScroller.compile_message`.
+
+    Always built on the emulator, whatever backend the displays use.
+
+    Args:
+        source (:obj:`LcdScroller`): Display whose configuration is copied
+
+    """
+    backend = 'emulator'
+    backend_class = 'Adafruit_CharLCDPlate'
+    backend_mixins = (ProgramRecorder,)
+
+    def __init__(self, source: LcdScroller):
+        LcdScroller.__init__(self, cols=source.columns, lines=source.lines, direction=source.direction,
+                             cursor=source.display_cursor)
+        super().__init__(cols=source.columns, lines=source.lines, realtime=False)
+        self.special_characters = dict(source.special_characters)
+        self.character_rom = source.character_rom
+        for char, pattern in source._glyphs.patterns().items():  # pylint: disable=W0212
+            self.register_glyph(char, pattern)
 
 
 class LcdScrollEx(Exception):
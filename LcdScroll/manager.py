@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Driving many LcdScroller displays at once.
+
+Displays that share a bus can only be written one after another, displays on different buses can be
+written at the same time.  The manager gives each bus its own :class:`LcdScroll.renderer.LcdRenderer`,
+so refreshing N displays spread over B buses takes about as long as N/B displays on one bus.  Within a
+bus the renderer takes one step of each busy display in turn.
+
+    :program: LcdScroll
+    :file: manager
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: One render thread per bus for racks of displays.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import threading
+from .lcdscroll import LcdScrollEx
+from .renderer import LcdRenderer
+
+
+class LcdDisplayManager:
+    r"""
+    Registry of displays grouped by the bus they sit on.
+
+    Args:
+        maxsize (:obj:`int`, optional): Queue size of each bus renderer (default 16)
+
+    Examples::
+
+        manager = LcdDisplayManager()
+        manager.register(LcdScroll_CharLCDPlate(address=0x20, busnum=1), bus=1)
+        manager.register(LcdScroll_CharLCDPlate(address=0x21, busnum=1), bus=1)
+        manager.register(LcdScroll_CharLCDPlate(address=0x20, busnum=3), bus=3)
+        for display in manager.displays:
+            manager.submit(display, 'Rack OK')
+        manager.flush()
+
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._buses = {}
+        self._renderers = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def register(self, display, bus=None):
+        r"""
+        Add a display.
+
+        Args:
+            display (:obj:`LcdScroller`): Display to manage
+            bus (optional): Any hashable naming the bus the display is on, displays registered without
+                one share a bus
+
+        """
+        with self._lock:
+            if display in self._buses:
+                raise LcdScrollEx('Error display is already registered')
+            self._buses[display] = bus
+            if bus not in self._renderers:
+                self._renderers[bus] = LcdRenderer(maxsize=self.maxsize, name='LcdScroll bus %s' % (bus,))
+
+    @property
+    def displays(self) -> list:
+        r"""
+        Property: Registered displays in registration order
+
+        :getter: Get LcdDisplayManager.displays property
+
+        """
+        return list(self._buses)
+
+    @property
+    def buses(self) -> dict:
+        r"""
+        Property: Registered displays grouped by bus
+
+        :getter: Get LcdDisplayManager.buses property
+
+        Returns:
+            :obj:`dict`: bus -> list of displays
+
+        """
+        grouped = {}
+        for display, bus in self._buses.items():
+            grouped.setdefault(bus, []).append(display)
+        return grouped
+
+    def submit(self, display, text: str) -> bool:
+        r"""
+        Queue text for a registered display without waiting.
+
+        Args:
+            display (:obj:`LcdScroller`): Display to show the text on
+            text: Message to show
+
+        Returns:
+            :obj:`bool`: False when the bus renderer's queue is full
+
+        """
+        return self._renderers[self._buses[display]].submit(text, display)
+
+    def frame_latency(self) -> dict:
+        r"""
+        Frame latency of every display drawn so far.
+
+        Returns:
+            :obj:`dict`: display -> :class:`LcdScroll.renderer.FrameLatency`
+
+        """
+        latency = {}
+        for renderer in self._renderers.values():
+            latency.update(renderer.latency)
+        return latency
+
+    def flush(self, timeout: float = None) -> bool:
+        r"""
+        Wait until every bus has drawn everything submitted so far.
+
+        Args:
+            timeout (:obj:`float`, optional): Seconds to wait for each bus, forever when None
+
+        Returns:
+            :obj:`bool`: False if a bus was still busy when its timeout expired
+
+        """
+        return all([renderer.flush(timeout) for renderer in list(self._renderers.values())])
+
+    def stop(self, timeout: float = None):
+        r"""
+        Stop every bus renderer.
+
+        Args:
+            timeout (:obj:`float`, optional): Seconds to wait for each thread, forever when None
+
+        """
+        for renderer in list(self._renderers.values()):
+            renderer.stop(timeout)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Pin state lookup tables for clocking bytes into an HD44780.
+
+Working out which pins a byte sets, bit by bit, for every byte sent is the hottest loop of a bit-banged
+display.  The tables here hold the result for all 256 byte values, built once per display for its pin
+assignment:
+
+* :func:`nibble_states` -- the pin levels of each transfer, for GPIO libraries taking ``{pin: level}``
+* :class:`PinTable` -- the output bytes of each value, for expanders written register by register, with
+  :meth:`PinTable.encode` turning a whole line into one flat byte string.  NumPy is used for long lines
+  when it is installed, it is only imported then.
+
+    :program: LcdScroll
+    :file: pins
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Per display lookup tables of the pin states of every byte value.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+
+NUMPY_MIN_LENGTH = 64
+"""int: Shortest line encoded with NumPy, shorter ones are joined faster in Python."""
+
+_numpy = None
+
+
+def _load_numpy():
+    r"""
+    Private function importing NumPy on first use.
+
+    Returns:
+        The numpy module, False when it is not installed
+
+    """
+    global _numpy  # pylint: disable=W0603
+    if _numpy is None:
+        try:
+            import numpy  # pylint: disable=C0415
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+
+def nibble_states(data_pins) -> list:
+    r"""
+    Pin levels of the transfers of every byte value.
+
+    Args:
+        data_pins: D4-D7 for a 4 bit wide bus, D0-D7 for an 8 bit wide one
+
+    Returns:
+        :obj:`list`: 256 tuples of ``{pin: level}`` dicts, high nibble then low nibble on a 4 bit wide
+        bus, a single transfer on an 8 bit wide one
+
+    """
+    data_pins = tuple(data_pins)
+    if len(data_pins) == 8:
+        return [({pin: (value >> bit) & 1 for bit, pin in enumerate(data_pins)},) for value in range(256)]
+    nibbles = [{pin: (nibble >> bit) & 1 for bit, pin in enumerate(data_pins)} for nibble in range(16)]
+    return [(nibbles[value >> 4], nibbles[value & 0x0F]) for value in range(256)]
+
+
+class PinTable:
+    r"""
+    The output bytes of every byte value, all of the same length.
+
+    Args:
+        entries: 256 :obj:`bytes`, indexed by the byte value
+
+    Examples::
+
+        table = PinTable([bytes((value | 0x04, value)) for value in range(256)])
+        bus.write(address, table.encode(b'Hello'))
+
+    """
+
+    def __init__(self, entries):
+        self.entries = list(entries)
+        if len(self.entries) != 256:
+            raise ValueError('a pin table needs 256 entries')
+        #: Bytes per value
+        self.width = len(self.entries[0])
+        self._array = None
+
+    def __getitem__(self, value: int) -> bytes:
+        return self.entries[value]
+
+    def encode(self, data: bytes) -> bytes:
+        r"""
+        Output bytes of a line.
+
+        Args:
+            data (:obj:`bytes`): Byte values to send
+
+        Returns:
+            :obj:`bytes`: The entries of the values one after the other
+
+        """
+        if len(data) >= NUMPY_MIN_LENGTH:
+            numpy = _load_numpy()
+            if numpy:
+                if self._array is None:
+                    self._array = numpy.frombuffer(b''.join(self.entries), numpy.uint8).reshape(256, self.width)
+                return self._array[numpy.frombuffer(bytes(data), numpy.uint8)].tobytes()
+        entries = self.entries
+        return b''.join([entries[value] for value in data])
+
+
+class GpioTableBus:
+    r"""
+    Mixin replacing the Adafruit driver's bit by bit ``write8`` with :func:`nibble_states` lookups.
+
+    Put it behind :class:`LcdScroll.bus.LcdScrollBus` in the bases.  It only takes over while the
+    display's GPIO object has ``output_pins``, on the emulator the driver's ``write8`` runs unchanged.
+    The table is built on the first write.
+
+    """
+    _nibble_states = None
+
+    def write8(self, value, char_mode=False):
+        r"""
+        Write 8-bit value in character or data mode, looking the pin levels up.
+
+        Args:
+            value: Value from 0-255
+            char_mode: True for character data, False for commands
+
+        """
+        gpio = self._gpio
+        if not hasattr(gpio, 'output_pins'):
+            super().write8(value, char_mode)
+            return
+        states = self._nibble_states
+        if states is None:
+            states = self._nibble_states = nibble_states((self._d4, self._d5, self._d6, self._d7))
+        self._delay_microseconds(1000)
+        gpio.output(self._rs, char_mode)
+        for state in states[value]:
+            gpio.output_pins(state)
+            self._pulse_enable()
@@ -0,0 +1,470 @@
+# -*- coding: utf-8 -*-
+"""
+Batched MCP23017 writes for the character LCD plate.
+
+The plate drives the display through an MCP23017 I2C port expander.  The Adafruit driver changes the
+pins one call at a time, RS, the high nibble, three enable levels, the low nibble and three more enable
+levels, and every call is an I2C transaction rewriting both GPIO registers: nine round trips per
+character.
+
+:class:`PlateBatchBus` works out the register values of every pin change for a whole run of characters
+up front, enable pulses included, and streams them in as few block writes as the bus allows.  It turns
+on the expander's byte mode (IOCON.SEQOP) first, in which the register address toggles between GPIOA
+and GPIOB instead of running on, so a block write is a string of GPIOA/GPIOB pairs.  The driver's own
+two byte register writes work the same in either mode.  The controller's busy flag is read in five
+transactions, see :meth:`PlateBatchBus.read_busy_flag`.
+
+:class:`FakeMCP23017` stands in for the expander in tests, it counts I2C transactions and decodes the
+display pins back into bytes for a :class:`Waxfruit_CharLCD.hd44780.HD44780` emulator.
+
+    :program: LcdScroll
+    :file: plate
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Sequential mode block writes of precomputed MCP23017 register values for the LCD plate.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from .bus import GPIO_IN, GPIO_OUT
+from .pins import PinTable
+from .transport import _NibbleDecoder
+
+IODIRA = 0x00
+"""int: MCP23017 port A direction register, port B's follows it, with IOCON.BANK = 0."""
+IOCON = 0x0A
+"""int: MCP23017 configuration register."""
+GPPUA = 0x0C
+"""int: MCP23017 port A pull-up register."""
+GPIOA = 0x12
+"""int: MCP23017 port A register, port B's follows it."""
+OLATA = 0x14
+"""int: MCP23017 port A output latch register."""
+IOCON_SEQOP = 0x20
+"""int: IOCON bit turning sequential addressing off, the address then toggles within a register pair."""
+REGISTERS = 0x16
+"""int: Number of MCP23017 registers with IOCON.BANK = 0."""
+
+PLATE_PINS = {'rs': 15, 'rw': 14, 'en': 13, 'data': (12, 11, 10, 9)}
+"""dict: Expander pins of the plate's RS, R/W, EN and D4-D7 lines."""
+
+
+class PlateBatchBus:
+    r"""
+    Mixin sending the writes of an MCP23017 driven display as block writes of register values.
+
+    Put it right behind :class:`LcdScroll.bus.LcdScrollBus` in the bases.  It takes over ``write8`` and
+    ``send_bytes`` while the display has an expander in :attr:`mcp`, the Adafruit driver's ``_mcp``, and
+    :attr:`batch_writes` is on.  Without one, on the emulator say, the driver's methods run unchanged.
+
+    """
+    _mcp = None
+    _seqop = False
+    _register_tables = None
+    #: Stream whole writes as block writes instead of one transaction per pin change
+    batch_writes = True
+    #: Most register values in one I2C block write, 32 is the SMBus limit
+    mcp_block = 32
+
+    @property
+    def mcp(self):
+        r"""
+        Property: The MCP23017 the display is wired to, None when there is none.
+
+        :getter: Get PlateBatchBus.mcp property
+        :setter: Set PlateBatchBus.mcp property, an Adafruit_GPIO MCP23017 or a :class:`FakeMCP23017`
+
+        """
+        return self._mcp
+
+    @mcp.setter
+    def mcp(self, mcp):
+        self._mcp = mcp
+        self._seqop = False
+
+    def write8(self, value, char_mode=False):
+        r"""
+        Write 8-bit value in character or data mode, as one block write.
+
+        Args:
+            value: Value from 0-255
+            char_mode: True for character data, False for commands
+
+        """
+        if self._mcp is None or not self.batch_writes:
+            super().write8(value, char_mode)
+            return
+        self._delay_microseconds(1000)
+        self._stream(self._register_values(bytes((value,)), char_mode))
+
+    def send_bytes(self, data: bytes):
+        r"""
+        Sends character codes to the display as they are, streamed as block writes.
+
+        Only one write delay is needed for the run: at 100 kHz every register pair takes about 180
+        microseconds on the bus, longer than the controller takes for a character.
+
+        Args:
+            data (:obj:`bytes`): Character codes to send
+
+        """
+        if self._mcp is None or not self.batch_writes:
+            super().send_bytes(data)
+            return
+        if data:
+            self._delay_microseconds(1000)
+            self._write_block(data, True)
+
+    def _write_block(self, data: bytes, char_mode: bool = True):
+        r"""
+        Private function streaming a run of bytes to the expander, counted by :mod:`LcdScroll.stats`.
+
+        Args:
+            data (:obj:`bytes`): Bytes to write
+            char_mode (:obj:`bool`, optional): True for the data register (default), False for commands
+
+        """
+        self._stream(self._register_values(data, char_mode))
+
+    def read_busy_flag(self):
+        r"""
+        Read the controller's busy flag through the expander.
+
+        The data pins are turned to inputs in one IODIR write, RS low and R/W high are set with EN low
+        before EN rises in one block write, GPIOB is read, the second nibble is clocked out and R/W
+        dropped in another block write and the data pins turned back to outputs: five transactions a
+        poll, where setting the pins one at a time takes seventeen.  Without an expander in :attr:`mcp`
+        the backend's own ``read_busy_flag()`` is used, when it has one.
+
+        Returns:
+            :obj:`bool`: The busy flag, or None when there is no way to read it.
+
+        """
+        mcp = self._mcp
+        if mcp is None or not self.batch_writes or self.rw_pin is None:
+            reader = getattr(super(), 'read_busy_flag', None)
+            return None if reader is None else reader()
+        device = mcp._device  # pylint: disable=W0212
+        data_pins = 0
+        for pin in (self._d4, self._d5, self._d6, self._d7):
+            data_pins |= 1 << pin
+        iodir = mcp.iodir[0] | mcp.iodir[1] << 8
+        device.writeList(IODIRA, ((iodir | data_pins) & 0xFF, (iodir | data_pins) >> 8))
+        enable = 1 << self._en
+        port = (mcp.gpio[0] | mcp.gpio[1] << 8) & ~(1 << self._rs | enable) | 1 << self.rw_pin
+        self._stream(bytes((port & 0xFF, port >> 8, (port | enable) & 0xFF, (port | enable) >> 8)))
+        busy = bool((device.readU8(GPIOA + self._d7 // 8) >> self._d7 % 8) & 1)
+        rest = port & ~(1 << self.rw_pin)
+        self._stream(bytes((port & 0xFF, port >> 8, (port | enable) & 0xFF, (port | enable) >> 8,
+                            port & 0xFF, port >> 8, rest & 0xFF, rest >> 8)))
+        mcp.gpio[0], mcp.gpio[1] = rest & 0xFF, rest >> 8
+        device.writeList(IODIRA, (iodir & 0xFF, iodir >> 8))
+        return busy
+
+    def _register_values(self, data: bytes, char_mode: bool) -> bytes:
+        r"""
+        Private function computing the GPIOA/GPIOB pairs that clock a run of bytes into the controller.
+
+        The run starts with EN low and the new RS, so RS has settled before the first rising edge of EN as
+        the controller's address setup time asks.  The expander's buffered register values are brought up
+        to date, so the driver's later writes keep the other pins.
+
+        Args:
+            data (:obj:`bytes`): Bytes to write
+            char_mode (:obj:`bool`): True for the data register
+
+        Returns:
+            :obj:`bytes`: Register values, alternately for GPIOA and GPIOB, one pair more than the table's
+
+        """
+        mcp = self._mcp
+        state = (mcp.gpio[0] | mcp.gpio[1] << 8) & ~self._lcd_mask()
+        if char_mode:
+            state |= 1 << self._rs
+        values = self._register_table(state).encode(data)
+        if values:
+            # the EN low pair of the first high nibble sets RS ahead of the first pulse
+            values = values[2:4] + values
+            mcp.gpio[0], mcp.gpio[1] = values[-2], values[-1]
+        return values
+
+    def _lcd_mask(self) -> int:
+        r"""
+        Private function returning the expander bits of the RS, EN and D4-D7 lines.
+
+        Returns:
+            :obj:`int`: Bit mask over GPIOA and GPIOB, GPIOB in the high byte
+
+        """
+        mask = 0
+        for pin in (self._rs, self._en, self._d4, self._d5, self._d6, self._d7):
+            mask |= 1 << pin
+        return mask
+
+    def _register_table(self, state: int) -> PinTable:
+        r"""
+        Private function returning the register pairs of every byte value, built once per state of the other pins.
+
+        Each byte takes four pairs: the high nibble with EN high, EN low, the low nibble with EN high and
+        EN low, the controller latching each nibble on the falling edge.
+
+        Args:
+            state (:obj:`int`): GPIOA and GPIOB with the display lines low, RS aside
+
+        Returns:
+            :obj:`LcdScroll.pins.PinTable`: Eight register values per byte value
+
+        """
+        tables = self._register_tables
+        if tables is None:
+            tables = self._register_tables = {}
+        table = tables.get(state)
+        if table is None:
+            enable = 1 << self._en
+            nibbles = []
+            for nibble in range(16):
+                port = state
+                for bit, pin in enumerate((self._d4, self._d5, self._d6, self._d7)):
+                    if nibble >> bit & 1:
+                        port |= 1 << pin
+                high = port | enable
+                nibbles.append(bytes((high & 0xFF, high >> 8, port & 0xFF, port >> 8)))
+            table = tables[state] = PinTable(nibbles[value >> 4] + nibbles[value & 0x0F] for value in range(256))
+        return table
+
+    def _stream(self, values: bytearray):
+        r"""
+        Private function writing register pairs to GPIOA in block writes of at most :attr:`mcp_block` values.
+
+        Args:
+            values (:obj:`bytes`): Register values, alternately for GPIOA and GPIOB
+
+        """
+        device = self._mcp._device  # pylint: disable=W0212
+        if not self._seqop:
+            device.write8(IOCON, IOCON_SEQOP)
+            self._seqop = True
+        block = max(self.mcp_block - self.mcp_block % 2, 2)
+        for start in range(0, len(values), block):
+            device.writeList(GPIOA, values[start:start + block])
+
+
+class FakeMCP23017Device:
+    r"""
+    Register model of an MCP23017 on a fake I2C bus, counting transactions.
+
+    Only IOCON.SEQOP of the configuration is modelled, with IOCON.BANK = 0.  Writes to port B are
+    decoded as the plate's display lines.  Enable pulses with R/W high are reads and are not decoded,
+    during one D7 reads the busy flag of an emulator with a ``busy()`` method while it is an input.
+
+    Args:
+        emulator (optional): Object with ``write(value, char_mode)`` receiving every decoded byte
+
+    """
+
+    def __init__(self, emulator=None):
+        self.registers = bytearray(REGISTERS)
+        self.registers[IODIRA] = self.registers[IODIRA + 1] = 0xFF
+        #: I2C transactions so far
+        self.transactions = 0
+        #: Register bytes written so far
+        self.bytes_written = 0
+        self.decoder = _NibbleDecoder(emulator, 4)
+
+    def write8(self, register: int, value: int):
+        r"""
+        Write one register in a transaction.
+
+        Args:
+            register (:obj:`int`): Register address
+            value (:obj:`int`): Value
+
+        """
+        self.writeList(register, (value,))
+
+    def writeList(self, register: int, data):  # pylint: disable=C0103
+        r"""
+        Write registers from an address on in one transaction.
+
+        Args:
+            register (:obj:`int`): Address of the first register
+            data: Values
+
+        """
+        self.transactions += 1
+        for value in data:
+            self._store(register, value)
+            self.bytes_written += 1
+            register = self._next(register)
+
+    def readU8(self, register: int) -> int:  # pylint: disable=C0103
+        r"""
+        Read one register in a transaction.
+
+        Args:
+            register (:obj:`int`): Register address
+
+        Returns:
+            :obj:`int`: Value
+
+        """
+        return self.readList(register, 1)[0]
+
+    def readList(self, register: int, length: int) -> bytearray:  # pylint: disable=C0103
+        r"""
+        Read registers from an address on in one transaction.
+
+        Args:
+            register (:obj:`int`): Address of the first register
+            length (:obj:`int`): Number of values
+
+        Returns:
+            :obj:`bytearray`: Values
+
+        """
+        self.transactions += 1
+        values = bytearray()
+        for _ in range(length):
+            values.append(self._load(register))
+            register = self._next(register)
+        return values
+
+    def _load(self, register: int) -> int:
+        r"""
+        Private function reading one register, with the controller driving D7 during a read.
+
+        Args:
+            register (:obj:`int`): Register address
+
+        Returns:
+            :obj:`int`: Value
+
+        """
+        value = self.registers[register]
+        if register != GPIOA + 1:
+            return value
+        d7 = 1 << (PLATE_PINS['data'][-1] - 8)
+        reading = 1 << (PLATE_PINS['rw'] - 8) | 1 << (PLATE_PINS['en'] - 8)
+        busy = getattr(self.decoder.emulator, 'busy', None)
+        if value & reading == reading and self.registers[IODIRA + 1] & d7 and busy is not None:
+            value = value | d7 if busy() else value & ~d7
+        return value
+
+    def _next(self, register: int) -> int:
+        r"""
+        Private function returning the register address after an access.
+
+        Args:
+            register (:obj:`int`): Address just accessed
+
+        Returns:
+            :obj:`int`: The other register of the pair in byte mode, the next register otherwise
+
+        """
+        if self.registers[IOCON] & IOCON_SEQOP:
+            return register ^ 1
+        return (register + 1) % REGISTERS
+
+    def _store(self, register: int, value: int):
+        r"""
+        Private function writing one register, latching the display lines on a falling edge of EN.
+
+        Args:
+            register (:obj:`int`): Register address
+            value (:obj:`int`): Value
+
+        """
+        if register in (IOCON, IOCON + 1):
+            self.registers[IOCON] = self.registers[IOCON + 1] = value
+            return
+        if register in (GPIOA, OLATA):
+            register = OLATA
+        elif register in (GPIOA + 1, OLATA + 1):
+            register = OLATA + 1
+            enable = 1 << (PLATE_PINS['en'] - 8)
+            old = self.registers[register]
+            if old & enable and not value & enable and not old >> (PLATE_PINS['rw'] - 8) & 1:
+                nibble = 0
+                for bit, pin in enumerate(PLATE_PINS['data']):
+                    if old >> (pin - 8) & 1:
+                        nibble |= 1 << bit
+                self.decoder.latch(nibble << 4, old >> (PLATE_PINS['rs'] - 8) & 1)
+        self.registers[register] = value
+        if register in (OLATA, OLATA + 1):
+            self.registers[register - 2] = value
+
+
+class FakeMCP23017:
+    r"""
+    Adafruit_GPIO MCP23017 stand-in on a :class:`FakeMCP23017Device`, setting pins the way the driver does.
+
+    Args:
+        emulator (optional): Object with ``write(value, char_mode)`` receiving every decoded byte, an
+            emulator that has been initialised already is decoded in its current interface mode
+
+    """
+
+    def __init__(self, emulator=None):
+        self._device = FakeMCP23017Device(emulator)
+        self._device.decoder.eight_bit = getattr(emulator, 'eight_bit', True)
+        self.iodir = [0xFF, 0xFF]
+        self.gppu = [0x00, 0x00]
+        self.gpio = [0x00, 0x00]
+        self._device.writeList(IODIRA, self.iodir)
+        self._device.writeList(GPPUA, self.gppu)
+
+    def setup(self, pin: int, value: int):
+        r"""
+        Set a pin's mode.
+
+        Args:
+            pin (:obj:`int`): The pin
+            value (:obj:`int`): GPIO_OUT or GPIO_IN
+
+        """
+        if value == GPIO_IN:
+            self.iodir[pin // 8] |= 1 << (pin % 8)
+        elif value == GPIO_OUT:
+            self.iodir[pin // 8] &= ~(1 << (pin % 8))
+        else:
+            raise ValueError('Unexpected value.  Must be GPIO_IN or GPIO_OUT.')
+        self._device.writeList(IODIRA, self.iodir)
+
+    def output(self, pin: int, value):
+        r"""
+        Set one pin.
+
+        Args:
+            pin (:obj:`int`): The pin
+            value: Level
+
+        """
+        self.output_pins({pin: value})
+
+    def output_pins(self, pins: dict):
+        r"""
+        Set several pins, then write both GPIO registers.
+
+        Args:
+            pins (:obj:`dict`): Level of each pin
+
+        """
+        for pin, value in pins.items():
+            if value:
+                self.gpio[pin // 8] |= 1 << (pin % 8)
+            else:
+                self.gpio[pin // 8] &= ~(1 << (pin % 8))
+        self._device.writeList(GPIOA, self.gpio)
+
+    def input(self, pin: int) -> bool:
+        r"""
+        Read a pin.
+
+        Args:
+            pin (:obj:`int`): The pin
+
+        Returns:
+            :obj:`bool`: Its level
+
+        """
+        gpio = self._device.readList(GPIOA, 2)
+        return bool(gpio[pin // 8] & 1 << (pin % 8))
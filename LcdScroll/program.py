@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Precompiled messages for LcdScroller.
+
+Messages that are shown over and over do not need to be laid out, diffed and encoded every time.
+:meth:`LcdScroll.lcdscroll.LcdScroller.compile_message` runs a message once on a recording display
+and keeps the bus operations it produced as a compact program, which
+:meth:`LcdScroll.lcdscroll.LcdScroller.send_program` replays on any display with the same geometry
+and character mapping.
+
+A program is a byte string of operations::
+
+    OP_COMMAND value            write one command byte
+    OP_DATA length byte...      write 1-255 data bytes
+    OP_DELAY low high           wait a number of microseconds, as the driver would after a clear
+    OP_FRAME                    end of one step of the animation
+
+    :program: LcdScroll
+    :file: program
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Recording and replay of precompiled message programs.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import time
+from collections import namedtuple
+
+OP_COMMAND = 0x00
+"""int: Operation writing one command byte."""
+OP_DATA = 0x01
+"""int: Operation writing a run of data bytes."""
+OP_DELAY = 0x02
+"""int: Operation waiting a number of microseconds."""
+OP_FRAME = 0x03
+"""int: Operation ending a frame."""
+
+MAX_RUN = 0xFF
+"""int: Most data bytes in one OP_DATA operation."""
+MAX_DELAY = 0xFFFF
+"""int: Most microseconds in one OP_DELAY operation."""
+
+
+class MessageProgram(namedtuple('MessageProgram', 'key code frames rows index')):
+    r"""
+    A message compiled into bus operations, immutable and hashable.
+
+    Attributes:
+        key (:obj:`tuple`): Configuration the program was compiled for, see
+            :meth:`LcdScroll.lcdscroll.LcdScroller.program_key`
+        code (:obj:`bytes`): The operations, a read only :obj:`memoryview` of the file for programs from
+            :class:`LcdScroll.cache.ProgramCache`
+        frames (:obj:`int`): Number of OP_FRAME operations
+        rows (:obj:`tuple`): Character codes on each line afterwards, None when that is not known
+        index (:obj:`int`): Display memory ring index of the address counter afterwards, None when not known
+
+    """
+    __slots__ = ()
+
+    def replay(self, display, frame_delay: float = 0, sleep=time.sleep, frames: int = None) -> bool:
+        r"""
+        Feed the operations to a display.
+
+        Use :meth:`LcdScroll.lcdscroll.LcdScroller.send_program`, which also checks the program fits the
+        display and brings its shadow copy up to date.
+
+        Args:
+            display: Display with ``write8``, ``send_bytes`` and ``_delay_microseconds``
+            frame_delay (:obj:`float`, optional): Seconds to wait after every frame (default 0)
+            sleep (optional): Function sleeping for a number of seconds (default time.sleep)
+            frames (:obj:`int`, optional): Stop after this many frames, None for the whole program
+
+        Returns:
+            :obj:`bool`: True when the whole program was replayed
+
+        """
+        code = self.code
+        write8 = display.write8
+        send_bytes = display.send_bytes
+        delay = display._delay_microseconds  # pylint: disable=W0212
+        index = 0
+        end = len(code)
+        remaining = -1 if frames is None else frames
+        while index < end:
+            operation = code[index]
+            if operation == OP_DATA:
+                length = code[index + 1]
+                send_bytes(code[index + 2:index + 2 + length])
+                index += 2 + length
+            elif operation == OP_COMMAND:
+                write8(code[index + 1], False)
+                index += 2
+            elif operation == OP_DELAY:
+                delay(code[index + 1] | code[index + 2] << 8)
+                index += 3
+            else:
+                index += 1
+                remaining -= 1
+                if remaining == 0:
+                    return index == end
+                if frame_delay:
+                    sleep(frame_delay)
+        return True
+
+
+class ProgramWriter:
+    r"""
+    Builds the code of a :class:`MessageProgram` one bus operation at a time.
+
+    Consecutive data bytes are gathered into one OP_DATA operation.
+
+    """
+
+    def __init__(self):
+        self.code = bytearray()
+        #: Frames ended so far
+        self.frames = 0
+        # position of the length byte of the open OP_DATA operation
+        self._run = None
+
+    def command(self, value: int):
+        r"""
+        Add a command byte.
+
+        Args:
+            value (:obj:`int`): Command byte
+
+        """
+        self._run = None
+        self.code += bytes((OP_COMMAND, value))
+
+    def data(self, value: int):
+        r"""
+        Add a data byte.
+
+        Args:
+            value (:obj:`int`): Character code or CGRAM row
+
+        """
+        code = self.code
+        if self._run is None or code[self._run] == MAX_RUN:
+            code += bytes((OP_DATA, 0))
+            self._run = len(code) - 1
+        code[self._run] += 1
+        code.append(value)
+
+    def delay(self, microseconds: float):
+        r"""
+        Add a delay.
+
+        Args:
+            microseconds (:obj:`float`): Time to wait, rounded to whole microseconds
+
+        """
+        self._run = None
+        remaining = int(round(microseconds))
+        while remaining > 0:
+            step = min(remaining, MAX_DELAY)
+            self.code += bytes((OP_DELAY, step & 0xFF, step >> 8))
+            remaining -= step
+
+    def frame(self):
+        r"""
+        End a frame.
+
+        """
+        self._run = None
+        self.code.append(OP_FRAME)
+        self.frames += 1
+
+    def program(self, key: tuple, rows=None, index: int = None) -> MessageProgram:
+        r"""
+        The program written so far.
+
+        Args:
+            key (:obj:`tuple`): Configuration the program was compiled for
+            rows (optional): Character codes on each line afterwards, None when not known
+            index (:obj:`int`, optional): Display memory ring index of the address counter afterwards
+
+        Returns:
+            :obj:`MessageProgram`: The program
+
+        """
+        if rows is not None:
+            rows = tuple(bytes(row) for row in rows)
+        return MessageProgram(key, bytes(self.code), self.frames, rows, index)
+
+
+class ProgramRecorder:
+    r"""
+    Display mixin sending bus operations to a :class:`ProgramWriter` instead of the controller.
+
+    Put it first in the bases of a display class.  Nothing is recorded while ``writer`` is None.
+    The per write delay of ``write8`` is left out, the display replaying the program adds its own.
+
+    """
+    #: Writer receiving the operations
+    writer = None
+
+    def write8(self, value, char_mode=False):
+        r"""
+        Record one byte.
+
+        Args:
+            value: Byte to write
+            char_mode (optional): True for data, False for a command
+
+        """
+        if self.writer is None:
+            return
+        if char_mode:
+            self.writer.data(value)
+        else:
+            self.writer.command(value)
+
+    def _delay_microseconds(self, microseconds):
+        r"""
+        Record a delay.
+
+        Args:
+            microseconds: Time to wait
+
+        """
+        if self.writer is not None:
+            self.writer.delay(microseconds)
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Background rendering for LcdScroller displays.
+
+A renderer owns its displays and draws on them from a worker thread.  Producers hand it text with
+:meth:`LcdRenderer.submit`, which never waits on the bus.  Only the newest text for each display is
+kept, anything older that has not been drawn yet is dropped, and a message still being drawn is
+abandoned between two steps when newer text for its display arrives.
+
+    :program: LcdScroll
+    :file: renderer
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Worker thread rendering the latest message for one or more displays.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class FrameLatency:
+    r"""
+    Running statistics of how long a display's frames take to draw.
+
+    A frame is one step of a message, a render or a marquee shift.
+
+    """
+
+    def __init__(self):
+        #: Frames drawn
+        self.count = 0
+        #: Seconds spent drawing all of them
+        self.total = 0.0
+        #: Seconds taken by the slowest frame
+        self.max = 0.0
+        #: Seconds taken by the latest frame
+        self.last = 0.0
+
+    def add(self, seconds: float):
+        r"""
+        Record one frame.
+
+        Args:
+            seconds (:obj:`float`): Time the frame took to draw
+
+        """
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        r"""
+        Property: Average seconds per frame, 0 before the first frame
+
+        :getter: Get FrameLatency.mean property
+
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self):
+        return 'FrameLatency(count=%d, mean=%.6f, max=%.6f, last=%.6f)' % (self.count, self.mean, self.max, self.last)
+
+
+class LcdRenderer:
+    r"""
+    Worker thread drawing messages on LcdScroller displays.
+
+    Displays with work to do take turns, one step (a render or a marquee shift) each, so a long
+    message on one display does not hold up the others.
+
+    Args:
+        display (:obj:`LcdScroller`, optional): Display used when submit() is not given one
+        maxsize (:obj:`int`, optional): Number of displays that can have text waiting (default 16)
+        name (:obj:`str`, optional): Name of the worker thread
+
+    Examples::
+
+        renderer = LcdRenderer(display)
+        renderer.submit('CPU 42%')
+        renderer.submit('CPU 43%')  # replaces 'CPU 42%' if it has not been drawn yet
+        renderer.stop()
+
+    """
+
+    def __init__(self, display=None, maxsize: int = 16, name: str = None):
+        self.display = display
+        self.maxsize = maxsize
+        #: Messages accepted by submit()
+        self.submitted = 0
+        #: Messages superseded before they were completely drawn
+        self.dropped = 0
+        #: Messages refused because too many displays had text waiting
+        self.rejected = 0
+        #: Messages drawn to completion
+        self.rendered = 0
+        #: Last exception raised while drawing, the display is skipped until it gets new text
+        self.last_error = None
+        #: :class:`FrameLatency` of every display drawn so far
+        self.latency = {}
+        self._pending = OrderedDict()
+        self._jobs = OrderedDict()
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, text: str, display=None) -> bool:
+        r"""
+        Queue text for a display without waiting.
+
+        Args:
+            text: Message to show
+            display (:obj:`LcdScroller`, optional): Display to show it on, defaults to the renderer's display
+
+        Returns:
+            :obj:`bool`: False when the text was refused because the queue is full
+
+        """
+        if display is None:
+            display = self.display
+        with self._condition:
+            if display in self._pending:
+                self.dropped += 1
+            elif len(self._pending) >= self.maxsize:
+                self.rejected += 1
+                return False
+            self._pending[display] = text
+            self.submitted += 1
+            self._condition.notify_all()
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        r"""
+        Wait until everything submitted so far has been drawn.
+
+        Args:
+            timeout (:obj:`float`, optional): Seconds to wait, forever when None
+
+        Returns:
+            :obj:`bool`: False if the timeout expired first
+
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not (self._pending or self._jobs), timeout)
+
+    def stop(self, timeout: float = None):
+        r"""
+        Stop the worker thread, abandoning anything not yet drawn.
+
+        Args:
+            timeout (:obj:`float`, optional): Seconds to wait for the thread, forever when None
+
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    @staticmethod
+    def _job(display, text: str):
+        r"""
+        Private generator drawing one message, one step per iteration.
+
+        Args:
+            display (:obj:`LcdScroller`): Display to draw on
+            text: Message to draw
+
+        """
+        display.message_text = text
+        with display.batched_delays():
+            yield from display._iter_send()  # pylint: disable=W0212
+
+    def _take_pending(self):
+        r"""
+        Private function turning waiting text into jobs, called with the condition held.
+
+        """
+        for display, text in self._pending.items():
+            job = self._jobs.pop(display, None)
+            if job is not None:
+                job.close()
+                self.dropped += 1
+            self._jobs[display] = self._job(display, text)
+        self._pending.clear()
+
+    def _step(self, display, job):
+        r"""
+        Private function running one step of a display's job.
+
+        Args:
+            display (:obj:`LcdScroller`): Display the job draws on
+            job: Generator from :meth:`_job`
+
+        Returns:
+            :obj:`bool`: True while the job has more steps
+
+        """
+        start = time.perf_counter()
+        try:
+            next(job)
+        except StopIteration:
+            self.rendered += 1
+            return False
+        except Exception as error:  # pylint: disable=W0703
+            self.last_error = error
+            return False
+        latency = self.latency.get(display)
+        if latency is None:
+            latency = self.latency[display] = FrameLatency()
+        latency.add(time.perf_counter() - start)
+        return True
+
+    def _run(self):
+        r"""
+        Private function run by the worker thread.
+
+        """
+        while True:
+            with self._condition:
+                if self._pending:
+                    self._take_pending()
+                if not self._jobs:
+                    self._condition.notify_all()
+                    self._condition.wait_for(lambda: self._pending or self._stopping)
+                if self._stopping:
+                    for job in self._jobs.values():
+                        job.close()
+                    self._jobs.clear()
+                    self._condition.notify_all()
+                    return
+                if not self._jobs:
+                    continue
+                # round robin, the display that goes now moves to the back of the line
+                display, job = next(iter(self._jobs.items()))
+                self._jobs.move_to_end(display)
+            if not self._step(display, job):
+                with self._condition:
+                    if self._jobs.get(display) is job:
+                        del self._jobs[display]
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Frame pacing for LcdScroller animations.
+
+Scrolling normally runs as fast as the bus allows, which makes the same message crawl on a busy bus
+and race on an idle one.  FrameScheduler puts every step of an animation on a fixed timeline of
+monotonic deadlines instead.  When drawing falls behind, steps whose frame has already gone by are
+applied to the screen buffer without being drawn, so the animation keeps its pace and only gets
+choppier.
+
+    :program: LcdScroll
+    :file: scheduler
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Fixed frame rate pacing with frame dropping for scroll and marquee animations.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import time
+from .stats import LatencyHistogram
+
+JITTER_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5)
+"""tuple: Upper bounds in seconds of the jitter histogram buckets."""
+
+
+class FrameScheduler:
+    r"""
+    Runs animation steps at a target frame rate.
+
+    Args:
+        fps (:obj:`float`, optional): Frames per second (default 10)
+        clock (optional): Monotonic clock returning seconds (default time.monotonic)
+        sleep (optional): Function sleeping for a number of seconds (default time.sleep)
+
+    Examples::
+
+        scheduler = FrameScheduler(fps=4)
+        display.send_message_paced(scheduler=scheduler)
+        print(scheduler.stats()['dropped'])
+
+    """
+
+    def __init__(self, fps: float = 10.0, clock=time.monotonic, sleep=time.sleep):
+        if fps <= 0:
+            raise ValueError('fps must be positive')
+        self.fps = fps
+        self.clock = clock
+        self.sleep = sleep
+        #: Frames drawn
+        self.frames = 0
+        #: Frames skipped because drawing fell behind
+        self.dropped = 0
+        #: How late frames were drawn after their deadline
+        self.jitter = LatencyHistogram(JITTER_BUCKETS)
+
+    def reset(self):
+        r"""
+        Zero the frame counters and the jitter histogram.
+
+        """
+        self.frames = 0
+        self.dropped = 0
+        self.jitter = LatencyHistogram(JITTER_BUCKETS)
+
+    def stats(self) -> dict:
+        r"""
+        Counters of the frames run so far.
+
+        Returns:
+            :obj:`dict`: frames, dropped and jitter, a :meth:`LcdScroll.stats.LatencyHistogram.snapshot`
+
+        """
+        return {'frames': self.frames, 'dropped': self.dropped, 'jitter': self.jitter.snapshot()}
+
+    def run(self, steps, render=None, estimate=None):
+        r"""
+        Run an animation, one step per frame.
+
+        With a render function each step only changes the screen buffer and render draws it, a step
+        whose frame is over before it could be drawn is dropped.  The final step is always drawn.
+        Without one every step draws itself, the steps are then paced but can not be skipped, a late
+        step runs at once and counts as dropped.  The end of such an animation is only noticed when the
+        step after the last is due, so the last frame stays up for a whole period.
+
+        With an estimate function a late step is also dropped when drawing it is expected to run past
+        the next deadline, before any time is spent on the bus.  A step on time is always drawn, so a
+        bus too slow for the frame rate still shows every frame it can.
+
+        Args:
+            steps: Iterable of animation steps, like :meth:`LcdScroll.lcdscroll.LcdScroller._iter_message`
+            render (optional): Function drawing the current state
+            estimate (optional): Function returning the seconds the next render will take
+
+        """
+        period = 1.0 / self.fps
+        clock = self.clock
+        start = clock()
+        pending = False
+        index = 0
+        iterator = iter(steps)
+        while True:
+            deadline = start + index * period
+            if render is None:
+                late = self._wait(deadline)
+            try:
+                next(iterator)
+            except StopIteration:
+                break
+            index += 1
+            if render is None:
+                self._record(late, period)
+                continue
+            now = clock()
+            if now >= deadline + period or (estimate is not None and now > deadline and
+                                            now + estimate() > deadline + period):
+                # the next frame is due already or will be before this one is drawn, drawing it would
+                # only hold the next one up
+                self.dropped += 1
+                pending = True
+                continue
+            self._record(self._wait(deadline), period)
+            render()
+            pending = False
+        if pending:
+            # the last step is drawn however late it is, so it was not dropped after all
+            self.dropped -= 1
+            self.jitter.add(clock() - (start + (index - 1) * period))
+            self.frames += 1
+            render()
+
+    def _wait(self, deadline: float) -> float:
+        r"""
+        Private function waiting for a frame's deadline.
+
+        Args:
+            deadline (:obj:`float`): When the frame is due
+
+        Returns:
+            :obj:`float`: Seconds the frame starts after its deadline
+
+        """
+        now = self.clock()
+        if now < deadline:
+            self.sleep(deadline - now)
+            now = self.clock()
+        return max(now - deadline, 0.0)
+
+    def _record(self, late: float, period: float):
+        r"""
+        Private function counting a frame.
+
+        Args:
+            late (:obj:`float`): Seconds the frame started after its deadline
+            period (:obj:`float`): Length of a frame, a frame a whole period late counts as dropped
+
+        """
+        self.jitter.add(late)
+        self.frames += 1
+        if late >= period:
+            self.dropped += 1
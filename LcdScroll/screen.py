@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Screen buffer for LcdScroller.
+
+The rows of the message are kept as encoded :obj:`bytearray` rows, one display width each, in a ring.
+Scrolling moves the index of the top visible row and blanks the one row that comes into view, so its
+cost does not depend on how many lines the message has produced.  Rows that scroll out of view stay in
+the ring until it wraps round, up to the scrollback depth, and can be viewed again.
+
+    :program: LcdScroll
+    :file: screen
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Fixed capacity ring of display rows with scrollback.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from .shadow import BLANK
+
+
+class ScreenRing:
+    r"""
+    Visible rows of the display plus a scrollback history, in a ring of ``lines + scrollback`` rows.
+
+    Scrolling up (new lines at the bottom) leaves the history above the visible rows, scrolling down
+    (new lines at the top) leaves it below.  The history is dropped when the direction changes.
+
+    Args:
+        columns (:obj:`int`): Number of columns on display
+        lines (:obj:`int`): Number of lines on display
+        scrollback (:obj:`int`, optional): Rows kept after they scroll out of view (default 0)
+
+    """
+
+    def __init__(self, columns: int, lines: int, scrollback: int = 0):
+        self._allocate(columns, lines, scrollback)
+
+    def reset(self):
+        r"""
+        Blank the visible rows and drop the history.
+
+        """
+        for line in range(self.lines):
+            self._blank(self._index(line))
+        self.history = 0
+
+    def resize(self, columns: int, lines: int, scrollback: int = None):
+        r"""
+        Change the geometry, keeping as much of the visible rows as still fits and dropping the history.
+
+        Args:
+            columns (:obj:`int`): Number of columns on display
+            lines (:obj:`int`): Number of lines on display
+            scrollback (:obj:`int`, optional): New scrollback depth, unchanged when None
+
+        """
+        if scrollback is None:
+            scrollback = self.scrollback
+        visible = [(self._rows[self._index(line)], self._lengths[self._index(line)])
+                   for line in range(min(lines, self.lines))]
+        self._allocate(columns, lines, scrollback)
+        for line, (row, length) in enumerate(visible):
+            self._rows[line][:] = row[:columns].ljust(columns, bytes([BLANK]))
+            self._lengths[line] = min(length, columns)
+
+    def put(self, line: int, column, data: bytes):
+        r"""
+        Write character codes on a visible row, blanking the rest of the row after them.
+
+        Args:
+            line (:obj:`int`): Visible row to write on
+            column (:obj:`int`): Column to start at, None to carry on after the last write to the row
+            data (:obj:`bytes`): Character codes, anything past the last column is dropped
+
+        """
+        index = self._index(line)
+        if column is None:
+            column = self._lengths[index]
+        row = self._rows[index]
+        end = column + len(data)
+        if column < self.columns:
+            row[column:] = data[:self.columns - column].ljust(self.columns - column, bytes([BLANK]))
+        self._lengths[index] = end
+
+    def scroll(self, up: bool):
+        r"""
+        Move every visible row one line, blanking the row that comes into view.
+
+        Args:
+            up (:obj:`bool`): True to move the rows up and bring a blank row in at the bottom, False
+                to move them down and bring one in at the top
+
+        """
+        if up != self._history_up:
+            self._history_up = up
+            self.history = 0
+        if up:
+            self._head = (self._head + 1) % self._capacity
+            self._blank(self._index(self.lines - 1))
+        else:
+            self._head = (self._head - 1) % self._capacity
+            self._blank(self._head)
+        self.history = min(self.history + 1, self.scrollback)
+
+    def window(self, offset: int = 0) -> list:
+        r"""
+        Rows to show.
+
+        Args:
+            offset (:obj:`int`, optional): Rows to look back into the history, 0 for the live rows
+
+        Returns:
+            :obj:`list`: One :obj:`bytes` per visible line, each exactly ``columns`` long
+
+        """
+        offset = max(0, min(offset, self.history))
+        if self._history_up:
+            offset = -offset
+        return [bytes(self._rows[(self._head + offset + line) % self._capacity]) for line in range(self.lines)]
+
+    def _allocate(self, columns: int, lines: int, scrollback: int):
+        r"""
+        Private function setting up an empty ring.
+
+        """
+        self.columns = columns
+        self.lines = lines
+        self.scrollback = scrollback
+        #: Rows in the history
+        self.history = 0
+        self._capacity = lines + scrollback
+        self._rows = [bytearray([BLANK]) * columns for _ in range(self._capacity)]
+        # characters put on each row, put() without a column carries on from there
+        self._lengths = [0] * self._capacity
+        # ring index of the top visible row
+        self._head = 0
+        # True when the history is above the visible rows
+        self._history_up = True
+
+    def _index(self, line: int) -> int:
+        r"""
+        Private function converting a visible row to its ring index.
+
+        """
+        return (self._head + line) % self._capacity
+
+    def _blank(self, index: int):
+        r"""
+        Private function blanking one ring row.
+
+        """
+        self._rows[index][:] = bytes([BLANK]) * self.columns
+        self._lengths[index] = 0
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Shadow copy of the HD44780 display memory.
+
+Every write to the controller is a series of bus transactions, and on the I2C plate each of those is
+several MCP23017 register writes.  Keeping a copy of what the display is currently showing lets
+LcdScroller compare the frame it wants with the frame that is already there and only send the cells
+that changed.
+
+The shadow also follows the controller's address counter.  In two line mode display memory is one
+ring of 80 cells, 0x00-0x27 followed by 0x40-0x67, and the lines of a four line display are windows
+into it at :data:`ROW_OFFSETS`.  On a 20x4 display line 0 runs straight on into line 2 and line 1 into
+line 3, so writes that are ordered by address need far fewer cursor moves than writes ordered by line.
+
+    :program: LcdScroll
+    :file: shadow
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Shadow DDRAM model and frame differencing for LcdScroller.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+
+BLANK = 0x20
+"""int: Character code the controller fills DDRAM with on a clear."""
+
+MERGE_GAP = 1
+"""int: Largest run of unchanged cells that is rewritten rather than skipped with a cursor move.
+
+Moving the cursor costs one command write, rewriting a cell costs one data write, so a gap of one
+cell costs the same either way and is merged to save a call.
+"""
+
+ROW_OFFSETS = (0x00, 0x40, 0x14, 0x54)
+"""tuple: Display memory address of the first cell of each line, the driver's LCD_ROW_OFFSETS."""
+
+DDRAM_SIZE = 80
+"""int: Cells in the ring of display memory in two line mode."""
+
+SECOND_HALF = 0x40
+"""int: Address of the second 40 cells of display memory."""
+
+
+def ddram_index(address: int):
+    r"""
+    Position of a display memory address in the ring of cells.
+
+    Args:
+        address (:obj:`int`): Address as sent with the set DDRAM address command
+
+    Returns:
+        :obj:`int`: 0-79 in the order the address counter steps through the cells, None for
+        an address that is not in display memory
+
+    """
+    if 0 <= address < DDRAM_SIZE // 2:
+        return address
+    if SECOND_HALF <= address < SECOND_HALF + DDRAM_SIZE // 2:
+        return address - SECOND_HALF + DDRAM_SIZE // 2
+    return None
+
+
+def ddram_address(index: int) -> int:
+    r"""
+    Display memory address of a position in the ring of cells, the inverse of :func:`ddram_index`.
+
+    Args:
+        index (:obj:`int`): 0-79
+
+    Returns:
+        :obj:`int`: Address as sent with the set DDRAM address command
+
+    """
+    if index < DDRAM_SIZE // 2:
+        return index
+    return index - DDRAM_SIZE // 2 + SECOND_HALF
+
+
+class ShadowDDRAM:
+    r"""
+    Model of the characters currently shown on the display.
+
+    The shadow starts out invalid because nothing is known about the display until it has been cleared.
+    Rows are kept as :obj:`bytearray` of character codes, one per visible column.
+
+    Args:
+        columns (:obj:`int`): Number of columns on display
+        lines (:obj:`int`): Number of lines on display
+
+    """
+
+    def __init__(self, columns: int, lines: int):
+        self.columns = columns
+        self.lines = lines
+        #: False until the display contents are known (after a clear)
+        self.valid = False
+        #: Ring index of the address counter, None when unknown
+        self.index = None
+        self.rows = [bytearray([BLANK]) * columns for _ in range(lines)]
+        self._map()
+
+    @property
+    def cursor(self):
+        r"""
+        Property: Where the next data write will land.
+
+        :getter: (column, line), the column is past the last visible one when the address counter is
+            in display memory that is not shown, None when unknown
+
+        """
+        if self.index is None:
+            return None
+        return self._cells[self.index]
+
+    @property
+    def address(self):
+        r"""
+        Property: Display memory address of the address counter.
+
+        :getter: The address, None when unknown
+
+        """
+        if self.index is None:
+            return None
+        return ddram_address(self.index)
+
+    def invalidate(self):
+        r"""
+        Forget what is on the display, the next render will start with a clear.
+
+        """
+        self.valid = False
+        self.index = None
+
+    def blank(self):
+        r"""
+        Record that the display has just been cleared.
+
+        """
+        for row in self.rows:
+            row[:] = bytes([BLANK]) * self.columns
+        self.valid = True
+        self.index = 0
+
+    def load(self, rows, index: int):
+        r"""
+        Record a display whose contents are known from elsewhere.
+
+        Args:
+            rows: Character codes of each line, None when they are not known
+            index (:obj:`int`): Ring index of the address counter, None when not known
+
+        """
+        if rows is None:
+            self.invalidate()
+            return
+        for row, codes in zip(self.rows, rows):
+            row[:] = codes
+        self.valid = True
+        self.index = index
+
+    def resize(self, columns: int, lines: int):
+        r"""
+        Change the geometry of the shadow, this always invalidates it.
+
+        Args:
+            columns (:obj:`int`): Number of columns on display
+            lines (:obj:`int`): Number of lines on display
+
+        """
+        self.columns = columns
+        self.lines = lines
+        self.rows = [bytearray([BLANK]) * columns for _ in range(lines)]
+        self._map()
+        self.invalidate()
+
+    def move(self, column: int, line: int):
+        r"""
+        Record a cursor move.
+
+        Args:
+            column (:obj:`int`): Column the cursor was moved to
+            line (:obj:`int`): Line the cursor was moved to
+
+        """
+        self.index = ddram_index(ROW_OFFSETS[line] + column)
+
+    def write(self, data: bytes):
+        r"""
+        Record a data write at the current cursor position.
+
+        The address counter moves on one cell per character, past the end of a line into whatever
+        display memory follows it.
+
+        Args:
+            data (:obj:`bytes`): Character codes that were written
+
+        """
+        index = self.index
+        if index is None:
+            self.invalidate()
+            return
+        cells = self._cells
+        columns = self.columns
+        rows = self.rows
+        for code in data:
+            column, line = cells[index]
+            if column < columns:
+                rows[line][column] = code
+            index += 1
+            if index == DDRAM_SIZE:
+                index = 0
+        self.index = index
+
+    def diff(self, frame: list) -> list:
+        r"""
+        Compare a desired frame with the shadow.
+
+        Runs are put in address order starting from the address counter, so one run follows on from
+        the one before it whenever display memory allows.  Runs that are no more than
+        :data:`MERGE_GAP` unchanged cells apart are merged, also when that carries a run over the end
+        of a line, and a run starting just after the address counter is extended back to it.
+
+        Args:
+            frame (:obj:`list`): One :obj:`bytes` per line, each exactly ``columns`` long
+
+        Returns:
+            :obj:`list`: ``(column, line, data)`` runs that need to be written in that order, data may
+            go on past the end of the line.
+
+        """
+        starts = self._starts
+        runs = []
+        for line, (want, have) in enumerate(zip(frame, self.rows)):
+            if want == have:
+                continue
+            start = end = None
+            for column in range(self.columns):
+                if want[column] == have[column]:
+                    continue
+                if start is None:
+                    start = column
+                elif column - end > MERGE_GAP + 1:
+                    runs.append([starts[line] + start, bytes(want[start:end + 1])])
+                    start = column
+                end = column
+            runs.append([starts[line] + start, bytes(want[start:end + 1])])
+        if not runs:
+            return []
+        origin = 0 if self.index is None else self.index
+        runs.sort(key=lambda run: (run[0] - origin) % DDRAM_SIZE)
+        merged = [runs[0]]
+        for index, data in runs[1:]:
+            last = merged[-1]
+            gap = self._gap(last[0] + len(last[1]), index, frame)
+            if gap is None:
+                merged.append([index, data])
+            else:
+                last[1] += gap + data
+        if self.index is not None:
+            gap = self._gap(self.index, merged[0][0], frame)
+            if gap:
+                merged[0] = [self.index, gap + merged[0][1]]
+        cells = self._cells
+        return [cells[index] + (data,) for index, data in merged]
+
+    def _map(self):
+        r"""
+        Private function working out the (column, line) of every cell of display memory.
+
+        Each cell belongs to the line whose start is the nearest before it in the same half of display
+        memory, with no line there it is counted as past the end of line 0.
+
+        """
+        half = DDRAM_SIZE // 2
+        #: Ring index of the first cell of each line
+        self._starts = [ddram_index(ROW_OFFSETS[line]) for line in range(self.lines)]
+        self._cells = []
+        for index in range(DDRAM_SIZE):
+            before = [(start, line) for line, start in enumerate(self._starts)
+                      if start <= index and start // half == index // half]
+            if before:
+                start, line = max(before)
+                self._cells.append((index - start, line))
+            else:
+                self._cells.append((self.columns + index, 0))
+
+    def _gap(self, begin: int, end: int, frame: list):
+        r"""
+        Private function returning the cells between two ring indexes if they are few enough to rewrite.
+
+        Args:
+            begin (:obj:`int`): Ring index of the first cell of the gap
+            end (:obj:`int`): Ring index just after the gap
+            frame (:obj:`list`): The desired frame the cells are taken from
+
+        Returns:
+            :obj:`bytes`: The cells to write, None when the gap is too big or has cells that are not shown
+
+        """
+        length = (end - begin) % DDRAM_SIZE
+        if length > MERGE_GAP:
+            return None
+        cells = bytearray()
+        for offset in range(length):
+            column, line = self._cells[(begin + offset) % DDRAM_SIZE]
+            if column >= self.columns:
+                return None
+            cells.append(frame[line][column])
+        return bytes(cells)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Bus operation counters for LcdScroller displays.
+
+Instrumentation works by shadowing the display's bus methods with counting wrappers stored on the
+instance.  Turning it off deletes the wrappers again, so a display that is not being measured calls
+the driver's methods directly and pays nothing at all.
+
+    :program: LcdScroll
+    :file: stats
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Per display bus counters and send_message() latency histograms.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import time
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+"""tuple: Upper bounds in seconds of the latency histogram buckets, a last bucket catches the rest."""
+
+INSTRUMENTED = ('write8', '_write_block', 'set_cursor', 'clear', 'create_char', 'message',
+                '_delay_microseconds', 'send_message', 'send_message_async')
+"""tuple: Display methods replaced by counting wrappers while instrumentation is on."""
+
+
+class LatencyHistogram:
+    r"""
+    Histogram of how long an operation took.
+
+    Args:
+        buckets (:obj:`tuple`, optional): Ascending upper bounds in seconds (default LATENCY_BUCKETS)
+
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        #: Samples per bucket, the last entry counts samples above the largest bound
+        self.counts = [0] * (len(buckets) + 1)
+        #: Number of samples
+        self.count = 0
+        #: Seconds of all samples together
+        self.total = 0.0
+        #: Longest sample
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        r"""
+        Record one sample.
+
+        Args:
+            seconds (:obj:`float`): Duration of the operation
+
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self) -> dict:
+        r"""
+        The histogram as plain data.
+
+        Returns:
+            :obj:`dict`: count, total_s, mean_s, max_s and buckets, a list of ``[upper bound, count]`` pairs
+            where the bound of the last bucket is None
+
+        """
+        bounds = list(self.buckets) + [None]
+        return {'count': self.count,
+                'total_s': self.total,
+                'mean_s': self.total / self.count if self.count else 0.0,
+                'max_s': self.max,
+                'buckets': [[bound, count] for bound, count in zip(bounds, self.counts)]}
+
+
+class DisplayStats:
+    r"""
+    Counters of one display's bus traffic.
+
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        r"""
+        Zero every counter.
+
+        """
+        #: Bytes written with char_mode False
+        self.commands = 0
+        #: Bytes written with char_mode True
+        self.data_bytes = 0
+        #: set_cursor() calls
+        self.cursor_moves = 0
+        #: clear() calls
+        self.clears = 0
+        #: create_char() calls
+        self.glyph_uploads = 0
+        #: message() calls
+        self.messages = 0
+        #: Seconds spent in the driver's delays
+        self.delay_s = 0.0
+        #: Latency of send_message() and send_message_async()
+        self.send_message = LatencyHistogram()
+
+    def snapshot(self) -> dict:
+        r"""
+        The counters as plain data.
+
+        Returns:
+            :obj:`dict`: One entry per counter, send_message holds :meth:`LatencyHistogram.snapshot`
+
+        """
+        return {'commands': self.commands,
+                'data_bytes': self.data_bytes,
+                'cursor_moves': self.cursor_moves,
+                'clears': self.clears,
+                'glyph_uploads': self.glyph_uploads,
+                'messages': self.messages,
+                'delay_s': self.delay_s,
+                'send_message': self.send_message.snapshot()}
+
+
+def instrument(display, stats: DisplayStats):
+    r"""
+    Start counting a display's bus operations.
+
+    Methods the display does not have are left alone.
+
+    Args:
+        display: Display to instrument
+        stats (:obj:`DisplayStats`): Counters to update
+
+    """
+    for name in INSTRUMENTED:
+        method = getattr(display, name, None)
+        if method is not None:
+            setattr(display, name, _WRAPPERS[name](stats, method))
+
+
+def uninstrument(display):
+    r"""
+    Stop counting, the display's own methods are called directly again.
+
+    Args:
+        display: Display instrumented with :func:`instrument`
+
+    """
+    for name in INSTRUMENTED:
+        display.__dict__.pop(name, None)
+
+
+def _write8(stats, method):
+    def write8(value, char_mode=False):
+        if char_mode:
+            stats.data_bytes += 1
+        else:
+            stats.commands += 1
+        return method(value, char_mode)
+    return write8
+
+
+def _write_block(stats, method):
+    def write_block(data, char_mode=True):
+        if char_mode:
+            stats.data_bytes += len(data)
+        else:
+            stats.commands += len(data)
+        return method(data, char_mode)
+    return write_block
+
+
+def _set_cursor(stats, method):
+    def set_cursor(col, row):
+        stats.cursor_moves += 1
+        return method(col, row)
+    return set_cursor
+
+
+def _clear(stats, method):
+    def clear():
+        stats.clears += 1
+        return method()
+    return clear
+
+
+def _create_char(stats, method):
+    def create_char(location, pattern):
+        stats.glyph_uploads += 1
+        return method(location, pattern)
+    return create_char
+
+
+def _message(stats, method):
+    def message(text):
+        stats.messages += 1
+        return method(text)
+    return message
+
+
+def _delay_microseconds(stats, method):
+    def delay_microseconds(microseconds):
+        start = time.perf_counter()
+        try:
+            return method(microseconds)
+        finally:
+            stats.delay_s += time.perf_counter() - start
+    return delay_microseconds
+
+
+def _send_message(stats, method):
+    def send_message():
+        start = time.perf_counter()
+        try:
+            return method()
+        finally:
+            stats.send_message.add(time.perf_counter() - start)
+    return send_message
+
+
+def _send_message_async(stats, method):
+    async def send_message_async():
+        start = time.perf_counter()
+        try:
+            return await method()
+        finally:
+            stats.send_message.add(time.perf_counter() - start)
+    return send_message_async
+
+
+_WRAPPERS = {'write8': _write8,
+             '_write_block': _write_block,
+             'set_cursor': _set_cursor,
+             'clear': _clear,
+             'create_char': _create_char,
+             'message': _message,
+             '_delay_microseconds': _delay_microseconds,
+             'send_message': _send_message,
+             'send_message_async': _send_message_async}
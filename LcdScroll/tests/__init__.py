@@ -1 +1,11 @@
 # -*- coding: utf-8 -*-
+"""
+The tests build their displays on the emulator, whatever the platform's default backend is.
+
+"""
+from LcdScroll import use_backend
+
+TEST_BACKEND = 'emulator'
+"""str: Backend the test displays are built on."""
+
+use_backend(TEST_BACKEND)
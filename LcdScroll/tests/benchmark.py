@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the LcdScroll rendering paths
+
+Runs the rendering paths against the headless HD44780 emulator of Waxfruit_CharLCD with real time delays
+turned off, so the numbers measure the Python side and the bus traffic it generates rather than the
+display's timing.  Every case records the wall time, the bus operations per frame and the memory
+allocated, results are written as JSON and can be compared against an earlier run::
+
+    python -m LcdScroll.tests.benchmark --output baseline.json
+    python -m LcdScroll.tests.benchmark --compare baseline.json
+
+The second command exits with status 1 when any case got slower, heavier on the bus or hungrier for
+memory than the baseline allows.
+
+    :program: LcdScroll
+    :file: benchmark
+    :platform: Cross-Platform
+    :synopsis: Benchmark matrix and regression check for LcdScroll.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from itertools import cycle, islice
+import Waxfruit_CharLCD
+from LcdScroll.bus import LcdScrollBus
+from LcdScroll.lcdscroll import LcdScroller, LCDSCROLL_DOWN, LCDSCROLL_UP
+
+FORMAT_VERSION = 1
+"""int: Version of the JSON result format."""
+
+GEOMETRIES = ((16, 2), (20, 4), (40, 2))
+"""tuple: (columns, lines) of the displays benchmarked."""
+MESSAGE_SIZES = (('short', 12), ('medium', 80), ('long', 400))
+"""tuple: (name, characters) of the messages benchmarked."""
+DIRECTIONS = (('down', LCDSCROLL_DOWN), ('up', LCDSCROLL_UP))
+"""tuple: (name, direction) of the scroll directions benchmarked."""
+
+WRITE8_COUNT = 1000
+"""int: Bytes written by the write8 case."""
+
+TOLERANCE = 0.25
+"""float: Fraction wall time and memory may grow by before it counts as a regression."""
+NOISE_S = 0.0001
+"""float: Wall time growth in seconds always put down to noise, keeps the shortest cases from flapping."""
+MIN_TIME_S = 0.05
+"""float: Timed runs of a case continue until they add up to at least this many seconds."""
+
+_WORDS = ('the', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog', 'scrolling', 'display', 'a', 'HD44780')
+
+
+class HeadlessDisplay(LcdScrollBus, Waxfruit_CharLCD.Adafruit_CharLCDPlate, LcdScroller):
+    r"""
+    LcdScroller on the emulated plate, built like :class:`LcdScroll.LcdScroll_CharLCDPlate`.
+
+    Uses Waxfruit_CharLCD on every platform and never waits on the clock.
+
+    Args:
+        cols (:obj:`int`): Number of columns on display (default 16)
+        lines (:obj:`int`): Number of Lines on display (default 2)
+        direction (:obj:`int`): Direction of Scroll (default LCDSCROLL_DOWN)
+
+    """
+    rw_pin = Waxfruit_CharLCD.LCD_PLATE_RW
+
+    def __init__(self, cols: int = 16, lines: int = 2, direction: int = LCDSCROLL_DOWN):
+        LcdScroller.__init__(self, cols=cols, lines=lines, direction=direction)
+        super().__init__(cols=cols, lines=lines, realtime=False)
+
+
+def message(size: int) -> str:
+    r"""
+    Deterministic text of about the given length.
+
+    Args:
+        size (:obj:`int`): Number of characters
+
+    Returns:
+        :obj:`str`: Words separated by single spaces, cut to size
+
+    """
+    text = ' '.join(islice(cycle(_WORDS), size))
+    return text[:size].rstrip()
+
+
+def measure(name: str, params: dict, setup, repeat: int = 5) -> dict:
+    r"""
+    Benchmark one case.
+
+    ``setup`` is called before every run and returns ``(run, emulator)``, run takes no arguments and returns
+    the number of frames it drew.  The wall time is the best of at least repeat runs, more are made until
+    they add up to MIN_TIME_S.  Bus operations and memory are measured on separate runs so tracing does not
+    distort the timing.
+
+    Args:
+        name (:obj:`str`): Unique name of the case
+        params (:obj:`dict`): Parameters of the case, stored with the result
+        setup: Callable preparing one run
+        repeat (:obj:`int`, optional): Number of timed runs (default 5)
+
+    Returns:
+        :obj:`dict`: The result
+
+    """
+    best = None
+    runs = 0
+    total = 0.0
+    while runs < repeat or total < MIN_TIME_S:
+        run, _emulator = setup()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        runs += 1
+        total += elapsed
+        if best is None or elapsed < best:
+            best = elapsed
+
+    run, emulator = setup()
+    emulator.reset_counters()
+    frames = run()
+    counters = emulator.stats()
+    bus_ops = counters['instructions'] + counters['data_writes']
+
+    run, _emulator = setup()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        run()
+        _current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+
+    return {'name': name,
+            'params': params,
+            'wall_s': best,
+            'frames': frames,
+            'bus_ops': bus_ops,
+            'bus_ops_per_frame': bus_ops / frames if frames else 0.0,
+            'modeled_us': counters['modeled_us'],
+            'alloc_peak_bytes': peak,
+            'alloc_blocks': blocks}
+
+
+def _send_message_case(columns: int, lines: int, direction: int, text: str):
+    def setup():
+        display = HeadlessDisplay(cols=columns, lines=lines, direction=direction)
+        display.message_text = text
+
+        def run():
+            frames = 0
+            with display.batched_delays():
+                for _ in display._iter_send():  # pylint: disable=W0212
+                    frames += 1
+            return frames
+        return run, display.emulator
+    return setup
+
+
+def _scroll_case(columns: int, lines: int, direction: int):
+    def setup():
+        display = HeadlessDisplay(cols=columns, lines=lines, direction=direction)
+        for line in range(lines):
+            display._screen.put(line, 0, message(columns).encode('latin-1'))  # pylint: disable=W0212
+        display._render()  # pylint: disable=W0212
+
+        def run():
+            for row in range(lines):
+                display._place(message(columns - row), 0)  # pylint: disable=W0212
+                display._scroll()  # pylint: disable=W0212
+            return lines
+        return run, display.emulator
+    return setup
+
+
+def _send_character_case(columns: int, lines: int):
+    def setup():
+        display = HeadlessDisplay(cols=columns, lines=lines)
+        text = message(columns * lines)
+
+        def run():
+            for index, char in enumerate(text):
+                display.send_character(char, (index % columns, index // columns))
+            return len(text)
+        return run, display.emulator
+    return setup
+
+
+def _message_case(columns: int, lines: int, text: str):
+    def setup():
+        lcd = Waxfruit_CharLCD.Adafruit_CharLCDPlate(cols=columns, lines=lines, realtime=False)
+        rows = '\n'.join(text[start:start + columns] for start in range(0, columns * lines, columns))
+
+        def run():
+            lcd.message(rows)
+            return 1
+        return run, lcd.emulator
+    return setup
+
+
+def _write8_case(columns: int, lines: int):
+    def setup():
+        lcd = Waxfruit_CharLCD.Adafruit_CharLCDPlate(cols=columns, lines=lines, realtime=False)
+
+        def run():
+            for value in range(WRITE8_COUNT):
+                lcd.write8(0x20 + value % 0x60, True)
+            return WRITE8_COUNT
+        return run, lcd.emulator
+    return setup
+
+
+def cases(geometries=GEOMETRIES, sizes=MESSAGE_SIZES, directions=DIRECTIONS):
+    r"""
+    The benchmark matrix.
+
+    Args:
+        geometries (:obj:`tuple`, optional): (columns, lines) of the displays (default GEOMETRIES)
+        sizes (:obj:`tuple`, optional): (name, characters) of the messages (default MESSAGE_SIZES)
+        directions (:obj:`tuple`, optional): (name, direction) scroll directions (default DIRECTIONS)
+
+    Yields:
+        ``(name, params, setup)`` for :func:`measure`
+
+    """
+    for columns, lines in geometries:
+        geometry = '%dx%d' % (columns, lines)
+        for size_name, size in sizes:
+            text = message(size)
+            for direction_name, direction in directions:
+                yield ('send_message/%s/%s/%s' % (geometry, size_name, direction_name),
+                       {'geometry': geometry, 'size': size, 'direction': direction_name},
+                       _send_message_case(columns, lines, direction, text))
+            yield ('message/%s/%s' % (geometry, size_name),
+                   {'geometry': geometry, 'size': size},
+                   _message_case(columns, lines, text))
+        for direction_name, direction in directions:
+            yield ('scroll/%s/%s' % (geometry, direction_name),
+                   {'geometry': geometry, 'direction': direction_name},
+                   _scroll_case(columns, lines, direction))
+        yield ('send_character/%s' % geometry, {'geometry': geometry}, _send_character_case(columns, lines))
+        yield ('write8/%s' % geometry, {'geometry': geometry, 'count': WRITE8_COUNT}, _write8_case(columns, lines))
+
+
+def run_benchmarks(repeat: int = 5, **matrix) -> dict:
+    r"""
+    Run the benchmark matrix.
+
+    Args:
+        repeat (:obj:`int`, optional): Number of timed runs per case (default 5)
+        **matrix: Passed on to :func:`cases` to run part of the matrix
+
+    Returns:
+        :obj:`dict`: The JSON document, results are keyed by case name
+
+    """
+    results = {}
+    for name, params, setup in cases(**matrix):
+        results[name] = measure(name, params, setup, repeat)
+    return {'format': FORMAT_VERSION,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': results}
+
+
+def compare(baseline: dict, current: dict, tolerance: float = TOLERANCE) -> list:
+    r"""
+    Find the cases that got worse.
+
+    Bus operations are deterministic so any increase counts, wall time and peak memory may grow by
+    the tolerance, wall time by NOISE_S on top of that.  Cases only present in one of the runs are ignored.
+
+    Args:
+        baseline (:obj:`dict`): Earlier result of :func:`run_benchmarks`
+        current (:obj:`dict`): Result to check
+        tolerance (:obj:`float`, optional): Allowed growth as a fraction (default TOLERANCE)
+
+    Returns:
+        :obj:`list`: One message per regression, empty when there are none
+
+    """
+    regressions = []
+    for name, now in sorted(current['results'].items()):
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        if now['bus_ops'] > before['bus_ops']:
+            regressions.append('%s: bus operations %d -> %d' % (name, before['bus_ops'], now['bus_ops']))
+        if now['wall_s'] > before['wall_s'] * (1 + tolerance) + NOISE_S:
+            regressions.append('%s: wall time %.6fs -> %.6fs' % (name, before['wall_s'], now['wall_s']))
+        if now['alloc_peak_bytes'] > before['alloc_peak_bytes'] * (1 + tolerance):
+            regressions.append('%s: peak memory %d -> %d bytes'
+                               % (name, before['alloc_peak_bytes'], now['alloc_peak_bytes']))
+    return regressions
+
+
+def main(argv=None) -> int:
+    r"""
+    Command line entry point.
+
+    Args:
+        argv (:obj:`list`, optional): Arguments, sys.argv[1:] when None
+
+    Returns:
+        :obj:`int`: Exit status, 1 when a comparison found regressions
+
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the LcdScroll rendering paths.')
+    parser.add_argument('--output', '-o', help='write the results to this JSON file')
+    parser.add_argument('--compare', '-c', help='JSON file of an earlier run to check for regressions')
+    parser.add_argument('--tolerance', '-t', type=float, default=TOLERANCE,
+                        help='allowed growth of wall time and memory (default %(default)s)')
+    parser.add_argument('--repeat', '-r', type=int, default=5, help='timed runs per case (default %(default)s)')
+    args = parser.parse_args(argv)
+
+    result = run_benchmarks(repeat=args.repeat)
+    for name, case in sorted(result['results'].items()):
+        print('%-36s %10.6fs %6d frames %8.1f ops/frame %9d bytes'
+              % (name, case['wall_s'], case['frames'], case['bus_ops_per_frame'], case['alloc_peak_bytes']))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(result, output, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(baseline, result, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
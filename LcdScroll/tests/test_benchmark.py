@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the benchmark suite
+
+:program: LcdScroll
+:file: test_benchmark
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.tests.benchmark
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import copy
+import json
+from unittest import TestCase
+from LcdScroll.tests import benchmark
+
+
+class TestBenchmark(TestCase):
+    """
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+
+        """
+        cls.result = benchmark.run_benchmarks(repeat=1, geometries=((16, 2),), sizes=(('short', 12),))
+
+    def test_matrix(self):
+        r"""
+        Every rendering path is benchmarked
+
+        """
+        self.assertEqual(sorted(self.result['results']),
+                         ['message/16x2/short', 'scroll/16x2/down', 'scroll/16x2/up', 'send_character/16x2',
+                          'send_message/16x2/short/down', 'send_message/16x2/short/up', 'write8/16x2'])
+
+    def test_metrics(self):
+        r"""
+        Results carry wall time, bus operations per frame and allocations
+
+        """
+        case = self.result['results']['write8/16x2']
+        self.assertEqual(case['frames'], benchmark.WRITE8_COUNT)
+        self.assertEqual(case['bus_ops'], benchmark.WRITE8_COUNT)
+        self.assertEqual(case['bus_ops_per_frame'], 1.0)
+        self.assertGreater(case['wall_s'], 0)
+        self.assertGreaterEqual(case['alloc_peak_bytes'], 0)
+        case = self.result['results']['send_message/16x2/short/down']
+        self.assertGreater(case['frames'], 0)
+        self.assertEqual(case['bus_ops_per_frame'], case['bus_ops'] / case['frames'])
+
+    def test_json(self):
+        r"""
+        Results survive a trip through JSON
+
+        """
+        self.assertEqual(json.loads(json.dumps(self.result)), self.result)
+
+    def test_compare(self):
+        r"""
+        More bus operations always regress, wall time only past the tolerance
+
+        """
+        self.assertEqual(benchmark.compare(self.result, self.result), [])
+        current = copy.deepcopy(self.result)
+        case = current['results']['send_character/16x2']
+        case['bus_ops'] += 1
+        case['wall_s'] = case['wall_s'] * 1.1
+        regressions = benchmark.compare(self.result, current)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('bus operations', regressions[0])
+        case['wall_s'] = self.result['results']['send_character/16x2']['wall_s'] * 2 + 1
+        self.assertEqual(len(benchmark.compare(self.result, current)), 2)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the on-disk program cache
+
+:program: LcdScroll
+:file: test_cache
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.cache
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import os
+import tempfile
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate
+from LcdScroll.cache import ProgramCache
+
+
+class TestProgramCache(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ProgramCache(self.directory.name)
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+
+    def tearDown(self):
+        """
+
+        """
+        self.cache = None
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        r"""
+        A cached program comes back from the mapped file the same as it was compiled
+
+        """
+        compiled = self.display.compile_message('Splash screen', cache=self.cache)
+        self.assertEqual(self.cache.misses, 1)
+        cache = ProgramCache(self.directory.name)
+        cached = self.display.compile_message('Splash screen', cache=cache)
+        self.assertEqual(cache.hits, 1)
+        self.assertIsInstance(cached.code, memoryview)
+        self.assertEqual(cached, compiled)
+        self.assertEqual(os.listdir(self.directory.name), [os.path.basename(cache.path(compiled.key))])
+
+    def test_keyed_on_message_and_configuration(self):
+        r"""
+        Other messages, geometries or special characters do not find each other's programs
+
+        """
+        display = self.display
+        display.compile_message('Idle', cache=self.cache)
+        display.compile_message('Error', cache=self.cache)
+        self.assertEqual(self.cache.misses, 2)
+        display.special_characters = {' ': None, '*': '\x2a'}
+        display.compile_message('Idle', cache=self.cache)
+        other = LcdScroll_CharLCDPlate(cols=20, lines=4, realtime=False)
+        other.compile_message('Idle', cache=self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 4))
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+        display.special_characters = {' ': None}
+        self.assertIsNotNone(self.cache.get(display.program_key(), 'Error'))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(display.program_key(), 'Idle'))
+
+    def test_first_frame(self):
+        r"""
+        Replaying the first frame of a cached program shows its first word and leaves the shadow unknown
+
+        """
+        self.display.compile_message('Starting up please wait', cache=self.cache)
+        program = ProgramCache(self.directory.name).get(self.display.program_key(), 'Starting up please wait')
+        self.display.send_program(program, frames=1)
+        self.assertEqual(self.display.display_text()[0].rstrip(), 'Starting')
+        self.assertFalse(self.display._shadow.valid)
+        self.display.send_program(program)
+        self.assertEqual([row.rstrip() for row in self.display.display_text()], ['please wait', 'Starting up'])
+        self.assertTrue(self.display._shadow.valid)
+
+    def test_damaged_file(self):
+        r"""
+        A damaged file is ignored and replaced
+
+        """
+        key = self.display.program_key()
+        os.makedirs(self.directory.name, exist_ok=True)
+        with open(self.cache.path(key), 'wb') as damaged:
+            damaged.write(b'LCDP\x01garbage')
+        self.assertIsNone(self.cache.get(key, 'Idle'))
+        self.display.compile_message('Idle', cache=self.cache)
+        self.assertIsNotNone(ProgramCache(self.directory.name).get(key, 'Idle'))
+
+    def test_mappings_released(self):
+        r"""
+        Updating or clearing the cache unmaps the files instead of replacing or deleting them under a mapping
+
+        """
+        key = self.display.program_key()
+        self.display.compile_message('Idle', cache=self.cache)
+        held = self.cache.get(key, 'Idle')
+        mapping = self.cache._files[key][1]
+        self.display.compile_message('Error', cache=self.cache)
+        self.assertFalse(mapping.closed)
+        self.assertEqual(bytes(held.code), bytes(self.display.compile_message('Idle').code))
+        self.assertEqual(os.listdir(self.directory.name), [os.path.basename(self.cache.path(key))])
+        self.assertIsNotNone(self.cache.get(key, 'Error'))
+        mapping = self.cache._files[key][1]
+        self.display.compile_message('Busy', cache=self.cache)
+        self.assertTrue(mapping.closed)
+        self.assertIsNotNone(self.cache.get(key, 'Idle'))
+        mapping = self.cache._files[key][1]
+        self.cache.clear()
+        self.assertTrue(mapping.closed)
+        self.assertEqual(os.listdir(self.directory.name), [])
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the character encoder
+
+:program: LcdScroll
+:file: test_encoding
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.encoding
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate, LcdScrollEx
+from LcdScroll.encoding import CharacterEncoder
+
+
+class TestCharacterEncoder(TestCase):
+    """
+    """
+    def test_latin1(self):
+        r"""
+        Without a ROM characters keep their latin-1 code, anything else becomes '?'
+
+        """
+        self.assertEqual(CharacterEncoder().encode('café €5'), b'caf\xe9 ?5')
+
+    def test_a00(self):
+        r"""
+        The Japanese ROM moves the symbols it has and replaces the ones it has not
+
+        """
+        encoder = CharacterEncoder(rom='A00')
+        self.assertEqual(encoder.encode('21°C ¥ → ｱ'), b'21\xdfC \x5c \x7e \xb1')
+        self.assertEqual(encoder.encode('\\~é'), b'???')
+
+    def test_a02(self):
+        r"""
+        The European ROM follows latin-1 for its accented letters
+
+        """
+        self.assertEqual(CharacterEncoder(rom='A02').encode('Grüße ~'), 'Grüße ~'.encode('latin-1'))
+
+    def test_special(self):
+        r"""
+        Special characters are replaced by their codes, None leaves a character alone
+
+        """
+        encoder = CharacterEncoder({' ': None, '♥': '\x01', '×': 'x'}, rom='A00')
+        self.assertEqual(encoder.encode('2×♥ '), b'2x\x01 ')
+
+    def test_compiled_once(self):
+        r"""
+        The table is only rebuilt when the mapping changes
+
+        """
+        encoder = CharacterEncoder()
+        for _ in range(10):
+            encoder.encode('some text')
+        self.assertEqual(encoder.compiles, 1)
+        encoder.rom = 'A00'
+        encoder.special = {'x': 'y'}
+        self.assertEqual(encoder.compiles, 3)
+        with self.assertRaises(ValueError):
+            encoder.rom = 'A01'
+
+
+class TestLcdScrollEncoding(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+
+    def test_character_rom(self):
+        r"""
+        Messages are sent with the codes of the display's character ROM
+
+        """
+        display = self.display
+        display.character_rom = 'A00'
+        display.message_text = '21°C'
+        display.send_message()
+        self.assertEqual(display.emulator.rows(16, (0x00,))[0][:4], b'21\xdfC')
+        with self.assertRaises(LcdScrollEx):
+            display.character_rom = 'A01'
+
+    def test_special_characters(self):
+        r"""
+        Replacing special_characters recompiles the table
+
+        """
+        display = self.display
+        compiles = display._encoder.compiles
+        display.special_characters = {' ': None, '♥': '\x02'}
+        self.assertEqual(display._encoder.compiles, compiles + 1)
+        display.send_character('♥', (0, 0))
+        self.assertEqual(display.emulator.rows(16, (0x00,))[0][:1], b'\x02')
+        self.assertEqual(display._encoder.compiles, compiles + 1)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the custom glyph allocator
+
+:program: LcdScroll
+:file: test_glyphs
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.glyphs
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate, LcdScrollEx
+from LcdScroll.glyphs import GlyphAllocator
+
+SYMBOLS = 'αβγδεζηθικλ'
+
+
+def pattern(index):
+    r"""
+    A distinct 8 row pattern for each index
+
+    """
+    return [index] * 4 + [0x1f - index] * 4
+
+
+class TestGlyphAllocator(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.uploads = []
+        self.glyphs = GlyphAllocator(lambda slot, rows: self.uploads.append((slot, rows)))
+        for index, char in enumerate(SYMBOLS):
+            self.glyphs.register(char, pattern(index))
+
+    def test_no_reupload(self):
+        r"""
+        A resident glyph is not uploaded again
+
+        """
+        self.assertTrue(self.glyphs.allocate('αβ'))
+        self.assertTrue(self.glyphs.allocate('βα'))
+        self.assertEqual(self.uploads, [(0, pattern(0)), (1, pattern(1))])
+        self.assertEqual('αβx'.translate(self.glyphs.table), '\x00\x01x')
+
+    def test_lru_eviction(self):
+        r"""
+        The least recently used glyph makes room, glyphs on screen are kept while possible
+
+        """
+        self.glyphs.allocate(SYMBOLS[:8])
+        self.glyphs.allocate('α')
+        # β is the least recently used but it is on screen in slot 1, γ goes instead
+        self.glyphs.allocate('ι', visible={1})
+        self.assertIsNone(self.glyphs.slot('γ'))
+        self.assertEqual(self.glyphs.slot('ι'), 2)
+        self.glyphs.allocate('κ')
+        self.assertIsNone(self.glyphs.slot('β'))
+        self.assertEqual(self.glyphs.evictions, 2)
+        self.assertEqual(len(self.uploads), 10)
+
+    def test_visible_kept(self):
+        r"""
+        A glyph is refused rather than taking a slot that is on screen
+
+        """
+        self.glyphs.allocate(SYMBOLS[:8])
+        self.assertTrue(self.glyphs.allocate('ι', visible=set(range(8))))
+        self.assertIsNone(self.glyphs.slot('ι'))
+        self.assertEqual((self.glyphs.evictions, self.glyphs.refused), (0, 1))
+        self.assertEqual(len(self.uploads), 8)
+
+    def test_too_many(self):
+        r"""
+        More glyphs than slots at once are refused without changing anything
+
+        """
+        self.assertFalse(self.glyphs.allocate(SYMBOLS[:9]))
+        self.assertEqual(self.uploads, [])
+
+    def test_register_resident(self):
+        r"""
+        Changing the pattern of a resident glyph uploads it in place
+
+        """
+        self.glyphs.allocate('α')
+        self.glyphs.register('α', pattern(5))
+        self.glyphs.register('α', pattern(5))
+        self.assertEqual(self.uploads, [(0, pattern(0)), (0, pattern(5))])
+        self.glyphs.unregister('α')
+        self.assertEqual(self.glyphs.resident(), {})
+        self.assertEqual(self.glyphs.table, {})
+
+
+class TestLcdScrollGlyphs(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        for index, char in enumerate(SYMBOLS):
+            self.display.register_glyph(char, pattern(index))
+
+    def test_more_than_eight(self):
+        r"""
+        A message using more than 8 glyphs in total, at most 8 at a time, is shown with the right patterns
+
+        """
+        display = self.display
+        display.message_text = '\n'.join(SYMBOLS[start:start + 4] for start in range(0, len(SYMBOLS), 4))
+        display.send_message()
+        emulator = display.emulator
+        for char, slot in display.resident_glyphs().items():
+            self.assertEqual(list(emulator.glyph(slot)), pattern(SYMBOLS.index(char)))
+        self.assertGreater(display._glyphs.evictions, 0)
+        shown = display.display_text()
+        for row in shown:
+            for code in row:
+                if ord(code) < 8:
+                    self.assertIn(code, [chr(slot) for slot in display.resident_glyphs().values()])
+        self.assertEqual(shown, [bytes(row).decode('latin-1') for row in display._shadow.rows])
+
+    def test_shown_glyphs_unchanged(self):
+        r"""
+        A ninth glyph sent while eight are shown does not change the ones on the display
+
+        """
+        display = self.display
+        display.message_text = SYMBOLS[:8]
+        display.send_message()
+        display.send_character(SYMBOLS[8], (8, 0))
+        shown = display.display_text()[0]
+        self.assertEqual(shown[:8], ''.join(chr(slot) for slot in range(8)))
+        self.assertNotIn(SYMBOLS[8], display.resident_glyphs())
+        self.assertNotIn(shown[8], ''.join(chr(slot) for slot in range(8)))
+        for slot in range(8):
+            self.assertEqual(list(display.emulator.glyph(slot)), pattern(slot))
+
+    def test_resend_no_upload(self):
+        r"""
+        Showing the same glyphs again does not touch CGRAM
+
+        """
+        display = self.display
+        display.stats_enabled = True
+        display.message_text = 'αβγ'
+        display.send_message()
+        self.assertEqual(display.stats()['glyph_uploads'], 3)
+        display.send_message()
+        self.assertEqual(display.stats()['glyph_uploads'], 3)
+
+    def test_send_character(self):
+        r"""
+        send_character() loads the glyph and keeps writing to display memory
+
+        """
+        display = self.display
+        display.send_character('x', (0, 0))
+        display.send_character('α')
+        display.send_character('y')
+        self.assertEqual(display.display_text()[0][:3], 'x\x00y')
+
+    def test_too_many_on_screen(self):
+        r"""
+        A frame needing more than 8 glyphs raises
+
+        """
+        display = self.display
+        display.message_text = SYMBOLS[:9]
+        with self.assertRaises(LcdScrollEx):
+            display.send_message()
+
+    def test_bad_pattern(self):
+        r"""
+        Glyphs need one character and 8 rows
+
+        """
+        with self.assertRaises(LcdScrollEx):
+            self.display.register_glyph('ab', pattern(0))
+        with self.assertRaises(LcdScrollEx):
+            self.display.register_glyph('a', [0] * 7)
+
+    def test_upload_keeps_address(self):
+        r"""
+        An upload puts the address counter back where it was, also in display memory no line shows
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=16, lines=1, realtime=False)
+        display.register_glyph(SYMBOLS[0], pattern(0))
+        display.message_text = 'x'
+        display.send_message()
+        shadow = display._shadow
+        display.set_cursor(0, 0)
+        # raw writes bypass the shadow, record them as the renderer would
+        display.send_bytes(b'y' * 45)
+        shadow.move(0, 0)
+        shadow.write(b'y' * 45)
+        self.assertEqual(shadow.address, 0x45)
+        display.send_character(SYMBOLS[0])
+        self.assertEqual(display.emulator.address_counter, 0x46)
+        self.assertEqual(shadow.address, 0x46)
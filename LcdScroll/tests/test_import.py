@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the import cost and the backend registry
+
+:program: LcdScroll
+:file: test_import
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.backend and the time it takes to import LcdScroll
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+import LcdScroll
+from LcdScroll import backend, LcdScroll_CharLCDPlate
+from LcdScroll.tests import TEST_BACKEND
+
+IMPORT_BUDGET_S = 0.5
+"""float: Longest a fresh interpreter may take to import LcdScroll, generous for slow boards and CI."""
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import LcdScroll
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))
+'''
+
+
+class TestImport(TestCase):
+    """
+    """
+    def probe(self, **environment):
+        r"""
+        Import LcdScroll in a fresh interpreter
+
+        """
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, **environment)
+        env['PYTHONPATH'] = os.pathsep.join([root] + [path for path in (env.get('PYTHONPATH'),) if path])
+        output = subprocess.run([sys.executable, '-c', _PROBE], env=env, check=True, stdout=subprocess.PIPE)
+        return json.loads(output.stdout.decode())
+
+    def test_no_backend_on_import(self):
+        r"""
+        Importing LcdScroll loads no backend and no asyncio, and stays within its time budget
+
+        """
+        result = self.probe(LCDSCROLL_BACKEND='adafruit')
+        for module in ('Adafruit_CharLCD', 'Waxfruit_CharLCD', 'Adafruit_GPIO', 'asyncio'):
+            self.assertNotIn(module, result['modules'])
+        self.assertLess(result['seconds'], IMPORT_BUDGET_S)
+
+
+class TestBackendRegistry(TestCase):
+    """
+    """
+    def tearDown(self):
+        """
+
+        """
+        backend.use_backend(TEST_BACKEND)
+
+    def test_use_backend(self):
+        r"""
+        The chosen backend wins over the environment and unknown names are refused
+
+        """
+        backend.use_backend('emulator')
+        self.assertEqual(backend.backend_name(), 'emulator')
+        display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        self.assertIsInstance(display, LcdScroll_CharLCDPlate)
+        self.assertIs(backend.load_backend(), sys.modules['Waxfruit_CharLCD'])
+        self.assertTrue(hasattr(display, 'emulator'))
+        self.assertIsNotNone(display.rw_pin)
+        with self.assertRaises(ValueError):
+            LcdScroll.use_backend('nonexistent')
+
+    def test_environment(self):
+        r"""
+        LCDSCROLL_BACKEND picks the backend when none was chosen
+
+        """
+        backend.use_backend(None)
+        previous = os.environ.get(backend.ENVIRONMENT_VARIABLE)
+        os.environ[backend.ENVIRONMENT_VARIABLE] = 'headless'
+        try:
+            self.assertEqual(backend.backend_name(), 'headless')
+            backend.register_backend('headless', 'Waxfruit_CharLCD')
+            display = LcdScroll_CharLCDPlate(cols=20, lines=4, realtime=False)
+            self.assertEqual(display.display_size, (20, 4))
+        finally:
+            backend.BACKENDS.pop('headless', None)
+            if previous is None:
+                del os.environ[backend.ENVIRONMENT_VARIABLE]
+            else:
+                os.environ[backend.ENVIRONMENT_VARIABLE] = previous
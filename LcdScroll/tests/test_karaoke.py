@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bouncing ball cursor
+
+:program: LcdScroll
+:file: test_karaoke
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.karaoke and the bouncing ball cursor
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate, LcdScrollEx, LCDSCROLL_UP
+from LcdScroll.karaoke import character_times, CHARACTER_TIME
+
+
+class FakeClock:
+    """
+    Clock that only moves when something sleeps.
+    """
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        """
+
+        """
+        self.now += seconds
+
+
+class TestCharacterTimes(TestCase):
+    """
+    """
+    def test_word_cues(self):
+        r"""
+        A bare time cues the next whole word, its characters share the time up to the next cue
+
+        """
+        self.assertEqual(character_times('one  two\nsix', [0.0, 1.5, 3.0], end=4.5),
+                         [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0])
+
+    def test_syllable_cues(self):
+        r"""
+        Syllables are cued one after the other, the last cue lasts CHARACTER_TIME per character
+
+        """
+        times = character_times('Twinkle star', [(0.0, 'Twin'), (2.0, 'kle'), 3.5])
+        self.assertEqual(times[:8], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5])
+        self.assertEqual(times[-1], 3.5 + 3 * CHARACTER_TIME)
+
+    def test_bad_cues(self):
+        r"""
+        Cues that do not follow the message are refused
+
+        """
+        with self.assertRaises(ValueError):
+            character_times('Twinkle star', [(0.0, 'Twin'), 1.0])
+        with self.assertRaises(ValueError):
+            character_times('Twinkle star', [(0.0, 'Twinkle'), (1.0, 'stat')])
+        with self.assertRaises(ValueError):
+            character_times('Twinkle star', [2.0, 1.0])
+        with self.assertRaises(ValueError):
+            character_times('Twinkle star', [0.0])
+
+
+class TestLcdScrollBall(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+
+    def test_words_written_once(self):
+        r"""
+        Every word is written once, the ball only moves the cursor
+
+        """
+        display = self.display
+        display.display_cursor = True
+        display.message_text = 'one two'
+        display.stats_enabled = True
+        display.send_message()
+        stats = display.stats()
+        self.assertEqual(stats['data_bytes'], 6)
+        # one move per character, plus writing 'two' away from the ball and coming back
+        self.assertEqual(stats['cursor_moves'], 6 + 2)
+        self.assertTrue(display.emulator.cursor_on)
+        self.assertEqual(display.emulator.address_counter, 0x06)
+
+    def test_ball_scrolls_with_text(self):
+        r"""
+        The ball stays on its character when the text scrolls away under it
+
+        """
+        display = self.display
+        display.direction = LCDSCROLL_UP
+        display.display_cursor = True
+        display.message_text = 'ab\ncd'
+        steps = []
+        for _ in display._iter_message():
+            display._render()
+            steps.append(display._cursor_position)
+        self.assertEqual(steps, [None, (0, 1), (1, 1), (1, 0), (1, 0), (0, 1), (1, 1)])
+
+    def test_synced(self):
+        r"""
+        The ball lands on every character at its timestamp, words are written ahead of it
+
+        """
+        display = self.display
+        display.message_text = 'la di'
+        clock = FakeClock()
+        moves = []
+        set_cursor = display.set_cursor
+
+        def record(column, row):
+            moves.append((round(clock.now - 100.0, 6), column, row))
+            set_cursor(column, row)
+
+        display.set_cursor = record
+        display.send_message_synced([0.0, 1.0], end=1.5, clock=clock, sleep=clock.sleep)
+        # 'di' goes out at column 3 as soon as 'la' is done, then the cursor goes back to 'a'
+        self.assertEqual(moves, [(0.0, 0, 0), (0.5, 1, 0), (0.5, 3, 0), (0.5, 1, 0), (1.0, 3, 0), (1.25, 4, 0)])
+        self.assertEqual(display.display_text()[0].rstrip(), 'la di')
+        with self.assertRaises(LcdScrollEx):
+            display.send_message_synced([0.0])
+
+    def test_trigger_cursor(self):
+        r"""
+        Triggering moves the ball one character on with a single command, wrapping at the end of the line
+
+        """
+        display = self.display
+        display.trigger_cursor((15, 1))
+        display.emulator.reset_counters()
+        display.trigger_cursor()
+        self.assertEqual(display._cursor_position, (0, 1))
+        self.assertEqual(display.emulator.stats()['instructions'], 1)
+        with self.assertRaises(LcdScrollEx):
+            display.trigger_cursor((3, None))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the word wrapping layout engine
+
+:program: LcdScroll
+:file: test_layout
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.layout
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll.layout import CacheInfo, LayoutCache, LayoutEngine, layout_text
+
+
+class TestLayout(TestCase):
+    """
+    """
+    def test_wrap(self):
+        r"""
+        Words that do not fit move to the next line
+
+        """
+        self.assertEqual(layout_text('Hello big world', 10), [(0, 0, 'Hello'), (0, 6, 'big'), (1, 0, 'world')])
+
+    def test_tabs_and_newlines(self):
+        r"""
+        Tabs move to the next tab stop, newlines start a new line
+
+        """
+        self.assertEqual(layout_text('ab\tc\n\nd', 10), [(0, 0, 'ab'), (0, 4, 'c'), (2, 0, 'd')])
+
+    def test_long_word(self):
+        r"""
+        Words longer than a line are broken over several lines
+
+        """
+        self.assertEqual(layout_text('x abcdefghijklmnopqrstuvwxy z', 10),
+                         [(0, 0, 'x'), (1, 0, 'abcdefghij'), (2, 0, 'klmnopqrst'), (3, 0, 'uvwxy'), (3, 6, 'z')])
+
+    def test_continues_between_calls(self):
+        r"""
+        The engine picks up where the previous call stopped
+
+        """
+        engine = LayoutEngine(10)
+        self.assertEqual(engine.layout('one two '), [(0, 0, 'one'), (0, 4, 'two')])
+        self.assertEqual(engine.layout('three'), [(1, 0, 'three')])
+        engine.reset()
+        self.assertEqual(engine.layout('four'), [(0, 0, 'four')])
+
+    def test_linear(self):
+        r"""
+        Large messages lay out without quadratic copying
+
+        """
+        placements = layout_text('word ' * 100000, 20)
+        self.assertEqual(len(placements), 100000)
+        self.assertEqual(placements[-1], (24999, 15, 'word'))
+
+
+class TestLayoutCache(TestCase):
+    """
+    """
+    def test_lru(self):
+        r"""
+        The least recently used layout is dropped first
+
+        """
+        cache = LayoutCache(2)
+        cache.get('a', lambda: [1])
+        cache.get('b', lambda: [2])
+        self.assertEqual(cache.get('a', lambda: [3]), (1,))
+        cache.get('c', lambda: [4])
+        self.assertEqual(cache.get('b', lambda: [5]), (5,))
+        self.assertEqual(cache.info(), CacheInfo(hits=1, misses=4, maxsize=2, currsize=2))
+
+    def test_purge(self):
+        r"""
+        Purging keeps only the matching keys
+
+        """
+        cache = LayoutCache()
+        cache.get(('a', 16), lambda: [1])
+        cache.get(('a', 20), lambda: [2])
+        cache.purge(lambda key: key[1] == 20)
+        self.assertEqual(cache.info().currsize, 1)
+        self.assertEqual(cache.get(('a', 20), lambda: [3]), (2,))
@@ -13,8 +13,11 @@ Comments go here!!!
 from unittest import TestCase
 from LcdScroll import LcdScroll_CharLCDPlate
 from unittest import skip
+from unittest import mock
 from LcdScroll import LcdScrollEx
-from LcdScroll import LCDSCROLL_UP, LCDSCROLL_DOWN
+from LcdScroll import LCDSCROLL_UP, LCDSCROLL_DOWN, LCDSCROLL_LEFT
+import asyncio
+import io
 import pytest
 import time
 
@@ -216,3 +219,295 @@ class TestLcdScroll(TestCase):
         self.fill_display()
         self.display.direction = LCDSCROLL_DOWN
         self.display._scroll()
+
+    def test_scroll_renders_only_changes(self):
+        r"""
+        Scrolling after the first render only rewrites cells that changed
+
+        """
+        self.display.direction = LCDSCROLL_UP
+        self.display._send_message_without_cursor('abc ')
+        with mock.patch.object(self.display, 'clear') as clear, \
+                mock.patch.object(self.display, 'send_bytes') as send_bytes:
+            self.display._scroll()
+            self.display._send_message_without_cursor('abd ')
+        clear.assert_not_called()
+        self.assertEqual(self.display._shadow.rows[2][:4], b'abc ')
+        self.assertEqual(self.display._shadow.rows[3][:4], b'abd ')
+        # scroll moves 'abc ' up and blanks it below, then only 'd' differs on the bottom row
+        self.assertEqual([c[0][0] for c in send_bytes.call_args_list], [b'abc', b'   ', b'abd'])
+
+    def test_send_message_does_not_clear(self):
+        r"""
+        Only the first render of a fresh display clears it
+
+        """
+        self.display.message_text = 'Short words that wrap across a few lines of the display'
+        with mock.patch.object(self.display, 'clear') as clear:
+            self.display.send_message()
+            self.display.send_message()
+        self.assertEqual(clear.call_count, 1)
+        self.assertEqual(bytes(self.display._shadow.rows[0]).rstrip(), b'lines of the display')
+
+    def test_send_message_matches_display(self):
+        r"""
+        The shadow agrees with what the emulated controller shows
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=20, lines=4, realtime=False)
+        display.direction = LCDSCROLL_UP
+        display.message_text = ('A longer message that has to scroll on a four line display a few times '
+                                'before the end of it is reached')
+        display.send_message()
+        self.assertEqual(display.display_text(), [bytes(row).decode('latin-1') for row in display._shadow.rows])
+        self.assertEqual(display.display_text()[3].rstrip(), 'is reached')
+
+    def test_empty_message_blanks(self):
+        r"""
+        A message without words blanks the display instead of leaving the last message up
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=20, lines=4, realtime=False)
+        for text in ('', '\n', '   '):
+            display.message_text = 'Something to blank'
+            display.send_message()
+            display.message_text = text
+            display.send_message()
+            self.assertEqual(display.display_text(), [' ' * 20] * 4)
+
+    def test_layout_cache(self):
+        r"""
+        Repeated messages reuse their layout until the geometry changes
+
+        """
+        self.display.message_text = 'The same status line'
+        self.display.send_message()
+        self.display.send_message()
+        self.assertEqual(self.display.layout_cache_info()[:2], (1, 1))
+        self.display.columns = 16
+        self.assertEqual(self.display.layout_cache_info().currsize, 0)
+        self.display.layout_cache_size = 0
+        self.display.send_message()
+        self.assertEqual(self.display.layout_cache_info().currsize, 0)
+        with pytest.raises(LcdScrollEx):
+            self.display.layout_cache_size = -1
+
+
+class TestLcdScrollMarquee(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2)
+
+    def test_short_marquee_one_command_per_step(self):
+        r"""
+        Text that fits in the line buffer is loaded once and then only shifted
+
+        """
+        with mock.patch.object(self.display, 'move_left') as move_left, \
+                mock.patch.object(self.display, 'set_cursor') as set_cursor:
+            self.display.send_marquee('Hello', row=1)
+        self.assertEqual(move_left.call_count, 40)
+        set_cursor.assert_called_once_with(0, 1)
+
+    def test_long_marquee_refills_off_screen(self):
+        r"""
+        Text longer than the line buffer is fed into the cell that left the screen
+
+        """
+        text = ''.join(chr(ord('a') + n % 26) for n in range(60))
+        with mock.patch.object(self.display, 'move_left') as move_left, \
+                mock.patch.object(self.display, 'send_bytes') as send_bytes:
+            self.display.send_marquee(text, steps=3)
+        self.assertEqual(move_left.call_count, 3)
+        data = text.encode('latin-1')
+        self.assertEqual([c[0][0] for c in send_bytes.call_args_list], [data[:40], data[40:41], data[41:42], data[42:43]])
+
+    def test_marquee_direction(self):
+        r"""
+        LCDSCROLL_LEFT sends the message as a marquee
+
+        """
+        self.display.direction = LCDSCROLL_LEFT
+        self.display.message_text = 'Marquee'
+        with mock.patch.object(self.display, '_iter_marquee', return_value=iter(())) as iter_marquee:
+            self.display.send_message()
+        iter_marquee.assert_called_once_with('Marquee')
+
+    def test_marquee_four_lines(self):
+        r"""
+        Four line displays split each memory line over two rows and are refused
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=20, lines=4)
+        with pytest.raises(LcdScrollEx):
+            display.send_marquee('Hello')
+
+
+class TestLcdScrollBusyFlag(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=True)
+        self.display.busy_flag = True
+
+    def test_busy_flag_skips_fixed_delay(self):
+        r"""
+        Writes wait for the emulated instruction time instead of a millisecond each
+
+        """
+        with mock.patch.object(self.display.sleeper, 'delay_us') as delay_us:
+            start = time.perf_counter()
+            self.display.message('abcdefghij' * 3)
+            elapsed = time.perf_counter() - start
+        delay_us.assert_not_called()
+        # the fixed delay alone would take 30 ms
+        self.assertLess(elapsed, 0.02)
+
+    def test_busy_flag_timeout(self):
+        r"""
+        A controller that stays busy falls back to the fixed delay
+
+        """
+        self.display.busy_timeout_us = 100
+        with mock.patch.object(self.display, 'read_busy_flag', return_value=True), \
+                mock.patch.object(self.display.sleeper, 'delay_us') as delay_us:
+            self.display.write8(0x41, True)
+        delay_us.assert_called_once_with(1000)
+        self.assertEqual(self.display.busy_timeouts, 1)
+
+
+class TestLcdScrollAsync(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2)
+        self.display.message_text = 'An asynchronous message long enough to scroll a couple of times'
+
+    def test_send_message_async(self):
+        r"""
+        The asynchronous path leaves the display as the synchronous one does
+
+        """
+        asyncio.run(self.display.send_message_async())
+        expected = [bytes(row) for row in self.display._shadow.rows]
+        self.display.invalidate_shadow()
+        self.display.send_message()
+        self.assertEqual([bytes(row) for row in self.display._shadow.rows], expected)
+
+    def test_event_loop_keeps_running(self):
+        r"""
+        Other tasks run while a message is being sent
+
+        """
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.001)
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            await self.display.send_message_async()
+            task.cancel()
+
+        asyncio.run(main())
+        self.assertGreater(len(ticks), 10)
+        self.assertLess(max(b - a for a, b in zip(ticks, ticks[1:])), 0.05)
+
+    def test_cancel_keeps_shadow(self):
+        r"""
+        A cancelled send leaves the shadow matching what reached the display
+
+        """
+        async def main():
+            task = asyncio.ensure_future(self.display.send_message_async())
+            await asyncio.sleep(0.02)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        shadow = self.display._shadow
+        self.assertEqual([bytes(row) for row in shadow.rows], self.display.emulator.rows(16, (0x00, 0x40)))
+        column, row = shadow.cursor
+        self.assertEqual(column + (0x00, 0x40)[row], self.display.emulator.address_counter)
+
+
+class TestLcdScrollStream(TestCase):
+    """
+    """
+    text = ('Streaming text arrives in pieces that split words\nand lines anywhere, '
+            'averyveryverylongwordthatneedsmorethanonelineofthedisplay and a tail')
+
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, direction=LCDSCROLL_UP, realtime=False)
+
+    def expected(self):
+        r"""
+        What send_message() shows for the whole text at once
+
+        """
+        reference = LcdScroll_CharLCDPlate(cols=16, lines=2, direction=LCDSCROLL_UP, realtime=False)
+        reference.message_text = self.text
+        reference.send_message()
+        return reference.display_text()
+
+    def test_chunks_match_message(self):
+        r"""
+        However the text is cut up the display ends up as if it was sent in one piece
+
+        """
+        expected = self.expected()
+        for size in (1, 3, 7, 16, 1000):
+            chunks = (self.text[start:start + size] for start in range(0, len(self.text), size))
+            self.display.send_stream(chunks)
+            self.assertEqual(self.display.display_text(), expected, size)
+
+    def test_bytes_and_files(self):
+        r"""
+        Bytes are decoded across chunk boundaries and file objects stream line by line
+
+        """
+        data = 'café crème\r\n'.encode('utf-8')
+        self.display.send_stream(data[start:start + 1] for start in range(len(data)))
+        self.assertEqual(self.display.display_text()[1].rstrip(), 'café crème')
+        self.display.send_stream(io.StringIO(self.text))
+        self.assertEqual(self.display.display_text(), self.expected())
+
+    def test_bounded_carry(self):
+        r"""
+        Text without spaces is not held back beyond a line
+
+        """
+        shown = []
+
+        def chunks():
+            for _ in range(50):
+                yield 'x' * 7
+                shown.append(self.display.display_text()[1].count('x'))
+
+        self.display.send_stream(chunks())
+        self.assertTrue(all(count > 0 for count in shown[3:]))
+
+    def test_marquee_refused(self):
+        r"""
+        Streaming needs a vertical scroll direction
+
+        """
+        self.display.direction = LCDSCROLL_LEFT
+        with self.assertRaises(LcdScrollEx):
+            self.display.send_stream(['text'])
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the multi-display manager
+
+:program: LcdScroll
+:file: test_manager
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.manager
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdDisplayManager, LcdScrollEx
+from LcdScroll.lcdscroll import LcdScroller
+import pytest
+import threading
+import time
+
+
+class SlowBusDisplay(LcdScroller):
+    """
+    Display whose every bus operation takes a millisecond, like a busy I2C bus.
+    """
+    def clear(self):
+        """
+
+        """
+        time.sleep(0.001)
+
+    def set_cursor(self, col, row):
+        """
+
+        """
+        time.sleep(0.001)
+
+    def send_bytes(self, data):
+        """
+
+        """
+        time.sleep(0.001)
+
+    def show_cursor(self, show):
+        """
+
+        """
+
+
+class BusActivity:
+    """
+    Which displays were drawing at the same time.
+    """
+    def __init__(self, parties: int):
+        self.lock = threading.Lock()
+        self.active = set()
+        self.overlaps = set()
+        # holds the first draw of each display until another display draws alongside it
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+
+class RecordingBusDisplay(SlowBusDisplay):
+    """
+    Display recording into a :class:`BusActivity` which other displays drew while it did.
+    """
+    def __init__(self, activity: BusActivity, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.activity = activity
+        self.waited = False
+
+    def send_bytes(self, data):
+        """
+
+        """
+        activity = self.activity
+        with activity.lock:
+            activity.overlaps.update(frozenset((self, other)) for other in activity.active)
+            activity.active.add(self)
+        try:
+            if not self.waited:
+                self.waited = True
+                try:
+                    activity.barrier.wait()
+                except threading.BrokenBarrierError:
+                    pass
+            time.sleep(0.001)
+        finally:
+            with activity.lock:
+                activity.active.discard(self)
+
+
+class TestLcdDisplayManager(TestCase):
+    """
+    """
+    message = 'Rack status nominal on every unit'
+
+    def test_buses_run_in_parallel(self):
+        r"""
+        Displays on different buses draw at the same time, displays on one bus one after the other
+
+        """
+        activity = BusActivity(2)
+        with LcdDisplayManager() as manager:
+            for number in range(4):
+                manager.register(RecordingBusDisplay(activity, 16, 2), bus=number % 2)
+            for display in manager.displays:
+                manager.submit(display, self.message)
+            self.assertTrue(manager.flush(10))
+            latency = manager.frame_latency()
+            self.assertEqual(set(latency), set(manager.displays))
+            self.assertTrue(all(frames.count > 0 for frames in latency.values()))
+            buses = [set(displays) for displays in manager.buses.values()]
+        self.assertFalse(activity.barrier.broken)
+        self.assertTrue(any(len(pair & bus) == 1 for pair in activity.overlaps for bus in buses))
+        self.assertFalse(any(pair <= bus for pair in activity.overlaps for bus in buses))
+
+    def test_register(self):
+        r"""
+        Displays are grouped by bus and can only be registered once
+
+        """
+        with LcdDisplayManager() as manager:
+            first, second = SlowBusDisplay(16, 2), SlowBusDisplay(16, 2)
+            manager.register(first, bus='i2c-1')
+            manager.register(second)
+            self.assertEqual(manager.buses, {'i2c-1': [first], None: [second]})
+            with pytest.raises(LcdScrollEx):
+                manager.register(first)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the pin state lookup tables
+
+:program: LcdScroll
+:file: test_pins
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.pins
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase, skipUnless
+from LcdScroll import LcdScroll_CharLCDPlate, LcdScroll_RGBCharLCD
+from LcdScroll.lcdscroll import LcdScroll_CharLCD
+from LcdScroll.pins import NUMPY_MIN_LENGTH, PinTable, nibble_states, _load_numpy
+from LcdScroll.transport import FakeGPIO
+
+
+class TestNibbleStates(TestCase):
+    """
+    """
+    def test_four_bit(self):
+        r"""
+        Every byte maps to the levels of its high then its low nibble
+
+        """
+        states = nibble_states((12, 11, 10, 9))
+        self.assertEqual(len(states), 256)
+        self.assertEqual(states[0xA5], ({12: 0, 11: 1, 10: 0, 9: 1}, {12: 1, 11: 0, 10: 1, 9: 0}))
+
+    def test_eight_bit(self):
+        r"""
+        On an 8 bit wide bus every byte is a single transfer
+
+        """
+        states = nibble_states(range(8))
+        self.assertEqual(states[0x81], ({0: 1, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 1},))
+
+
+class TestPinTable(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.table = PinTable(bytes((value | 0x04, value, 0xFF - value)) for value in range(256))
+
+    def test_encode(self):
+        r"""
+        A line encodes to the entries of its bytes, short and long lines alike
+
+        """
+        self.assertEqual(self.table.encode(b'ab'), bytes((0x65, 0x61, 0x9E, 0x66, 0x62, 0x9D)))
+        line = bytes(range(256)) * 2
+        self.assertGreaterEqual(len(line), NUMPY_MIN_LENGTH)
+        self.assertEqual(self.table.encode(line), b''.join(self.table[value] for value in line))
+        self.assertEqual(self.table.encode(b''), b'')
+        with self.assertRaises(ValueError):
+            PinTable([b'x'])
+
+    @skipUnless(_load_numpy(), 'NumPy is not installed')
+    def test_numpy(self):
+        r"""
+        Long lines go through the NumPy lookup
+
+        """
+        self.table.encode(bytes(NUMPY_MIN_LENGTH))
+        self.assertIsNotNone(self.table._array)
+
+
+class TestGpioTableBus(TestCase):
+    """
+    """
+    def test_write8(self):
+        r"""
+        A write sets RS and the nibbles from the table, one pin update per nibble
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        gpio = FakeGPIO(display._rs, display._en, (display._d4, display._d5, display._d6, display._d7))
+        display._gpio = gpio
+        display.write8(0xA5, True)
+        self.assertEqual(gpio.writes, 3)
+        self.assertTrue(gpio.levels[display._rs])
+        self.assertEqual([gpio.levels[pin] for pin in (display._d4, display._d5, display._d6, display._d7)],
+                         [True, False, True, False])
+
+    def test_char_lcd(self):
+        r"""
+        The GPIO wired displays take the driver's pin arguments and write through the table
+
+        """
+        gpio = FakeGPIO(0, 1, (2, 3, 4, 5))
+        display = LcdScroll_CharLCD(16, 2, rs=0, en=1, d4=2, d5=3, d6=4, d7=5, gpio=gpio, realtime=False)
+        self.assertEqual((display._rs, display._en, display._d4, display._d7), (0, 1, 2, 5))
+        self.assertEqual((display._cols, display._lines, display.columns), (16, 2, 16))
+        writes = gpio.writes
+        display.write8(0x5A)
+        self.assertEqual(gpio.writes - writes, 3)
+        self.assertFalse(gpio.levels[0])
+        self.assertEqual([gpio.levels[pin] for pin in (2, 3, 4, 5)], [False, True, False, True])
+        rgb = LcdScroll_RGBCharLCD(20, 4, rs=0, en=1, d4=2, d5=3, d6=4, d7=5, red=6, green=7, blue=8,
+                                   gpio=FakeGPIO(0, 1, (2, 3, 4, 5)), realtime=False)
+        self.assertEqual((rgb._rs, rgb._d7, rgb._lines), (0, 5, 4))
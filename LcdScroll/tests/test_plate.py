@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the batched plate writes
+
+:program: LcdScroll
+:file: test_plate
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.plate
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase, mock
+from Waxfruit_CharLCD.hd44780 import HD44780
+from LcdScroll import LcdScroll_CharLCDPlate
+from LcdScroll.plate import FakeMCP23017, GPIOA, IODIRA, IOCON, IOCON_SEQOP, PLATE_PINS
+from LcdScroll.transport import Gpio4Transport
+
+ROWS = (0x00, 0x40)
+TEXT = b'Sixteen per line'
+
+
+class TestPlateBatchBus(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        self.mcp = FakeMCP23017(self.display.emulator)
+        self.display.mcp = self.mcp
+        self.device = self.mcp._device
+
+    def test_batch_gain(self):
+        r"""
+        A line costs a few block writes instead of nine transactions per character
+
+        """
+        emulator = HD44780()
+        emulator.eight_bit = False
+        unbatched = FakeMCP23017(emulator)
+        transport = Gpio4Transport(unbatched, PLATE_PINS['rs'], PLATE_PINS['en'], *PLATE_PINS['data'])
+        before = unbatched._device.transactions
+        transport.write_block(TEXT)
+        self.assertEqual(unbatched._device.transactions - before, 9 * len(TEXT))
+        self.assertEqual(emulator.rows(16, ROWS)[0], TEXT)
+        self.display.send_bytes(TEXT)
+        # switching to byte mode once, then a pair setting RS and 8 register values per character in blocks of 32
+        self.assertEqual(self.device.transactions - 2, 1 + (2 + len(TEXT) * 8 + 31) // 32)
+        self.assertEqual(self.display.emulator.rows(16, ROWS)[0], TEXT)
+
+    def test_message(self):
+        r"""
+        A scrolled message shows the same as on the unbatched driver, the other pins are kept
+
+        """
+        plain = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        plain.message_text = 'Streamed to the plate in blocks'
+        plain.send_message()
+        self.mcp.output(6, True)
+        display = self.display
+        display.message_text = 'Streamed to the plate in blocks'
+        display.send_message()
+        self.assertEqual(display.display_text(), plain.display_text())
+        self.assertTrue(self.device.registers[IOCON] & IOCON_SEQOP)
+        self.assertTrue(self.device.registers[GPIOA] & 1 << 6)
+        # the driver's own register pair writes still land on GPIOA and GPIOB in byte mode
+        self.mcp.output(PLATE_PINS['data'][0], True)
+        self.assertEqual(self.device.registers[GPIOA + 1], self.mcp.gpio[1])
+
+    def test_stats(self):
+        r"""
+        Bytes streamed in blocks are counted like the ones written one at a time
+
+        """
+        text = 'Fifteen letters'
+        plain = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        for display in (plain, self.display):
+            display.stats_enabled = True
+            display.message_text = text
+            display.send_message()
+        self.assertEqual(self.display.stats()['data_bytes'], len(text))
+        self.assertEqual(self.display.stats()['data_bytes'], plain.stats()['data_bytes'])
+        self.assertEqual(self.display.stats()['commands'], plain.stats()['commands'])
+
+    def test_block_size(self):
+        r"""
+        Blocks never exceed mcp_block values and without batching nothing goes to the expander
+
+        """
+        display = self.display
+        display.mcp_block = 8
+        display.send_bytes(b'ab')
+        self.assertEqual(self.device.transactions - 2, 1 + 3)
+        display.batch_writes = False
+        display.send_bytes(b'cd')
+        self.assertEqual(self.device.transactions - 2, 4)
+        self.assertEqual(display.emulator.rows(16, ROWS)[0][:4], b'abcd')
+
+    def test_busy_flag(self):
+        r"""
+        The busy flag is read through the expander in five transactions and replaces the fixed delay
+
+        """
+        display = self.display
+        display.write8(0x41, True)
+        before = self.device.transactions
+        display.write8(0x42, True)
+        plain = self.device.transactions - before
+        display.busy_flag = True
+        before, delay_us = self.device.transactions, display.delay_us
+        with mock.patch.object(display.emulator, 'busy', return_value=False):
+            display.write8(0x43, True)
+        self.assertEqual(self.device.transactions - before, plain + 5)
+        self.assertEqual((display.delay_us, display.busy_timeouts), (delay_us, 0))
+        self.assertEqual(display.emulator.rows(16, ROWS)[0][:3], b'ABC')
+        self.assertEqual(self.mcp.iodir, [self.device.registers[IODIRA], self.device.registers[IODIRA + 1]])
+        display.busy_timeout_us = 100
+        with mock.patch.object(display.emulator, 'busy', return_value=True):
+            self.assertTrue(display.read_busy_flag())
+            display.write8(0x44, True)
+        self.assertEqual(display.busy_timeouts, 1)
+        self.assertEqual(display.emulator.rows(16, ROWS)[0][:4], b'ABCD')
+
+    def test_rs_setup(self):
+        r"""
+        RS is set with EN low, so it never changes on a rising edge of EN
+
+        """
+        device = self.device
+        written = [(GPIOA + 1, device.registers[GPIOA + 1])]
+        store = device._store
+        device._store = lambda register, value: (written.append((register, value)), store(register, value))
+        display = self.display
+        display.write8(0x80)
+        display.send_bytes(b'ab')
+        display.write8(0x01)
+        display.send_bytes(b'c')
+        rs, enable = 1 << (PLATE_PINS['rs'] - 8), 1 << (PLATE_PINS['en'] - 8)
+        port = [value for register, value in written if register == GPIOA + 1]
+        rising = [index for index in range(1, len(port)) if port[index] & enable and not port[index - 1] & enable]
+        self.assertEqual(len(rising), 2 * 5)
+        for index in rising:
+            self.assertEqual(port[index] & rs, port[index - 1] & rs)
+        self.assertEqual(display.emulator.rows(16, ROWS)[0][:1], b'c')
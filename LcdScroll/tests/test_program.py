@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for precompiled messages
+
+:program: LcdScroll
+:file: test_program
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.program
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate, LcdScrollEx, LCDSCROLL_UP, LCDSCROLL_LEFT
+from LcdScroll.program import ProgramWriter, OP_COMMAND, OP_DATA, OP_DELAY, OP_FRAME
+
+
+class TestProgramWriter(TestCase):
+    """
+    """
+    def test_code(self):
+        r"""
+        Data bytes are gathered into runs, long delays are split
+
+        """
+        writer = ProgramWriter()
+        writer.command(0x01)
+        writer.delay(70000)
+        for code in b'hi':
+            writer.data(code)
+        writer.frame()
+        program = writer.program(('key',))
+        self.assertEqual(program.code, bytes((OP_COMMAND, 0x01, OP_DELAY, 0xFF, 0xFF, OP_DELAY, 0x71, 0x11,
+                                              OP_DATA, 2)) + b'hi' + bytes((OP_FRAME,)))
+        self.assertEqual(program.frames, 1)
+        with self.assertRaises(AttributeError):
+            program.code = b''
+
+
+class TestLcdScrollProgram(TestCase):
+    """
+    """
+    text = 'Compiled once and shown over and over again on the display'
+
+    def make(self, **kwargs):
+        r"""
+        A display set up for the tests
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=16, lines=2, direction=LCDSCROLL_UP, realtime=False, **kwargs)
+        display.register_glyph('♥', [0, 10, 31, 31, 14, 4, 0, 0])
+        return display
+
+    def test_replay_matches_send(self):
+        r"""
+        Replaying a program leaves a display exactly as sending the message does
+
+        """
+        sent = self.make()
+        sent.message_text = self.text + ' ♥'
+        sent.send_message()
+        compiler = self.make()
+        program = compiler.compile_message(self.text + ' ♥')
+        self.assertEqual(compiler.emulator.stats()['data_writes'], 0)
+        replayed = self.make()
+        replayed.message_text = 'Something else first'
+        replayed.send_message()
+        replayed.send_program(program)
+        self.assertEqual(replayed.display_text(), sent.display_text())
+        self.assertEqual(replayed.emulator.glyph(0), sent.emulator.glyph(0))
+        self.assertEqual([bytes(row) for row in replayed._shadow.rows], replayed.emulator.rows(16, (0x00, 0x40)))
+        # the display carries on from the replayed frame as if it had sent the message itself
+        replayed.emulator.reset_counters()
+        replayed.message_text = self.text + ' ♥'
+        replayed.send_message()
+        self.assertEqual(replayed.display_text(), sent.display_text())
+
+    def test_replay_is_reusable(self):
+        r"""
+        A program replays on any display with the same configuration, and only on those
+
+        """
+        program = self.make().compile_message(self.text)
+        for _ in range(2):
+            display = self.make()
+            display.send_program(program)
+            self.assertEqual(display.display_text()[1].rstrip(), 'on the display')
+        other = self.make(cursor=True)
+        with self.assertRaises(LcdScrollEx):
+            other.send_program(program)
+
+    def test_marquee(self):
+        r"""
+        A marquee compiles to its shift commands and leaves the shadow invalid
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=16, lines=2, direction=LCDSCROLL_LEFT, realtime=False)
+        program = display.compile_message('Marquee')
+        self.assertEqual(program.frames, 41)
+        self.assertIsNone(program.rows)
+        display.send_program(program)
+        self.assertFalse(display._shadow.valid)
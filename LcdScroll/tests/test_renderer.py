@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the background renderer
+
+:program: LcdScroll
+:file: test_renderer
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.renderer
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdRenderer, LcdScroll_CharLCDPlate
+import time
+
+
+class TestLcdRenderer(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2)
+        self.renderer = LcdRenderer(self.display)
+
+    def tearDown(self):
+        """
+
+        """
+        self.renderer.stop()
+
+    def test_latest_wins(self):
+        r"""
+        Messages submitted faster than they are drawn are dropped, the last one is shown
+
+        """
+        start = time.perf_counter()
+        for count in range(50):
+            self.assertTrue(self.renderer.submit('Counter at %d' % count))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(self.renderer.flush(5))
+        self.assertEqual(bytes(self.display._shadow.rows[0]), b'Counter at 49   ')
+        self.assertGreater(self.renderer.dropped, 0)
+        self.assertEqual(self.renderer.rendered + self.renderer.dropped, 50)
+
+    def test_queue_bound(self):
+        r"""
+        Submissions for more displays than the queue holds are refused
+
+        """
+        renderer = LcdRenderer(maxsize=1)
+        renderer.stop()
+        other = LcdScroll_CharLCDPlate(cols=16, lines=2)
+        self.assertTrue(renderer.submit('one', self.display))
+        self.assertTrue(renderer.submit('two', self.display))
+        self.assertFalse(renderer.submit('three', other))
+        self.assertEqual((renderer.dropped, renderer.rejected), (1, 1))
+
+    def test_errors_are_kept(self):
+        r"""
+        A failing display does not stop the worker
+
+        """
+        self.display.send_bytes = None
+        self.renderer.submit('Broken display')
+        self.assertTrue(self.renderer.flush(5))
+        self.assertIsInstance(self.renderer.last_error, TypeError)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the frame scheduler
+
+:program: LcdScroll
+:file: test_scheduler
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.scheduler
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate, LcdScrollEx, LCDSCROLL_LEFT
+from LcdScroll.scheduler import FrameScheduler
+
+
+class FakeClock:
+    """
+    Clock that only moves when something sleeps or works.
+    """
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        """
+
+        """
+        self.now += seconds
+
+
+class TestFrameScheduler(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.clock = FakeClock()
+        self.scheduler = FrameScheduler(fps=10, clock=self.clock, sleep=self.clock.sleep)
+        self.drawn = []
+
+    def steps(self, count):
+        r"""
+        Animation steps recording their number as the state
+
+        """
+        for number in range(count):
+            self.state = number
+            yield
+
+    def render(self, cost=0.0):
+        r"""
+        Render function drawing the state, taking cost seconds
+
+        """
+        def render():
+            self.drawn.append((round(self.clock.now - 100.0, 6), self.state))
+            self.clock.now += cost
+        return render
+
+    def test_paced(self):
+        r"""
+        With a fast bus every frame is drawn on its deadline
+
+        """
+        self.scheduler.run(self.steps(5), self.render(0.01))
+        self.assertEqual(self.drawn, [(0.0, 0), (0.1, 1), (0.2, 2), (0.3, 3), (0.4, 4)])
+        stats = self.scheduler.stats()
+        self.assertEqual((stats['frames'], stats['dropped']), (5, 0))
+        self.assertEqual(stats['jitter']['max_s'], 0.0)
+
+    def test_drops_when_behind(self):
+        r"""
+        A slow bus drops frames instead of slowing the animation down, the last frame is always drawn
+
+        """
+        self.scheduler.run(self.steps(10), self.render(0.25))
+        states = [state for _time, state in self.drawn]
+        self.assertEqual(states[0], 0)
+        self.assertEqual(states[-1], 9)
+        self.assertLess(len(states), 10)
+        self.assertEqual(self.scheduler.dropped, 10 - len(states))
+        # the animation still finishes about when it would on a fast bus
+        self.assertLess(self.clock.now - 100.0, 10 * 0.1 + 0.25 + 1e-9)
+
+    def test_estimate_drops_ahead(self):
+        r"""
+        A late frame expected to overrun the next deadline is dropped before it is drawn
+
+        """
+        self.scheduler.run(self.steps(5), self.render(0.15), lambda: 0.15)
+        self.assertEqual(self.drawn, [(0.0, 0), (0.2, 2), (0.4, 4)])
+        self.assertEqual(self.scheduler.dropped, 2)
+
+    def test_self_drawing_steps(self):
+        r"""
+        Steps without a render function are paced, late ones run at once and count as dropped
+
+        """
+        times = []
+
+        def steps():
+            for number in range(4):
+                times.append(round(self.clock.now - 100.0, 6))
+                self.clock.now += 0.15 if number == 1 else 0.0
+                yield
+
+        self.scheduler.run(steps())
+        self.assertEqual(times, [0.0, 0.1, 0.25, 0.3])
+        self.assertEqual(self.scheduler.frames, 4)
+        self.assertEqual(self.scheduler.dropped, 0)
+        self.scheduler.reset()
+        self.assertEqual(self.scheduler.stats()['frames'], 0)
+
+
+class TestLcdScrollPaced(TestCase):
+    """
+    """
+    def test_paced_message(self):
+        r"""
+        A paced message ends up the same as an unpaced one
+
+        """
+        text = 'A paced message scrolls at a steady rate'
+        display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        display.message_text = text
+        display.send_message()
+        expected = display.display_text()
+        paced = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        paced.message_text = text
+        scheduler = paced.send_message_paced(fps=1000)
+        self.assertEqual(paced.display_text(), expected)
+        self.assertGreater(scheduler.frames, 0)
+        with self.assertRaises(LcdScrollEx):
+            paced.send_message_paced(fps=0)
+
+    def test_paced_marquee(self):
+        r"""
+        The marquee runs one shift per frame
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=16, lines=2, direction=LCDSCROLL_LEFT, realtime=False)
+        display.message_text = 'Marquee'
+        clock = FakeClock()
+        scheduler = FrameScheduler(fps=20, clock=clock, sleep=clock.sleep)
+        display.send_message_paced(scheduler=scheduler)
+        # the initial load plus one shift per cell of the 40 character line, each up for a period
+        self.assertEqual(scheduler.frames, 41)
+        self.assertAlmostEqual(clock.now - 100.0, 41 / 20)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the screen ring buffer
+
+:program: LcdScroll
+:file: test_screen
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.screen
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate, LcdScrollEx, LCDSCROLL_UP
+from LcdScroll.screen import ScreenRing
+
+
+class TestScreenRing(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.ring = ScreenRing(4, 2, scrollback=3)
+
+    def test_put(self):
+        r"""
+        Writes are padded to the row width, cut at the edge and can carry on where the last one ended
+
+        """
+        self.ring.put(0, 0, b'ab')
+        self.ring.put(0, None, b'c')
+        self.ring.put(1, 2, b'xyz')
+        self.assertEqual(self.ring.window(), [b'abc ', b'  xy'])
+        self.ring.put(0, 1, b'q')
+        self.assertEqual(self.ring.window()[0], b'aq  ')
+
+    def test_scroll_up_history(self):
+        r"""
+        Scrolling up keeps the rows that leave the top for looking back at
+
+        """
+        ring = self.ring
+        for line in b'abcdef':
+            ring.scroll(True)
+            ring.put(1, 0, bytes([line]))
+        self.assertEqual(ring.window(), [b'e   ', b'f   '])
+        self.assertEqual(ring.history, 3)
+        self.assertEqual(ring.window(1), [b'd   ', b'e   '])
+        self.assertEqual(ring.window(3), [b'b   ', b'c   '])
+        self.assertEqual(ring.window(10), ring.window(3))
+
+    def test_scroll_down_history(self):
+        r"""
+        Scrolling down keeps the rows that leave the bottom
+
+        """
+        ring = self.ring
+        for line in b'abc':
+            ring.scroll(False)
+            ring.put(0, 0, bytes([line]))
+        self.assertEqual(ring.window(), [b'c   ', b'b   '])
+        self.assertEqual(ring.window(1), [b'b   ', b'a   '])
+        ring.scroll(True)
+        self.assertEqual(ring.history, 1)
+
+    def test_scroll_moves_no_rows(self):
+        r"""
+        Scrolling reuses the row objects, only the head index moves
+
+        """
+        rows = list(self.ring._rows)
+        for _ in range(20):
+            self.ring.scroll(True)
+        self.assertEqual([id(row) for row in self.ring._rows], [id(row) for row in rows])
+
+    def test_resize(self):
+        r"""
+        Resizing keeps what fits of the visible rows
+
+        """
+        self.ring.put(0, 0, b'abcd')
+        self.ring.put(1, 0, b'ef')
+        self.ring.resize(6, 1)
+        self.assertEqual(self.ring.window(), [b'abcd  '])
+        self.ring.put(0, None, b'!')
+        self.assertEqual(self.ring.window(), [b'abcd! '])
+
+
+class TestLcdScrollScrollback(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, direction=LCDSCROLL_UP, realtime=False)
+        self.display.scrollback = 8
+        self.display.message_text = 'one\ntwo\nthree\nfour\nfive'
+        self.display.send_message()
+
+    def test_page_back(self):
+        r"""
+        Paging back shows earlier lines without sending the message again
+
+        """
+        display = self.display
+        self.assertEqual([row.rstrip() for row in display.display_text()], ['four', 'five'])
+        display.stats_enabled = True
+        display.page_back()
+        self.assertEqual(display.view_offset, 2)
+        self.assertEqual([row.rstrip() for row in display.display_text()], ['two', 'three'])
+        self.assertEqual(display.stats()['clears'], 0)
+        # the first line entered at the bottom below a blank row
+        display.page_back(5)
+        self.assertEqual(display.view_offset, 4)
+        self.assertEqual([row.rstrip() for row in display.display_text()], ['', 'one'])
+        display.page_forward(10)
+        self.assertEqual([row.rstrip() for row in display.display_text()], ['four', 'five'])
+
+    def test_new_message_drops_history(self):
+        r"""
+        Each message starts at the live view with an empty history
+
+        """
+        display = self.display
+        display.page_back()
+        display.message_text = 'six'
+        display.send_message()
+        self.assertEqual(display.view_offset, 0)
+        display.page_back()
+        self.assertEqual(display.view_offset, 0)
+
+    def test_negative_scrollback(self):
+        r"""
+        The scrollback depth can not be negative
+
+        """
+        with self.assertRaises(LcdScrollEx):
+            self.display.scrollback = -1
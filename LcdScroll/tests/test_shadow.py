@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the shadow display memory
+
+:program: LcdScroll
+:file: test_shadow
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.shadow
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate
+from LcdScroll.shadow import ShadowDDRAM, ddram_address, ddram_index
+
+
+class TestShadowDDRAM(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.shadow = ShadowDDRAM(8, 2)
+        self.shadow.blank()
+
+    def test_diff_unchanged(self):
+        r"""
+        A frame identical to the shadow needs no writes
+
+        """
+        self.assertEqual(self.shadow.diff([b' ' * 8, b' ' * 8]), [])
+
+    def test_diff_runs(self):
+        r"""
+        Changed cells are grouped into runs, small gaps are merged
+
+        """
+        runs = self.shadow.diff([b'a b     ', b'x     yz'])
+        self.assertEqual(runs, [(0, 0, b'a b'), (0, 1, b'x'), (6, 1, b'yz')])
+
+    def test_write_tracks_cursor(self):
+        r"""
+        Writes update the rows and advance the cursor
+
+        """
+        self.shadow.move(6, 1)
+        self.shadow.write(b'abcd')
+        self.assertEqual(self.shadow.rows[1], bytearray(b'      ab'))
+        self.assertEqual(self.shadow.cursor, (10, 1))
+        self.shadow.invalidate()
+        self.assertFalse(self.shadow.valid)
+
+    def test_write_follows_address_counter(self):
+        r"""
+        Writing past the end of a line carries on where the address counter goes
+
+        """
+        shadow = ShadowDDRAM(20, 4)
+        shadow.blank()
+        shadow.move(18, 0)
+        shadow.write(b'abcd')
+        self.assertEqual(bytes(shadow.rows[0][18:]), b'ab')
+        self.assertEqual(bytes(shadow.rows[2][:2]), b'cd')
+        self.assertEqual(shadow.cursor, (2, 2))
+        # the end of line 2 wraps into the second half of display memory, line 1
+        shadow.move(19, 2)
+        shadow.write(b'xy')
+        self.assertEqual((shadow.rows[2][19:], shadow.rows[1][:1]), (bytearray(b'x'), bytearray(b'y')))
+        self.assertEqual(shadow.address, 0x41)
+        self.assertEqual([ddram_index(ddram_address(index)) for index in range(80)], list(range(80)))
+
+    def test_diff_address_order(self):
+        r"""
+        Runs are ordered to ride the address counter from line 0 into line 2
+
+        """
+        shadow = ShadowDDRAM(20, 4)
+        shadow.blank()
+        frame = [b'A' * 20, b'B' * 20, b'C' * 20, b'D' * 20]
+        # the whole screen is one run through all of display memory
+        self.assertEqual(shadow.diff(frame), [(0, 0, b'A' * 20 + b'C' * 20 + b'B' * 20 + b'D' * 20)])
+        frame = [b' ' * 19 + b'x', b' ' * 20, b'y' + b' ' * 19, b' ' * 20]
+        self.assertEqual(shadow.diff(frame), [(19, 0, b'xy')])
+
+    def test_diff_from_cursor(self):
+        r"""
+        Runs start at the address counter, a run just after it is extended back to it
+
+        """
+        self.shadow.move(2, 1)
+        self.assertEqual(self.shadow.diff([b'a       ', b'   b    ']), [(2, 1, b' b'), (0, 0, b'a')])
+
+
+class TestAddressOrderRender(TestCase):
+    """
+    """
+    def test_full_screen_without_cursor_moves(self):
+        r"""
+        A full 20x4 screen goes out without a single cursor move
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=20, lines=4, realtime=False)
+        display.send_message()
+        for line, text in enumerate((b'first', b'second', b'third', b'fourth')):
+            display._screen.put(line, 0, text * 4)
+        display.stats_enabled = True
+        display._render()
+        self.assertEqual(display.stats()['cursor_moves'], 0)
+        self.assertEqual(display.emulator.rows(20, (0x00, 0x40, 0x14, 0x54)), display._screen.window())
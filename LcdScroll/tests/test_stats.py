@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bus counters
+
+:program: LcdScroll
+:file: test_stats
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.stats
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import asyncio
+from unittest import TestCase
+from LcdScroll import LcdScroll_CharLCDPlate
+from LcdScroll.stats import LatencyHistogram, INSTRUMENTED
+
+
+class TestLatencyHistogram(TestCase):
+    """
+    """
+    def test_buckets(self):
+        r"""
+        Samples land in the first bucket whose bound they do not exceed
+
+        """
+        histogram = LatencyHistogram(buckets=(0.001, 0.01))
+        for seconds in (0.0005, 0.001, 0.005, 3.0):
+            histogram.add(seconds)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['buckets'], [[0.001, 2], [0.01, 1], [None, 1]])
+        self.assertEqual(snapshot['count'], 4)
+        self.assertEqual(snapshot['max_s'], 3.0)
+        self.assertAlmostEqual(snapshot['mean_s'], 3.0065 / 4)
+
+
+class TestDisplayStats(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.display = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+
+    def test_disabled_by_default(self):
+        r"""
+        Without instrumentation the driver's methods are called directly and nothing is counted
+
+        """
+        self.assertFalse(self.display.stats_enabled)
+        for name in INSTRUMENTED:
+            self.assertNotIn(name, vars(self.display))
+        self.display.message_text = 'Hello'
+        self.display.send_message()
+        self.assertEqual(self.display.stats()['data_bytes'], 0)
+
+    def test_counters(self):
+        r"""
+        Commands, data bytes, cursor moves, clears and glyph uploads are counted separately
+
+        """
+        display = self.display
+        display.stats_enabled = True
+        display.clear()
+        display.set_cursor(3, 1)
+        display.message('abc')
+        display.create_char(1, [0] * 8)
+        stats = display.stats()
+        self.assertEqual(stats['clears'], 1)
+        self.assertEqual(stats['cursor_moves'], 1)
+        self.assertEqual(stats['messages'], 1)
+        self.assertEqual(stats['glyph_uploads'], 1)
+        self.assertEqual(stats['data_bytes'], 3 + 8)
+        # clear, set cursor and the set CGRAM address of create_char
+        self.assertEqual(stats['commands'], 3)
+        self.assertGreaterEqual(stats['delay_s'], 0)
+
+    def test_send_message_latency(self):
+        r"""
+        Every send_message() adds to the latency histogram, including the asynchronous one
+
+        """
+        display = self.display
+        display.stats_enabled = True
+        display.message_text = 'A message that needs a few lines'
+        display.send_message()
+        asyncio.run(display.send_message_async())
+        stats = display.stats()
+        self.assertEqual(stats['send_message']['count'], 2)
+        self.assertEqual(sum(count for _bound, count in stats['send_message']['buckets']), 2)
+        self.assertGreater(stats['data_bytes'], 0)
+
+    def test_reset_and_disable(self):
+        r"""
+        reset_stats() zeroes the counters, disabling removes the wrappers
+
+        """
+        display = self.display
+        display.stats_enabled = True
+        display.message('x')
+        display.reset_stats()
+        self.assertEqual(display.stats()['data_bytes'], 0)
+        display.stats_enabled = False
+        for name in INSTRUMENTED:
+            self.assertNotIn(name, vars(display))
+        display.message('x')
+        self.assertEqual(display.stats()['data_bytes'], 0)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bus timing helpers
+
+:program: LcdScroll
+:file: test_timing
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.timing
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from LcdScroll import timing
+from LcdScroll.timing import HybridSleeper
+from LcdScroll import LcdScroll_CharLCDPlate
+import time
+
+
+class TestHybridSleeper(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.sleeper = HybridSleeper()
+
+    def test_calibrate(self):
+        r"""
+        Calibration stays within its limits and is reused
+
+        """
+        spin = timing.calibrate(samples=5)
+        self.assertTrue(timing.MIN_SPIN_NS <= spin <= timing.MAX_SPIN_NS)
+        self.assertEqual(timing.spin_threshold_ns(), spin)
+
+    def test_sleep_is_not_short(self):
+        r"""
+        A delay never ends early
+
+        """
+        start = time.perf_counter_ns()
+        self.sleeper.sleep_us(1500)
+        self.assertGreaterEqual(time.perf_counter_ns() - start, 1500000)
+
+    def test_sleep_yields_cpu(self):
+        r"""
+        Long delays are mostly spent asleep
+
+        """
+        start = time.process_time()
+        self.sleeper.sleep_us(50000)
+        self.assertLess(time.process_time() - start, 0.025)
+
+    def test_batch(self):
+        r"""
+        While batching, time spent since the last delay counts towards the next
+
+        """
+        with self.sleeper.batch():
+            self.sleeper.delay_us(10)
+            time.sleep(0.003)
+            start = time.perf_counter_ns()
+            self.sleeper.delay_us(1000)
+            self.assertLess(time.perf_counter_ns() - start, 500000)
+        start = time.perf_counter_ns()
+        self.sleeper.delay_us(1000)
+        self.assertGreaterEqual(time.perf_counter_ns() - start, 1000000)
+
+    def test_display_uses_sleeper(self):
+        r"""
+        The display classes delay through their sleeper
+
+        """
+        display = LcdScroll_CharLCDPlate(cols=16, lines=2)
+        self.assertIsInstance(display.sleeper, HybridSleeper)
+        with display.batched_delays():
+            self.assertEqual(display.sleeper._batching, 1)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bus transports
+
+:program: LcdScroll
+:file: test_transport
+:platform: Cross-Platform
+:synopsis: Tests for LcdScroll.transport
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase
+from Waxfruit_CharLCD.hd44780 import HD44780
+from LcdScroll.lcdscroll import LcdScroll_CharLCDPlate, LcdScroll_TransportLCD
+from LcdScroll.transport import FakeGPIO, FakeI2C, Gpio4Transport, Gpio8Transport, PCF8574Transport, \
+    TransportCost
+
+ROWS = (0x00, 0x40)
+
+
+class TestTransportCost(TestCase):
+    """
+    """
+    def test_estimate(self):
+        r"""
+        Block transports pay the transaction cost once per run, the others once per byte
+
+        """
+        self.assertEqual(TransportCost(100, 10, True).estimate_us(2, 20, 1), 3 * 100 + 22 * 10)
+        self.assertEqual(TransportCost(100, 10, False).estimate_us(2, 20, 1), 22 * 100 + 22 * 10)
+        self.assertEqual(TransportCost(100, 10, True).estimate_us(2, 20), 22 * 100 + 22 * 10)
+
+
+class TestGpioTransports(TestCase):
+    """
+    """
+    def make(self, width):
+        r"""
+        A display on a fake GPIO bus of width data lines
+
+        """
+        emulator = HD44780()
+        pins = tuple(range(2, 2 + width))
+        gpio = FakeGPIO(0, 1, pins, emulator)
+        transport = Gpio4Transport(gpio, 0, 1, *pins) if width == 4 else Gpio8Transport(gpio, 0, 1, *pins)
+        display = LcdScroll_TransportLCD(transport, cols=16, lines=2, realtime=False)
+        return display, gpio, emulator
+
+    def test_four_bit(self):
+        r"""
+        The 4-bit transport brings the controller into 4-bit mode and gets the message on the glass
+
+        """
+        display, _gpio, emulator = self.make(4)
+        self.assertFalse(emulator.eight_bit)
+        display.message_text = 'Four bits'
+        display.send_message()
+        self.assertEqual(emulator.rows(16, ROWS)[0].rstrip(), b'Four bits')
+
+    def test_eight_bit(self):
+        r"""
+        The 8-bit transport keeps the controller in 8-bit mode and needs half the GPIO writes per byte
+
+        """
+        display, gpio, emulator = self.make(8)
+        self.assertTrue(emulator.eight_bit)
+        display.message_text = 'Eight bits'
+        display.send_message()
+        self.assertEqual(emulator.rows(16, ROWS)[0].rstrip(), b'Eight bits')
+        narrow, narrow_gpio, _emulator = self.make(4)
+        gpio.writes = narrow_gpio.writes = 0
+        display.send_bytes(b'abcd')
+        narrow.send_bytes(b'abcd')
+        self.assertEqual(gpio.writes * 2, narrow_gpio.writes + 4)
+
+
+class TestPCF8574Transport(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.emulator = HD44780()
+        self.bus = FakeI2C(self.emulator)
+        self.transport = PCF8574Transport(self.bus, 0x3F)
+        self.display = LcdScroll_TransportLCD(self.transport, cols=16, lines=2, realtime=False)
+
+    def test_block_write(self):
+        r"""
+        A run of characters goes out as one transaction of five port writes per character
+
+        """
+        self.assertFalse(self.emulator.eight_bit)
+        del self.bus.transactions[:]
+        self.display.send_bytes(b'block')
+        self.assertEqual(len(self.bus.transactions), 1)
+        address, data = self.bus.transactions[0]
+        self.assertEqual((address, len(data)), (0x3F, 25))
+        self.assertEqual(self.emulator.rows(16, ROWS)[0].rstrip(), b'block')
+        self.assertEqual(self.bus.setup_violations, 0)
+
+    def test_message(self):
+        r"""
+        A scrolled message needs a transaction per command and per run, not per character
+
+        """
+        plate = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        plate.message_text = 'Over I2C in one go'
+        plate.send_message()
+        del self.bus.transactions[:]
+        display = self.display
+        display.message_text = 'Over I2C in one go'
+        display.send_message()
+        self.assertEqual(self.emulator.rows(16, ROWS), plate.emulator.rows(16, ROWS))
+        self.assertLess(len(self.bus.transactions), len('Over I2C in one go'))
+        self.assertEqual(self.bus.setup_violations, 0)
+
+    def test_stats(self):
+        r"""
+        Bytes sent in block transactions are counted like the ones written one at a time
+
+        """
+        text = 'Counted in blocks'
+        plate = LcdScroll_CharLCDPlate(cols=16, lines=2, realtime=False)
+        for display in (plate, self.display):
+            display.stats_enabled = True
+            display.message_text = text
+            display.send_message()
+        self.assertGreater(self.display.stats()['data_bytes'], 0)
+        self.assertEqual(self.display.stats()['data_bytes'], plate.stats()['data_bytes'])
+        self.assertEqual(self.display.stats()['commands'], plate.stats()['commands'])
+
+    def test_backlight(self):
+        r"""
+        The backlight bit is kept in every port write
+
+        """
+        self.display.set_backlight(False)
+        self.display.send_bytes(b'x')
+        self.assertFalse(any(port & PCF8574Transport.BACKLIGHT for port in self.bus.transactions[-1][1]))
+        self.display.set_backlight(True)
+        self.display.send_bytes(b'y')
+        self.assertTrue(all(port & PCF8574Transport.BACKLIGHT for port in self.bus.transactions[-1][1]))
+        self.assertEqual(self.emulator.rows(16, ROWS)[0][:2], b'xy')
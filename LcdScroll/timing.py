@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Bus timing for LcdScroll displays.
+
+The Adafruit driver waits a full millisecond before every byte and does it by spinning on the clock,
+which keeps a core busy for the whole time a message is being written.  HybridSleeper hands most of a
+delay to the scheduler and only spins for the last stretch, the part the scheduler can not be trusted
+with.  How long that stretch is gets measured once per process.
+
+    :program: LcdScroll
+    :file: timing
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: Calibrated sleep-then-spin delays and delay batching for the display bus.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import time
+from contextlib import contextmanager
+
+MIN_SPIN_NS = 20000
+"""int: Shortest spin period, even a perfectly punctual scheduler gets this much slack."""
+MAX_SPIN_NS = 2000000
+"""int: Longest spin period, stops a badly loaded calibration run from turning sleeps into spins."""
+
+_spin_ns = None
+
+
+def calibrate(samples: int = 25, request_us: int = 100) -> int:
+    r"""
+    Measure how late the scheduler wakes a sleeping thread.
+
+    The result is cached and used by every HybridSleeper created without an explicit spin period.
+
+    Args:
+        samples (:obj:`int`, optional): Number of trial sleeps (default 25)
+        request_us (:obj:`int`, optional): Length of each trial sleep in microseconds (default 100)
+
+    Returns:
+        :obj:`int`: Spin period in nanoseconds, the 90th percentile of the measured oversleep
+
+    """
+    global _spin_ns  # pylint: disable=W0603
+    oversleep = []
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        time.sleep(request_us / 1000000.0)
+        oversleep.append(time.perf_counter_ns() - start - request_us * 1000)
+    oversleep.sort()
+    _spin_ns = min(max(oversleep[len(oversleep) * 9 // 10], MIN_SPIN_NS), MAX_SPIN_NS)
+    return _spin_ns
+
+
+def spin_threshold_ns() -> int:
+    r"""
+    Spin period measured by :func:`calibrate`, calibrating on first use.
+
+    Returns:
+        :obj:`int`: Spin period in nanoseconds
+
+    """
+    if _spin_ns is None:
+        return calibrate()
+    return _spin_ns
+
+
+class HybridSleeper:
+    r"""
+    Delays that sleep for most of their length and spin for the rest.
+
+    Inside :meth:`batch` a delay is measured from the end of the previous delay rather than from the
+    moment it is requested, so the time spent on bus transactions in between counts towards it.  The
+    Adafruit driver delays before each byte, on the I2C plate the transactions of the previous byte
+    usually cover most of that.
+
+    Args:
+        spin_ns (:obj:`int`, optional): Spin period in nanoseconds, calibrated when not given
+
+    """
+
+    def __init__(self, spin_ns: int = None):
+        self.spin_ns = spin_threshold_ns() if spin_ns is None else spin_ns
+        #: perf_counter_ns() at the end of the last delay
+        self._mark = None
+        self._batching = 0
+
+    def sleep_until_ns(self, deadline: int):
+        r"""
+        Wait until perf_counter_ns() reaches deadline.
+
+        Args:
+            deadline (:obj:`int`): Time to wake up, in perf_counter_ns() nanoseconds
+
+        """
+        remaining = deadline - time.perf_counter_ns()
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1000000000.0)
+        while time.perf_counter_ns() < deadline:
+            pass
+
+    def sleep_us(self, microseconds: float):
+        r"""
+        Wait for a number of microseconds regardless of batching.
+
+        Args:
+            microseconds (:obj:`float`): Length of the delay
+
+        """
+        self.sleep_until_ns(time.perf_counter_ns() + int(microseconds * 1000))
+
+    def deadline_ns(self, microseconds: float) -> int:
+        r"""
+        When a delay requested now would end.
+
+        Args:
+            microseconds (:obj:`float`): Length of the delay
+
+        Returns:
+            :obj:`int`: End of the delay in perf_counter_ns() nanoseconds, measured from the end of the
+            previous delay while batching
+
+        """
+        if self._batching and self._mark is not None:
+            return self._mark + int(microseconds * 1000)
+        return time.perf_counter_ns() + int(microseconds * 1000)
+
+    def delay_us(self, microseconds: float):
+        r"""
+        Bus delay, shortened by the time already spent since the previous delay while batching.
+
+        Args:
+            microseconds (:obj:`float`): Length of the delay
+
+        """
+        deadline = self.deadline_ns(microseconds)
+        self.sleep_until_ns(deadline)
+        self._mark = max(deadline, time.perf_counter_ns())
+
+    @contextmanager
+    def batch(self):
+        r"""
+        Context manager measuring each delay from the end of the previous one.
+
+        Example::
+
+            with sleeper.batch():
+                for value in data:
+                    write(value)
+
+        """
+        self._batching += 1
+        try:
+            yield self
+        finally:
+            self._batching -= 1
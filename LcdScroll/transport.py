@@ -0,0 +1,783 @@
+# -*- coding: utf-8 -*-
+"""
+Bus transports for driving an HD44780 without the Adafruit stack.
+
+The Adafruit classes always bit-bang the controller in 4-bit mode.  A transport only moves bytes to
+the controller, :class:`TransportCharLCD` implements the Adafruit_CharLCD interface on top of one, so
+:class:`LcdScroll.lcdscroll.LcdScroll_TransportLCD` can run on any of them:
+
+* :class:`Gpio4Transport` -- RS, EN and D4-D7, two nibble transfers per byte
+* :class:`Gpio8Transport` -- RS, EN and D0-D7, one transfer per byte in 8-bit mode
+* :class:`PCF8574Transport` -- the common I2C backpack, a whole run of characters goes out as one
+  I2C write transaction
+
+Every transport declares a :class:`TransportCost`, what a transaction and a byte cost on its bus, which
+:meth:`LcdScroll.lcdscroll.LcdScroller.send_message_paced` uses to drop frames that could not be drawn
+in time before spending the bus on them.
+
+:class:`FakeGPIO` and :class:`FakeI2C` stand in for the hardware.  They count what goes over the bus and
+decode it back into bytes for a :class:`Waxfruit_CharLCD.hd44780.HD44780` emulator, so a transport can
+be tested down to the enable pulses.
+
+    :program: LcdScroll
+    :file: transport
+    :platform: Cross-Platform, Primarily Raspberry Pi.
+    :synopsis: 4-bit GPIO, 8-bit parallel and PCF8574 I2C transports with cost models.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+import time
+from collections import namedtuple
+from .bus import GPIO_OUT
+from .pins import PinTable, nibble_states
+from .shadow import ROW_OFFSETS
+
+LCD_CLEARDISPLAY = 0x01
+"""int: Clear display instruction."""
+LCD_RETURNHOME = 0x02
+"""int: Return home instruction."""
+LCD_ENTRYMODESET = 0x04
+"""int: Entry mode set instruction."""
+LCD_DISPLAYCONTROL = 0x08
+"""int: Display on/off control instruction."""
+LCD_CURSORSHIFT = 0x10
+"""int: Cursor or display shift instruction."""
+LCD_FUNCTIONSET = 0x20
+"""int: Function set instruction."""
+LCD_SETCGRAMADDR = 0x40
+"""int: Set CGRAM address instruction."""
+LCD_SETDDRAMADDR = 0x80
+"""int: Set DDRAM address instruction."""
+
+LCD_8BITMODE = 0x10
+"""int: Function set flag for an 8 bit interface."""
+LCD_4BITMODE = 0x00
+"""int: Function set flag for a 4 bit interface."""
+LCD_2LINE = 0x08
+"""int: Function set flag for two line mode."""
+
+EXECUTION_US = 37
+"""int: Microseconds the controller takes to execute most instructions and data writes."""
+CLEAR_US = 3000
+"""int: Microseconds allowed for clear and return home, as the Adafruit driver does."""
+WRITE_DELAY_US = 1000
+"""int: Fixed delay before each write when the busy flag is not used, as the Adafruit driver does."""
+
+
+class TransportCost(namedtuple('TransportCost', 'transaction_us byte_us block')):
+    r"""
+    What moving bytes to the controller costs on a transport.
+
+    Attributes:
+        transaction_us (:obj:`float`): Fixed microseconds of every transaction, the I2C start and address
+        byte say
+        byte_us (:obj:`float`): Microseconds of bus time per byte that reaches the controller
+        block (:obj:`bool`): True when a run of data bytes goes out as one transaction
+
+    """
+    __slots__ = ()
+
+    def estimate_us(self, commands: int, data: int, runs: int = None) -> float:
+        r"""
+        Bus time of a number of writes.
+
+        Args:
+            commands (:obj:`int`): Command bytes, each is a transaction of its own
+            data (:obj:`int`): Data bytes
+            runs (:obj:`int`, optional): Runs the data bytes come in, one per byte when None
+
+        Returns:
+            :obj:`float`: Estimated microseconds
+
+        """
+        transactions = commands + (runs if self.block and runs is not None else data)
+        return transactions * self.transaction_us + (commands + data) * self.byte_us
+
+
+class Transport:
+    r"""
+    Base of the transports, moves bytes to the controller's instruction and data registers.
+
+    Subclasses implement :meth:`write` and declare :attr:`mode`, :attr:`init` and :attr:`cost`.
+
+    """
+    #: Function set interface flag, LCD_4BITMODE or LCD_8BITMODE
+    mode = LCD_4BITMODE
+    #: Bytes bringing the controller from any state into the interface mode
+    init = (0x33, 0x32)
+    #: What a transaction and a byte cost on this bus
+    cost = TransportCost(0, 0, False)
+
+    def write(self, value: int, char_mode: bool = False):
+        r"""
+        Write one byte.
+
+        Args:
+            value (:obj:`int`): Byte to write
+            char_mode (:obj:`bool`, optional): True for the data register, False for the instruction register
+
+        """
+        raise NotImplementedError
+
+    def write_block(self, data: bytes, char_mode: bool = True):
+        r"""
+        Write a run of bytes, in as few transactions as the bus allows.
+
+        Args:
+            data (:obj:`bytes`): Bytes to write
+            char_mode (:obj:`bool`, optional): True for the data register (default), False for instructions
+
+        """
+        write = self.write
+        for value in data:
+            write(value, char_mode)
+
+    def set_backlight(self, backlight):
+        r"""
+        Switch the backlight, if the transport controls it.
+
+        Args:
+            backlight: Non zero for on
+
+        """
+
+    def estimate_us(self, commands: int, data: int, runs: int = None) -> float:
+        r"""
+        Bus time of a number of writes on this transport.
+
+        Args:
+            commands (:obj:`int`): Command bytes
+            data (:obj:`int`): Data bytes
+            runs (:obj:`int`, optional): Runs the data bytes come in
+
+        Returns:
+            :obj:`float`: Estimated microseconds, see :meth:`TransportCost.estimate_us`
+
+        """
+        return self.cost.estimate_us(commands, data, runs)
+
+
+class Gpio4Transport(Transport):
+    r"""
+    HD44780 wired in 4-bit mode to GPIO pins, as the Adafruit driver does it.
+
+    Args:
+        gpio: Adafruit_GPIO style object with ``setup``, ``output`` and ``output_pins``
+        rs (:obj:`int`): Pin Connection
+        en (:obj:`int`): Pin Connection
+        d4 (:obj:`int`): Pin Connection
+        d5 (:obj:`int`): Pin Connection
+        d6 (:obj:`int`): Pin Connection
+        d7 (:obj:`int`): Pin Connection
+        backlight (:obj:`int`, optional): Backlight Pin Connection, on when high
+
+    """
+    mode = LCD_4BITMODE
+    init = (0x33, 0x32)
+    #: Two nibble transfers of a pin update and three enable toggles each, about 2 microseconds a call
+    cost = TransportCost(0, 16, False)
+
+    def __init__(self, gpio, rs: int, en: int, d4: int, d5: int, d6: int, d7: int, backlight: int = None):
+        self.gpio = gpio
+        self.rs = rs
+        self.en = en
+        self.backlight = backlight
+        self._set_data_pins((d4, d5, d6, d7))
+        for pin in (rs, en) + (() if backlight is None else (backlight,)):
+            gpio.setup(pin, GPIO_OUT)
+        gpio.output(en, False)
+
+    def write(self, value: int, char_mode: bool = False):
+        r"""
+        Write one byte, as two nibbles high nibble first on a 4 bit wide bus.
+
+        Args:
+            value (:obj:`int`): Byte to write
+            char_mode (:obj:`bool`, optional): True for the data register, False for the instruction register
+
+        """
+        gpio = self.gpio
+        gpio.output(self.rs, char_mode)
+        for state in self._states[value]:
+            gpio.output_pins(state)
+            self._pulse_enable()
+
+    def set_backlight(self, backlight):
+        r"""
+        Switch the backlight pin, when there is one.
+
+        Args:
+            backlight: Non zero for on
+
+        """
+        if self.backlight is not None:
+            self.gpio.output(self.backlight, bool(backlight))
+
+    def _set_data_pins(self, data_pins: tuple):
+        r"""
+        Private function setting the data pins up and building the table of their levels for every byte.
+
+        Args:
+            data_pins (:obj:`tuple`): D4-D7, or D0-D7
+
+        """
+        self.data_pins = data_pins
+        self._states = nibble_states(data_pins)
+        for pin in data_pins:
+            self.gpio.setup(pin, GPIO_OUT)
+
+    def _pulse_enable(self):
+        r"""
+        Private function clocking the data lines in, on the falling edge of EN.
+
+        """
+        gpio = self.gpio
+        gpio.output(self.en, False)
+        gpio.output(self.en, True)
+        gpio.output(self.en, False)
+
+
+class Gpio8Transport(Gpio4Transport):
+    r"""
+    HD44780 wired in 8-bit mode to GPIO pins, every byte is one transfer.
+
+    Args:
+        gpio: Adafruit_GPIO style object with ``setup``, ``output`` and ``output_pins``
+        rs (:obj:`int`): Pin Connection
+        en (:obj:`int`): Pin Connection
+        d0 (:obj:`int`): Pin Connection
+        d1 (:obj:`int`): Pin Connection
+        d2 (:obj:`int`): Pin Connection
+        d3 (:obj:`int`): Pin Connection
+        d4 (:obj:`int`): Pin Connection
+        d5 (:obj:`int`): Pin Connection
+        d6 (:obj:`int`): Pin Connection
+        d7 (:obj:`int`): Pin Connection
+        backlight (:obj:`int`, optional): Backlight Pin Connection, on when high
+
+    """
+    mode = LCD_8BITMODE
+    init = (0x30, 0x30, 0x30)
+    #: One pin update and three enable toggles per byte
+    cost = TransportCost(0, 8, False)
+
+    # pylint: disable=R0913
+    def __init__(self, gpio, rs: int, en: int, d0: int, d1: int, d2: int, d3: int, d4: int, d5: int, d6: int,
+                 d7: int, backlight: int = None):
+        super().__init__(gpio, rs, en, d4, d5, d6, d7, backlight)
+        self._set_data_pins((d0, d1, d2, d3, d4, d5, d6, d7))
+
+
+class PCF8574Transport(Transport):
+    r"""
+    HD44780 on a PCF8574 I2C backpack, in 4-bit mode.
+
+    The expander's port is wired P0 RS, P1 R/W, P2 EN, P3 backlight and P4-P7 D4-D7, as on nearly every
+    backpack sold.  Each byte takes five port writes: the high nibble and RS with EN low, so RS has
+    settled before EN rises as the controller's address setup time asks, then both nibbles with EN high
+    and then low.  A run of bytes is sent as one I2C write transaction of all of them.
+
+    Args:
+        i2c: Bus object whose ``write(address, data)`` sends one I2C write transaction, for example a
+            wrapper around smbus2's ``i2c_rdwr(i2c_msg.write(address, data))``
+        address (:obj:`hex`, optional): I2C address of the expander (default 0x27)
+        backlight (:obj:`bool`, optional): Start with the backlight on (default True)
+
+    """
+    RS = 0x01
+    RW = 0x02
+    EN = 0x04
+    BACKLIGHT = 0x08
+
+    mode = LCD_4BITMODE
+    init = (0x33, 0x32)
+    #: Start and address byte then five port bytes per byte, 9 bit times each on a 100 kHz bus
+    cost = TransportCost(100, 450, True)
+
+    def __init__(self, i2c, address: int = 0x27, backlight: bool = True):
+        self.i2c = i2c
+        self.address = address
+        self._backlight = self.BACKLIGHT if backlight else 0
+        self._tables = {}
+
+    def write(self, value: int, char_mode: bool = False):
+        r"""
+        Write one byte in a transaction of its own.
+
+        Args:
+            value (:obj:`int`): Byte to write
+            char_mode (:obj:`bool`, optional): True for the data register, False for the instruction register
+
+        """
+        self.i2c.write(self.address, self._table(char_mode)[value])
+
+    def write_block(self, data: bytes, char_mode: bool = True):
+        r"""
+        Write a run of bytes in one transaction.
+
+        Args:
+            data (:obj:`bytes`): Bytes to write
+            char_mode (:obj:`bool`, optional): True for the data register (default), False for instructions
+
+        """
+        if data:
+            self.i2c.write(self.address, self._table(char_mode).encode(data))
+
+    def set_backlight(self, backlight):
+        r"""
+        Switch the backlight bit, it is sent with every later port write too.
+
+        Args:
+            backlight: Non zero for on
+
+        """
+        self._backlight = self.BACKLIGHT if backlight else 0
+        self.i2c.write(self.address, bytes((self._backlight,)))
+
+    def _table(self, char_mode: bool) -> PinTable:
+        r"""
+        Private function returning the port bytes of every byte value, built once per register and backlight.
+
+        Args:
+            char_mode (:obj:`bool`): True for the data register
+
+        Returns:
+            :obj:`LcdScroll.pins.PinTable`: Five port bytes per byte value
+
+        """
+        key = (bool(char_mode), self._backlight)
+        table = self._tables.get(key)
+        if table is None:
+            base = (self.RS if char_mode else 0) | self._backlight
+            table = []
+            for value in range(256):
+                high = (value & 0xF0) | base
+                low = ((value << 4) & 0xF0) | base
+                table.append(bytes((high, high | self.EN, high, low | self.EN, low)))
+            table = self._tables[key] = PinTable(table)
+        return table
+
+
+class TransportCharLCD:
+    r"""
+    The Adafruit_CharLCD interface on top of a :class:`Transport`.
+
+    Args:
+        transport (:obj:`Transport`): Bus to the controller
+        cols (:obj:`int`): Number of columns on display (default 16)
+        lines (:obj:`int`): Number of Lines on display (default 2)
+        realtime (:obj:`bool`, optional): Wait out the driver delays, False only adds them up in
+            ``delay_us``, for fake buses (default True)
+
+    """
+
+    def __init__(self, transport: Transport, cols: int = 16, lines: int = 2, realtime: bool = True):
+        self.transport = transport
+        self._cols = cols
+        self._lines = lines
+        self.realtime = realtime
+        #: Total of the driver delays, in microseconds
+        self.delay_us = 0
+        for value in transport.init:
+            self.write8(value)
+        self.displaycontrol = 0x04
+        self.displayfunction = transport.mode | LCD_2LINE
+        self.displaymode = 0x02
+        self.write8(LCD_DISPLAYCONTROL | self.displaycontrol)
+        self.write8(LCD_FUNCTIONSET | self.displayfunction)
+        self.write8(LCD_ENTRYMODESET | self.displaymode)
+        self.clear()
+
+    def home(self):
+        r"""
+        Move the cursor back to its home (first line and first column).
+
+        """
+        self.write8(LCD_RETURNHOME)
+        self._delay_microseconds(CLEAR_US)
+
+    def clear(self):
+        r"""
+        Clear the Lcd.
+
+        """
+        self.write8(LCD_CLEARDISPLAY)
+        self._delay_microseconds(CLEAR_US)
+
+    def set_cursor(self, col: int, row: int):
+        r"""
+        Move the cursor to an explicit column and row position.
+
+        Args:
+            col (:obj:`int`): Column
+            row (:obj:`int`): Row, clamped to the last row of the display
+
+        """
+        row = min(row, self._lines - 1)
+        self.write8(LCD_SETDDRAMADDR | (col + ROW_OFFSETS[row]))
+
+    def enable_display(self, enable: bool):
+        r"""
+        Enable or disable the display.
+
+        Args:
+            enable (:obj:`bool`): True to enable
+
+        """
+        self._display_control(0x04, enable)
+
+    def show_cursor(self, show: bool):
+        r"""
+        Show or hide the cursor.
+
+        Args:
+            show (:obj:`bool`): True to show
+
+        """
+        self._display_control(0x02, show)
+
+    def blink(self, blink: bool):
+        r"""
+        Turn on or off cursor blinking.
+
+        Args:
+            blink (:obj:`bool`): True to blink
+
+        """
+        self._display_control(0x01, blink)
+
+    def move_left(self):
+        r"""
+        Move display left one position.
+
+        """
+        self.write8(LCD_CURSORSHIFT | 0x08)
+
+    def move_right(self):
+        r"""
+        Move display right one position.
+
+        """
+        self.write8(LCD_CURSORSHIFT | 0x08 | 0x04)
+
+    def set_left_to_right(self):
+        r"""
+        Set text direction left to right.
+
+        """
+        self.displaymode |= 0x02
+        self.write8(LCD_ENTRYMODESET | self.displaymode)
+
+    def set_right_to_left(self):
+        r"""
+        Set text direction right to left.
+
+        """
+        self.displaymode &= ~0x02
+        self.write8(LCD_ENTRYMODESET | self.displaymode)
+
+    def autoscroll(self, autoscroll: bool):
+        r"""
+        Shift the display on every write, 'right justifying' text from the cursor.
+
+        Args:
+            autoscroll (:obj:`bool`): True to shift
+
+        """
+        if autoscroll:
+            self.displaymode |= 0x01
+        else:
+            self.displaymode &= ~0x01
+        self.write8(LCD_ENTRYMODESET | self.displaymode)
+
+    def message(self, text: str):
+        r"""
+        Write text to display, newlines move to the next line.
+
+        Args:
+            text (:obj:`str`): Text to write
+
+        """
+        line = 0
+        for char in text:
+            if char == '\n':
+                line += 1
+                self.set_cursor(0 if self.displaymode & 0x02 else self._cols - 1, line)
+            else:
+                self.write8(ord(char), True)
+
+    def set_backlight(self, backlight):
+        r"""
+        Enable or disable the backlight, if the transport controls one.
+
+        Args:
+            backlight: Non zero for on
+
+        """
+        self.transport.set_backlight(backlight)
+
+    def create_char(self, location: int, pattern):
+        r"""
+        Fill one of the first 8 CGRAM locations with a custom character.
+
+        Args:
+            location (:obj:`int`): Location 0-7
+            pattern: 8 rows of the character
+
+        """
+        self.write8(LCD_SETCGRAMADDR | ((location & 0x7) << 3))
+        self.send_bytes(bytes(pattern[:8]))
+
+    def write8(self, value: int, char_mode: bool = False):
+        r"""
+        Write 8-bit value in character or data mode, after the driver's fixed delay.
+
+        Args:
+            value (:obj:`int`): Value from 0-255
+            char_mode (:obj:`bool`, optional): True for character data, False for commands
+
+        """
+        self._delay_microseconds(WRITE_DELAY_US)
+        self.transport.write(value, char_mode)
+
+    def send_bytes(self, data: bytes):
+        r"""
+        Sends character codes to the display as they are.
+
+        A transport that writes runs as one transaction at least as slowly as the controller takes
+        each byte sends them all at once after a single write delay, any other sends them one write
+        at a time.
+
+        Args:
+            data (:obj:`bytes`): Character codes to send
+
+        """
+        transport = self.transport
+        if transport.cost.block and transport.cost.byte_us >= EXECUTION_US:
+            if data:
+                self._delay_microseconds(WRITE_DELAY_US)
+                self._write_block(data, True)
+            return
+        write8 = self.write8
+        for code in data:
+            write8(code, True)
+
+    def _write_block(self, data: bytes, char_mode: bool = True):
+        r"""
+        Private function writing a run of bytes in one go, counted by :mod:`LcdScroll.stats`.
+
+        Args:
+            data (:obj:`bytes`): Bytes to write
+            char_mode (:obj:`bool`, optional): True for the data register (default), False for commands
+
+        """
+        self.transport.write_block(data, char_mode)
+
+    def _display_control(self, flag: int, enable: bool):
+        r"""
+        Private function setting or clearing one bit of the display control instruction.
+
+        Args:
+            flag (:obj:`int`): The bit
+            enable (:obj:`bool`): True to set it
+
+        """
+        if enable:
+            self.displaycontrol |= flag
+        else:
+            self.displaycontrol &= ~flag
+        self.write8(LCD_DISPLAYCONTROL | self.displaycontrol)
+
+    def _delay_microseconds(self, microseconds):
+        r"""
+        Wait a number of microseconds, or only count them when not running in real time.
+
+        Args:
+            microseconds: Length of the delay
+
+        """
+        self.delay_us += microseconds
+        if self.realtime:
+            time.sleep(microseconds / 1000000.0)
+
+
+class _NibbleDecoder:
+    r"""
+    Private decoder turning the transfers a controller latches back into bytes.
+
+    Like the controller it starts in 8-bit mode.  On a 4 bit wide bus each transfer is then a whole
+    instruction with the low bits zero, until a function set switches it to pairing nibbles.
+
+    Args:
+        emulator: Object with ``write(value, char_mode)``, None to only decode
+        width (:obj:`int`): Data lines wired, 4 or 8
+
+    """
+
+    def __init__(self, emulator, width: int):
+        self.emulator = emulator
+        self.width = width
+        self.eight_bit = True
+        self._high = None
+        #: Decoded (value, char_mode) pairs
+        self.written = []
+
+    def latch(self, bits: int, char_mode: bool):
+        r"""
+        Take one transfer.
+
+        Args:
+            bits (:obj:`int`): D0-D7 as a byte, the low four bits are ignored on a 4 bit wide bus
+            char_mode (:obj:`bool`): Level of RS
+
+        """
+        if self.width == 4:
+            bits &= 0xF0
+            if not self.eight_bit:
+                if self._high is None:
+                    self._high = bits
+                    return
+                bits, self._high = self._high | bits >> 4, None
+        char_mode = bool(char_mode)
+        if not char_mode and bits & 0xE0 == LCD_FUNCTIONSET:
+            self.eight_bit = bool(bits & LCD_8BITMODE)
+        self.written.append((bits, char_mode))
+        if self.emulator is not None:
+            self.emulator.write(bits, char_mode)
+
+
+class FakeGPIO:
+    r"""
+    Adafruit_GPIO stand-in recording pin writes and decoding the controller transfers in them.
+
+    Args:
+        rs (:obj:`int`): Pin wired to RS
+        en (:obj:`int`): Pin wired to EN
+        data_pins (:obj:`tuple`): Pins wired to D4-D7, or D0-D7
+        emulator (optional): Object with ``write(value, char_mode)`` receiving every decoded byte
+
+    """
+
+    def __init__(self, rs: int, en: int, data_pins: tuple, emulator=None):
+        self.rs = rs
+        self.en = en
+        self.data_pins = tuple(data_pins)
+        self.levels = {}
+        self.modes = {}
+        #: Calls to output and output_pins
+        self.writes = 0
+        self.decoder = _NibbleDecoder(emulator, 8 if len(self.data_pins) == 8 else 4)
+
+    def setup(self, pin: int, mode: int):
+        r"""
+        Set a pin's mode.
+
+        Args:
+            pin (:obj:`int`): The pin
+            mode (:obj:`int`): GPIO_OUT or GPIO_IN
+
+        """
+        self.modes[pin] = mode
+
+    def output(self, pin: int, value):
+        r"""
+        Set one pin.
+
+        Args:
+            pin (:obj:`int`): The pin
+            value: Level
+
+        """
+        self.writes += 1
+        self._set(pin, value)
+
+    def output_pins(self, pins: dict):
+        r"""
+        Set several pins at once.
+
+        Args:
+            pins (:obj:`dict`): Level of each pin
+
+        """
+        self.writes += 1
+        for pin, value in pins.items():
+            self._set(pin, value)
+
+    def input(self, pin: int) -> bool:
+        r"""
+        Read a pin, the fake controller is never busy.
+
+        Args:
+            pin (:obj:`int`): The pin
+
+        Returns:
+            :obj:`bool`: False
+
+        """
+        return False
+
+    def _set(self, pin: int, value):
+        r"""
+        Private function changing a level, latching the data lines on a falling edge of EN.
+
+        Args:
+            pin (:obj:`int`): The pin
+            value: Level
+
+        """
+        value = bool(value)
+        if pin == self.en and self.levels.get(pin) and not value:
+            bits = 0
+            shift = 8 - len(self.data_pins)
+            for bit, data_pin in enumerate(self.data_pins):
+                if self.levels.get(data_pin):
+                    bits |= 1 << (bit + shift)
+            self.decoder.latch(bits, self.levels.get(self.rs, False))
+        self.levels[pin] = value
+
+
+class FakeI2C:
+    r"""
+    I2C bus stand-in with a PCF8574 backpack on it, counting transactions and decoding the port writes.
+
+    Args:
+        emulator (optional): Object with ``write(value, char_mode)`` receiving every decoded byte
+
+    """
+
+    def __init__(self, emulator=None):
+        #: (address, data) of every write transaction
+        self.transactions = []
+        self.port = 0
+        #: Rising edges of EN in the same port write as a change of RS, too early for the controller
+        self.setup_violations = 0
+        self.decoder = _NibbleDecoder(emulator, 4)
+
+    @property
+    def bytes_written(self) -> int:
+        r"""
+        Property: Bytes sent in all transactions, not counting address bytes.
+
+        :getter: Get FakeI2C.bytes_written property
+
+        """
+        return sum(len(data) for _address, data in self.transactions)
+
+    def write(self, address: int, data: bytes):
+        r"""
+        One write transaction.
+
+        Args:
+            address (:obj:`int`): Device address
+            data (:obj:`bytes`): Bytes written
+
+        """
+        self.transactions.append((address, bytes(data)))
+        for port in data:
+            if self.port & PCF8574Transport.EN and not port & PCF8574Transport.EN:
+                self.decoder.latch(self.port & 0xF0, self.port & PCF8574Transport.RS)
+            elif port & PCF8574Transport.EN and not self.port & PCF8574Transport.EN and \
+                    (port ^ self.port) & PCF8574Transport.RS:
+                self.setup_violations += 1
+            self.port = port
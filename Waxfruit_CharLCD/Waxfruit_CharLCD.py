@@ -36,7 +36,9 @@ PC Emulation for Adafruit_CharLCD
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
-import time
+from LcdScroll.timing import HybridSleeper
+
+from .hd44780 import HD44780
 
 # Commands
 LCD_CLEARDISPLAY = 0x01
@@ -102,12 +104,16 @@ LEFT = 4
 class Adafruit_CharLCD(object):
     """Class to represent and interact with an HD44780 character Lcd display."""
 
+    _delay_sleeper = None
+
     def __init__(self, rs, en, d4, d5, d6, d7, cols, lines, backlight=None,
                  invert_polarity=True,
                  enable_pwm=False,
                  gpio='',
                  pwm='',
-                 initial_backlight=1.0):
+                 initial_backlight=1.0,
+                 realtime=False,
+                 verbose=False):
         """Initialize the Lcd.  RS, EN, and D4...D7 parameters should be the pins
         connected to the Lcd RS, clock enable, and data line 4 through 7 connections.
         The Lcd will be used in its 4-bit mode so these 6 lines are the only ones
@@ -130,6 +136,12 @@ class Adafruit_CharLCD(object):
         for example if you want to use an MCP230xx GPIO extender.  If you don't
         pass in an GPIO instance, the default GPIO for the running platform will
         be used.
+
+        Emulation only: every write goes to a headless HD44780 emulator, available
+        as the emulator attribute.  The driver delays are only added up in delay_us
+        unless realtime is True, which waits them out and reports the emulated busy
+        flag, so tests and benchmarks do not sleep through the init sequence of every
+        instance.  With verbose True every operation is printed.
         """
         # Save column and line state.
         self._cols = cols
@@ -147,18 +159,35 @@ class Adafruit_CharLCD(object):
         self._pwm_enabled = enable_pwm
         self._pwm = pwm
         self._blpol = not invert_polarity
-
+        # Emulation state.
+        self.realtime = realtime
+        self._verbose = verbose
+        self.emulator = HD44780(log=print if verbose else None)
+        # Total of the driver delays, in microseconds.
+        self.delay_us = 0
+
+        # Initialize the display.
+        self.write8(0x33)
+        self.write8(0x32)
+        # Initialize display control, function, and mode registers.
         self.displaycontrol = LCD_DISPLAYON | LCD_CURSOROFF | LCD_BLINKOFF
         self.displayfunction = LCD_4BITMODE | LCD_1LINE | LCD_2LINE | LCD_5x8DOTS
         self.displaymode = LCD_ENTRYLEFT | LCD_ENTRYSHIFTDECREMENT
+        # Write registers.
+        self.write8(LCD_DISPLAYCONTROL | self.displaycontrol)
+        self.write8(LCD_FUNCTIONSET | self.displayfunction)
+        self.write8(LCD_ENTRYMODESET | self.displaymode)  # set the entry mode
+        self.clear()
 
     def home(self):
         """Move the cursor back to its home (first line and first column)."""
-        print('Cursor to Home.\n')
+        self.write8(LCD_RETURNHOME)  # set cursor position to zero
+        self._delay_microseconds(3000)  # this command takes a long time!
 
     def clear(self):
         """Clear the Lcd."""
-        print('Clear display.\n')
+        self.write8(LCD_CLEARDISPLAY)  # command to clear display
+        self._delay_microseconds(3000)  # 3000 microsecond sleep, clearing the display takes a long time
 
     def set_cursor(self, col, row):
         """Move the cursor to an explicit column and row position."""
@@ -166,53 +195,59 @@ class Adafruit_CharLCD(object):
         if row > self._lines:
             row = self._lines - 1
         # Set location.
-        print('Move cursor to ' + str(col) + ' ' + str(row))
+        self.write8(LCD_SETDDRAMADDR | (col + LCD_ROW_OFFSETS[row]))
 
     def enable_display(self, enable):
         """Enable or disable the display.  Set enable to True to enable."""
         if enable:
-            print('Enable Display')
+            self.displaycontrol |= LCD_DISPLAYON
         else:
-            print('Disable Display')
+            self.displaycontrol &= ~LCD_DISPLAYON
+        self.write8(LCD_DISPLAYCONTROL | self.displaycontrol)
 
     def show_cursor(self, show):
         """Show or hide the cursor.  Cursor is shown if show is True."""
         if show:
-            print('Cursor Visible')
+            self.displaycontrol |= LCD_CURSORON
         else:
-            print('Cursor Invisible')
+            self.displaycontrol &= ~LCD_CURSORON
+        self.write8(LCD_DISPLAYCONTROL | self.displaycontrol)
 
     def blink(self, blink):
         """Turn on or off cursor blinking.  Set blink to True to enable blinking."""
         if blink:
-            print('Blink Cursor')
+            self.displaycontrol |= LCD_BLINKON
         else:
-            print('Stop Cursor Blink')
+            self.displaycontrol &= ~LCD_BLINKON
+        self.write8(LCD_DISPLAYCONTROL | self.displaycontrol)
 
     def move_left(self):
         """Move display left one position."""
-        print('Cursor Left')
+        self.write8(LCD_CURSORSHIFT | LCD_DISPLAYMOVE | LCD_MOVELEFT)
 
     def move_right(self):
         """Move display right one position."""
-        print('Cursor Right')
+        self.write8(LCD_CURSORSHIFT | LCD_DISPLAYMOVE | LCD_MOVERIGHT)
 
     def set_left_to_right(self):
         """Set text direction left to right."""
-        print('Text Direction Left to Right')
+        self.displaymode |= LCD_ENTRYLEFT
+        self.write8(LCD_ENTRYMODESET | self.displaymode)
 
     def set_right_to_left(self):
         """Set text direction right to left."""
-        print('Text Direction Right to Left')
+        self.displaymode &= ~LCD_ENTRYLEFT
+        self.write8(LCD_ENTRYMODESET | self.displaymode)
 
     def autoscroll(self, autoscroll):
         """Autoscroll will 'right justify' text from the cursor if set True,
         otherwise it will 'left justify' the text.
         """
         if autoscroll:
-            print('Autoscroll Enabled')
+            self.displaymode |= LCD_ENTRYSHIFTINCREMENT
         else:
-            print('Autoscroll Disabled')
+            self.displaymode &= ~LCD_ENTRYSHIFTINCREMENT
+        self.write8(LCD_ENTRYMODESET | self.displaymode)
 
     def message(self, text):
         """Write text to display.  Note that text can include newlines."""
@@ -221,7 +256,7 @@ class Adafruit_CharLCD(object):
         for char in text:
             # Advance to next line if character is a new line.
             if char == '\n':
-                print('\n')
+                line += 1
                 # Move to left or right side depending on text direction.
                 col = 0 if self.displaymode & LCD_ENTRYLEFT > 0 else self._cols - 1
                 self.set_cursor(col, line)
@@ -235,10 +270,8 @@ class Adafruit_CharLCD(object):
         turn it off.  If PWM is enabled, backlight can be any value from 0.0 to
         1.0, with 1.0 being full intensity backlight.
         """
-        if self._backlight is not None:
-            print('Backlight ON')
-        else:
-            print('Backlight OFF')
+        if self._verbose:
+            print('Backlight ON' if backlight else 'Backlight OFF')
 
     def write8(self, value, char_mode=False):
         """Write 8-bit value in character or data mode.  Value should be an int
@@ -248,11 +281,15 @@ class Adafruit_CharLCD(object):
         # One millisecond delay to prevent writing too quickly.
         self._delay_microseconds(1000)
         # Set character / data bit.
+        self.emulator.write(value, char_mode)
 
-        if char_mode is True:
-            print(str(value))
-        else:
-            print(hex(value))
+    def read_busy_flag(self):
+        """Return True while the emulated controller is still executing an instruction."""
+        return self.realtime and self.emulator.busy()
+
+    def display_text(self):
+        """Emulation only: return the text shown on each row of the display."""
+        return self.emulator.text(self._cols, LCD_ROW_OFFSETS[:self._lines])
 
     def create_char(self, location, pattern):
         """Fill one of the first 8 CGRAM locations with custom characters.
@@ -273,10 +310,13 @@ class Adafruit_CharLCD(object):
         Args:
             microseconds:
         """
-        # Busy wait in loop because delays are generally very short (few microseconds).
-        end = time.time() + (microseconds / 1000000.0)
-        while time.time() < end:
-            pass
+        self.delay_us += microseconds
+        if not self.realtime:
+            return
+        # The same calibrated sleep then spin as the LcdScroll displays, created on the first real delay.
+        if self._delay_sleeper is None:
+            self._delay_sleeper = HybridSleeper()
+        self._delay_sleeper.sleep_us(microseconds)
 
     def _pulse_enable(self):
         """
@@ -304,7 +344,9 @@ class Adafruit_RGBCharLCD(Adafruit_CharLCD):
                  invert_polarity=True,
                  enable_pwm=False,
                  pwm='',
-                 initial_color=(1.0, 1.0, 1.0)):
+                 initial_color=(1.0, 1.0, 1.0),
+                 realtime=False,
+                 verbose=False):
         """Initialize the Lcd with RGB backlight.  RS, EN, and D4...D7 parameters
         should be the pins connected to the Lcd RS, clock enable, and data line
         4 through 7 connections. The Lcd will be used in its 4-bit mode so these
@@ -331,7 +373,9 @@ class Adafruit_RGBCharLCD(Adafruit_CharLCD):
                                                   backlight=None,
                                                   invert_polarity=invert_polarity,
                                                   gpio=gpio,
-                                                  pwm=pwm)
+                                                  pwm=pwm,
+                                                  realtime=realtime,
+                                                  verbose=verbose)
         self._red = red
         self._green = green
         self._blue = blue
@@ -360,7 +404,8 @@ class Adafruit_RGBCharLCD(Adafruit_CharLCD):
         is enabled then color components can be values from 0.0 to 1.0, otherwise
         components should be zero for off and non-zero for on.
         """
-        print(red, green, blue)
+        if self._verbose:
+            print(red, green, blue)
 
     def set_backlight(self, backlight):
         """Enable or disable the backlight.  If PWM is not enabled (default), a
@@ -376,7 +421,7 @@ class Adafruit_CharLCDPlate(Adafruit_RGBCharLCD):
     """Class to represent and interact with an Adafruit Raspberry Pi character
     Lcd plate."""
 
-    def __init__(self, address=0x20, busnum='', cols=16, lines=2):
+    def __init__(self, address=0x20, busnum='', cols=16, lines=2, realtime=False, verbose=False):
         """Initialize the character Lcd plate.  Can optionally specify a separate
         I2C address or bus number, but the defaults should suffice for most needs.
         Can also optionally specify the number of columns and lines on the Lcd
@@ -392,9 +437,10 @@ class Adafruit_CharLCDPlate(Adafruit_RGBCharLCD):
         super(Adafruit_CharLCDPlate, self).__init__(LCD_PLATE_RS, LCD_PLATE_EN,
                                                     LCD_PLATE_D4, LCD_PLATE_D5, LCD_PLATE_D6, LCD_PLATE_D7, cols, lines,
                                                     LCD_PLATE_RED, LCD_PLATE_GREEN, LCD_PLATE_BLUE, enable_pwm=False,
-                                                    gpio='')
+                                                    gpio='', realtime=realtime, verbose=verbose)
 
     def is_pressed(self, button):
         """Return True if the provided button is pressed, False otherwise."""
-        print('Checking Button')
+        if self._verbose:
+            print('Checking Button')
         return 1
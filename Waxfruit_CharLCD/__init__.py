@@ -5,9 +5,10 @@ CERMMorse : __init__
 Author : James L. Key
 """
 
-from .Waxfruit_CharLCD import Adafruit_CharLCDPlate, Adafruit_RGBCharLCD, Adafruit_CharLCD
+from .Waxfruit_CharLCD import *
+from .hd44780 import HD44780
 
 __author__ = 'James L. Key'
 __project__ = 'CERMMorse'
-__all__ = ['Adafruit_CharLCDPlate', 'Adafruit_CharLCD', 'Adafruit_RGBCharLCD', ]
+__all__ = ['Adafruit_CharLCDPlate', 'Adafruit_CharLCD', 'Adafruit_RGBCharLCD', 'HD44780', ]
 # Begin
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Headless HD44780 emulator
+
+Models the parts of the controller that decide what ends up on the glass: display data RAM, character
+generator RAM, the address counter, entry mode, display shift and display control.  Every instruction
+and data write is counted and the datasheet execution time of each one is added up, so rendering cost
+can be measured and regression tested without a display attached.
+
+:program: CERMMorse
+:file: hd44780
+:platform: Cross-Platform
+:synopsis: Cycle-counting emulation of the HD44780 character LCD controller.
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+.. py:currentmodule:: Waxfruit_CharLCD.hd44780
+
+"""
+import time
+
+# Execution times from the HD44780 datasheet (fosc = 270 kHz), in microseconds.
+CLEAR_HOME_US = 1520
+INSTRUCTION_US = 37
+DATA_US = 41
+
+# Display memory is two 40 character lines in two line mode, one 80 character line otherwise.
+DDRAM_LINE_LENGTH = 40
+DDRAM_SECOND_LINE = 0x40
+BLANK = 0x20
+
+
+class HD44780(object):
+    """Emulated HD44780 controller.
+
+    Feed it the bytes a driver would put on the bus with :meth:`write` and read back the visible rows
+    with :meth:`rows`.  ``log`` may be any callable taking one string, it is called with a description
+    of every instruction and data write, leave it as None for a silent emulator.
+    """
+
+    def __init__(self, log=None):
+        self.log = log
+        self.ddram = bytearray([BLANK]) * 128
+        self.cgram = bytearray(64)
+        self.address_counter = 0
+        # True while data writes go to CGRAM, after a set CGRAM address instruction.
+        self.cgram_mode = False
+        self.increment = True
+        self.shift_on_write = False
+        self.shift = 0
+        self.display_on = False
+        self.cursor_on = False
+        self.blink_on = False
+        self.eight_bit = True
+        self.two_line = False
+        self.font_5x10 = False
+        # Counters.
+        self.instructions = 0
+        self.data_writes = 0
+        self.modeled_us = 0
+        # perf_counter_ns() when the instruction in progress finishes, for the busy flag.
+        self.busy_until = 0
+
+    def reset_counters(self):
+        """Zero the instruction, data write and modeled time counters."""
+        self.instructions = 0
+        self.data_writes = 0
+        self.modeled_us = 0
+
+    def stats(self):
+        """Return the counters as a dictionary."""
+        return {'instructions': self.instructions,
+                'data_writes': self.data_writes,
+                'modeled_us': self.modeled_us}
+
+    def busy(self):
+        """Return the busy flag, True until the last instruction's execution time has passed."""
+        return time.perf_counter_ns() < self.busy_until
+
+    def write(self, value, char_mode=False):
+        """Write one byte, to the data register when char_mode is True else to the instruction register."""
+        if char_mode:
+            self.data(value)
+        else:
+            self.instruction(value)
+
+    def instruction(self, value):
+        """Execute one instruction byte."""
+        value &= 0xFF
+        self.instructions += 1
+        duration = INSTRUCTION_US
+        if value & 0x80:
+            self.address_counter = value & 0x7F
+            self.cgram_mode = False
+            self._log('Set DDRAM address 0x%02x' % self.address_counter)
+        elif value & 0x40:
+            self.address_counter = value & 0x3F
+            self.cgram_mode = True
+            self._log('Set CGRAM address 0x%02x' % self.address_counter)
+        elif value & 0x20:
+            self.eight_bit = bool(value & 0x10)
+            self.two_line = bool(value & 0x08)
+            self.font_5x10 = bool(value & 0x04)
+            self._log('Function set 0x%02x' % value)
+        elif value & 0x10:
+            step = 1 if value & 0x04 else -1
+            if value & 0x08:
+                # Shifting the display right moves the window left over display memory.
+                self.shift = (self.shift - step) % self._line_length()
+                self._log('Shift display %s' % ('right' if step > 0 else 'left'))
+            else:
+                self._advance(step)
+                self._log('Move cursor %s' % ('right' if step > 0 else 'left'))
+        elif value & 0x08:
+            self.display_on = bool(value & 0x04)
+            self.cursor_on = bool(value & 0x02)
+            self.blink_on = bool(value & 0x01)
+            self._log('Display control 0x%02x' % value)
+        elif value & 0x04:
+            self.increment = bool(value & 0x02)
+            self.shift_on_write = bool(value & 0x01)
+            self._log('Entry mode 0x%02x' % value)
+        elif value & 0x02:
+            self.address_counter = 0
+            self.cgram_mode = False
+            self.shift = 0
+            duration = CLEAR_HOME_US
+            self._log('Return home')
+        elif value & 0x01:
+            self.ddram[:] = bytes([BLANK]) * len(self.ddram)
+            self.address_counter = 0
+            self.cgram_mode = False
+            self.shift = 0
+            self.increment = True
+            duration = CLEAR_HOME_US
+            self._log('Clear display')
+        self._execute(duration)
+
+    def data(self, value):
+        """Write one data byte at the address counter."""
+        value &= 0xFF
+        self.data_writes += 1
+        if self.cgram_mode:
+            self.cgram[self.address_counter & 0x3F] = value
+            self._log('CGRAM 0x%02x = 0x%02x' % (self.address_counter, value))
+            self.address_counter = (self.address_counter + (1 if self.increment else -1)) & 0x3F
+        else:
+            self.ddram[self.address_counter] = value
+            self._log('DDRAM 0x%02x = %r' % (self.address_counter, chr(value)))
+            self._advance(1 if self.increment else -1)
+            if self.shift_on_write:
+                self.shift = (self.shift + (1 if self.increment else -1)) % self._line_length()
+        self._execute(DATA_US)
+
+    def address(self, col, row_offset):
+        """Return the DDRAM address shown at a column of the row starting at row_offset, given the shift."""
+        length = self._line_length()
+        line_start = DDRAM_SECOND_LINE if self.two_line and row_offset >= DDRAM_SECOND_LINE else 0
+        return line_start + (row_offset - line_start + col + self.shift) % length
+
+    def rows(self, cols, row_offsets):
+        """Return the bytes shown on each visible row."""
+        return [bytes(self.ddram[self.address(col, offset)] for col in range(cols)) for offset in row_offsets]
+
+    def text(self, cols, row_offsets):
+        """Return the visible rows as strings, character codes are decoded as latin-1."""
+        return [row.decode('latin-1') for row in self.rows(cols, row_offsets)]
+
+    def glyph(self, location):
+        """Return the 8 pattern bytes of a CGRAM character."""
+        location &= 0x7
+        return bytes(self.cgram[location * 8:location * 8 + 8])
+
+    def _line_length(self):
+        """Characters in one DDRAM line for the current function set."""
+        return DDRAM_LINE_LENGTH if self.two_line else DDRAM_LINE_LENGTH * 2
+
+    def _advance(self, step):
+        """Move the DDRAM address counter, wrapping the way the controller does."""
+        if not self.two_line:
+            self.address_counter = (self.address_counter + step) % (DDRAM_LINE_LENGTH * 2)
+            return
+        line_start = DDRAM_SECOND_LINE if self.address_counter >= DDRAM_SECOND_LINE else 0
+        offset = self.address_counter - line_start + step
+        if offset >= DDRAM_LINE_LENGTH:
+            # The end of the first line runs on to the second and the end of the second back to the first.
+            line_start ^= DDRAM_SECOND_LINE
+            offset = 0
+        elif offset < 0:
+            line_start ^= DDRAM_SECOND_LINE
+            offset = DDRAM_LINE_LENGTH - 1
+        self.address_counter = line_start + offset
+
+    def _execute(self, microseconds):
+        """Account for the execution time of an instruction or data write."""
+        self.modeled_us += microseconds
+        self.busy_until = time.perf_counter_ns() + microseconds * 1000
+
+    def _log(self, text):
+        if self.log is not None:
+            self.log(text)
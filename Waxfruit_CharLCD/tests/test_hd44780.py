@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the headless HD44780 emulator
+
+:program: CERMMorse
+:file: test_hd44780
+:platform: Cross-Platform
+:synopsis: Tests for Waxfruit_CharLCD.hd44780
+
+.. moduleauthor:: James L. Key <james@bluepenguinslutions.com>
+
+"""
+from unittest import TestCase, mock
+from Waxfruit_CharLCD import Adafruit_CharLCDPlate
+from Waxfruit_CharLCD.hd44780 import HD44780, CLEAR_HOME_US, DATA_US, INSTRUCTION_US
+
+
+class TestHD44780(TestCase):
+    """
+    """
+    def setUp(self):
+        """
+
+        """
+        self.lcd = Adafruit_CharLCDPlate(cols=20, lines=4, realtime=False)
+
+    def test_four_line_interleave(self):
+        r"""
+        Line 1 runs on to line 3 and line 2 on to line 4
+
+        """
+        self.lcd.message('A' * 20 + 'C' * 20 + 'B' * 20 + 'D' * 20)
+        self.assertEqual(self.lcd.display_text(), ['A' * 20, 'B' * 20, 'C' * 20, 'D' * 20])
+
+    def test_address_wrap(self):
+        r"""
+        The address counter runs from the end of the first memory line to the second
+
+        """
+        self.lcd.set_cursor(19, 2)
+        self.lcd.message('xy')
+        self.assertEqual(self.lcd.emulator.address_counter, 0x41)
+        self.assertEqual(self.lcd.display_text()[1][0], 'y')
+
+    def test_display_shift(self):
+        r"""
+        A display shift moves the window over display memory
+
+        """
+        lcd = Adafruit_CharLCDPlate(cols=16, lines=2, realtime=False)
+        lcd.message('0123456789abcdefghij')
+        lcd.move_left()
+        lcd.move_left()
+        self.assertEqual(lcd.display_text()[0], '23456789abcdefgh')
+        lcd.home()
+        self.assertEqual(lcd.display_text()[0], '0123456789abcdef')
+
+    def test_cgram(self):
+        r"""
+        Custom characters land in CGRAM and data keeps going there until the DDRAM address is set
+
+        """
+        pattern = [0x0E, 0x11, 0x11, 0x11, 0x1F, 0x1B, 0x1B, 0x1F]
+        self.lcd.create_char(1, pattern)
+        self.assertEqual(self.lcd.emulator.glyph(1), bytes(pattern))
+        self.lcd.message('!')
+        self.assertEqual(self.lcd.emulator.glyph(2)[0], ord('!'))
+        self.assertEqual(self.lcd.display_text()[0], ' ' * 20)
+
+    def test_counters(self):
+        r"""
+        Instructions, data writes and datasheet time are added up
+
+        """
+        emulator = self.lcd.emulator
+        emulator.reset_counters()
+        self.lcd.clear()
+        self.lcd.set_cursor(0, 1)
+        self.lcd.message('hi')
+        self.assertEqual(emulator.stats(), {'instructions': 2, 'data_writes': 2,
+                                            'modeled_us': CLEAR_HOME_US + INSTRUCTION_US + 2 * DATA_US})
+
+    def test_log(self):
+        r"""
+        Logging is optional and off by default
+
+        """
+        lines = []
+        emulator = HD44780(log=lines.append)
+        emulator.instruction(0x01)
+        self.assertEqual(lines, ['Clear display'])
+        self.assertIsNone(self.lcd.emulator.log)
+
+    def test_realtime_delay(self):
+        r"""
+        Realtime driver delays are waited out by the calibrated sleeper, the others are only added up
+
+        """
+        with mock.patch('Waxfruit_CharLCD.Waxfruit_CharLCD.HybridSleeper') as sleeper:
+            lcd = Adafruit_CharLCDPlate(cols=16, lines=2, realtime=True)
+            lcd.message('Hi')
+        sleeper.assert_called_once_with()
+        waited = [call.args[0] for call in sleeper.return_value.sleep_us.call_args_list]
+        self.assertEqual(sum(waited), lcd.delay_us)
+        self.assertIsNone(self.lcd._delay_sleeper)
+        self.assertGreater(self.lcd.delay_us, 0)